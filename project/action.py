@@ -0,0 +1,133 @@
+from typing import NamedTuple
+
+# Action kinds, matching the names the user types in Board.choose_action()
+MOVE: str = 'move'
+RECRUIT: str = 'recruit'
+PLACE: str = 'place'
+ATTACK: str = 'attack'
+CONTROL: str = 'control'
+INITIATIVE: str = 'initiative'
+
+ACTION_KINDS: tuple = (MOVE, RECRUIT, PLACE, ATTACK, CONTROL, INITIATIVE)
+
+# Action class with its respective properties
+class Action(NamedTuple):
+    """
+    A class to represent an Action, the value a player hands to Board.apply_action() instead of typing it in.
+
+    Attributes:
+        kind: One of the action kinds, e.g: 'move'.
+        piece: The unit type of the coin used from the player hand, e.g: 'Archer'.
+        start: Tuple containing the coordinates of the unit that moves or attacks.
+        end: Tuple containing the coordinates to move to, place at, control or (first) attack.
+        recruit: The unit type taken from the recruitment zone when recruiting.
+        extra_targets: Tuple of further attack coordinates for units with more than one attack.
+    """
+    kind: str
+    piece: str
+    start: tuple = None
+    end: tuple = None
+    recruit: str = None
+    extra_targets: tuple = ()
+
+# Result class with its respective properties
+class Result(NamedTuple):
+    """
+    A class to represent the Result of applying an Action, it is truthy only when the action was performed.
+
+    Attributes:
+        ok: True if the action was valid and the board has been updated.
+        message: The reason why the action was rejected, empty if it was performed.
+    """
+    ok: bool
+    message: str = ''
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+# Shared result for every valid action, so applying an action doesn't allocate one
+OK: Result = Result(True)
+
+# Unit coin types that can be in a player hand, the Royal coin can't be placed in the board
+SOLDIER_TYPES: tuple = ('Archer', 'Knight', 'Mercenary', 'Berserker')
+COIN_TYPES: tuple = SOLDIER_TYPES + ('Royal',)
+
+# ActionTable class with its respective methods and properties
+class ActionTable:
+    """
+    A class to represent an ActionTable, every single-target Action that can exist on a board of a given size created
+    once, so that generating the legal actions only has to look them up instead of allocating them.
+
+    Attributes:
+        rows: The number of rows in the board.
+        cols: The number of columns in the board.
+        coordinates: Tuple following the structure [square] -> (row, col), shared by the boards of this size.
+        initiative: Dictionary following the structure {piece: Action}
+        recruit: Dictionary following the structure {(piece, unit_type): Action}
+        place: Dictionary following the structure {piece: [square] -> Action}
+        control: Dictionary following the structure {piece: [square] -> Action}
+        move: Dictionary following the structure {piece: [start square] -> {end square: Action}}
+        attack: Dictionary following the structure {piece: [start square] -> {end square: Action}}
+
+    A square is the index row * cols + col of a coordinate.
+    """
+    def __init__(self, rows: int, cols: int) -> None:
+        # Imported here since cell.py is only needed to build the table
+        from cell import get_unit_tables
+        self.rows: int = rows
+        self.cols: int = cols
+        unit_tables: dict = get_unit_tables(rows, cols)
+        squares: tuple = tuple((row, col) for row in range(rows) for col in range(cols))
+        self.coordinates: tuple = squares
+
+        self.initiative: dict = {piece: Action(INITIATIVE, piece) for piece in COIN_TYPES}
+        self.recruit: dict = {
+            (piece, unit_type): Action(RECRUIT, piece, recruit=unit_type)
+            for piece in COIN_TYPES for unit_type in SOLDIER_TYPES
+        }
+        self.place: dict = {piece: [Action(PLACE, piece, end=end) for end in squares] for piece in SOLDIER_TYPES}
+        self.control: dict = {piece: [Action(CONTROL, piece, end=end) for end in squares] for piece in COIN_TYPES}
+        self.move: dict = {}
+        self.attack: dict = {}
+        for piece in SOLDIER_TYPES:
+            move, attack = unit_tables[piece]
+            self.move[piece] = [
+                {end: Action(MOVE, piece, squares[start], squares[end]) for end in move[start]}
+                for start in range(len(squares))
+            ]
+            self.attack[piece] = [
+                {end: Action(ATTACK, piece, squares[start], squares[end]) for end in attack[start]}
+                for start in range(len(squares))
+            ]
+
+    def __deepcopy__(self, memo: dict):
+        """
+        The table never changes once it is built, so copies of a Board class object can share it.
+        """
+        return self
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickles the table as its board size, so that a Board class object sent to another process uses the table of
+        that process.
+        """
+        return get_action_table, (self.rows, self.cols)
+
+# Tables already built for each board size
+_action_tables: dict = {}
+
+def get_action_table(rows: int, cols: int) -> ActionTable:
+    """
+    Returns the ActionTable for a board size, building it the first time it is requested.
+
+    Args:
+        rows: The number of rows in the board.
+        cols: The number of columns in the board.
+
+    Returns:
+        The shared ActionTable class object.
+    """
+    table: ActionTable = _action_tables.get((rows, cols))
+    if table is None:
+        table = _action_tables[(rows, cols)] = ActionTable(rows, cols)
+    return table
@@ -0,0 +1,510 @@
+import math
+import random
+import time
+
+from action import Action, MOVE, RECRUIT, PLACE, ATTACK, CONTROL
+from board import Board
+from draws import player_distribution
+from player import Player
+from zobrist import TranspositionTable, EXACT, LOWER, UPPER
+
+# Value of a won game, far above any evaluation of an unfinished one
+WIN: int = 1_000_000
+INFINITY: int = 2 * WIN
+
+# Weights of the evaluation terms
+TOKEN_WEIGHT: int = 100
+ZONE_WEIGHT: int = 20
+UNIT_WEIGHT: int = 10
+THREAT_WEIGHT: int = 15
+COIN_WEIGHT: int = 8
+# Penalty for having less coins than a hand outside the board, which loses the game at the next draw
+SHORT_PENALTY: int = 1000
+
+# Ordering score of each action kind, the ones that usually change the evaluation the most first
+KIND_ORDER: dict = {CONTROL: 400, ATTACK: 300, PLACE: 200, MOVE: 100, RECRUIT: 50}
+KILLER_ORDER: int = 10_000
+HASH_ORDER: int = 1_000_000
+
+# Exception raised to unwind the search when the time budget runs out
+class SearchTimeout(Exception):
+    pass
+
+# TurnClock class with its respective methods and properties
+class TurnClock:
+    """
+    A class to represent a TurnClock, it keeps the actions of a turn within the time budget of the whole turn. The
+    deadline of the turn is set when its first action is chosen, and every action gets an equal share of the time left
+    until it between the coins still in the hand.
+
+    Attributes:
+        deadline: The time.perf_counter() value by which the turn has to be played.
+        player: The Player class object whose turn is being timed.
+        coins: The number of coins the hand holds at the next action of the same turn.
+    """
+    def __init__(self) -> None:
+        self.deadline: float = 0.0
+        self.player: Player = None
+        self.coins: int = -1
+
+    def share(self, player: Player, budget: float) -> float:
+        """
+        Returns the seconds the next action of the player can take.
+
+        Args:
+            player: The Player class object defining the current player.
+            budget: The wall-clock seconds of the whole turn.
+
+        Returns:
+            The share of the time left of the turn, 0 once it has run out.
+        """
+        now: float = time.perf_counter()
+        coins: int = max(1, len(player.hand))
+        # Any other hand than the one left by the last action starts a new turn
+        if player is not self.player or coins != self.coins:
+            self.player, self.deadline = player, now + budget
+        self.coins = coins - 1
+        return max(0.0, self.deadline - now) / coins
+
+# Agent class with its respective methods
+class Agent:
+    """
+    A class to represent an Agent, a player controlled by the program. prompt_player_actions() asks it for the actions
+    of a turn one at a time, instead of asking the user.
+
+    Attributes:
+        searches: Whether choose_action() searches, so that the server runs it off its event loop.
+    """
+    searches: bool = True
+
+    def choose_action(self, board: Board, player: Player) -> Action:
+        """
+        Picks the next action of the player, it must be one of board.legal_actions(player).
+
+        Args:
+            board: The Board class object, containing the grid with the unit coins.
+            player: The Player class object defining the current player.
+
+        Returns:
+            The chosen Action.
+        """
+        raise NotImplementedError
+
+    def report(self) -> str:
+        """
+        Returns a short description of how the last action was chosen, empty if there is nothing to report.
+        """
+        return ''
+
+    def close(self) -> None:
+        """
+        Releases what the agent holds once the game ends, e.g: worker processes. Nothing by default.
+        """
+        pass
+
+# RandomAgent class with its respective methods and properties
+class RandomAgent(Agent):
+    """
+    A class to represent a RandomAgent, it plays uniformly random legal actions.
+
+    Attributes:
+        rng: The random.Random generator used to pick the actions.
+        searches: False, picking an action takes less than sending it to another thread.
+    """
+    searches: bool = False
+
+    def __init__(self, seed: int = None) -> None:
+        self.rng: random.Random = random.Random(seed)
+
+    def choose_action(self, board: Board, player: Player) -> Action:
+        return self.rng.choice(board.legal_actions(player))
+
+# AlphaBetaAgent class with its respective methods and properties
+class AlphaBetaAgent(Agent):
+    """
+    A class to represent an AlphaBetaAgent, it searches the game tree with iterative-deepening alpha-beta until its
+    time budget runs out and plays the first action of the best line found by the last completed iteration.
+
+    A ply is one action, so the player that acts keeps the move for the rest of its hand. When a hand is played out
+    the turn passes as in main.swap_turns() and the next player draws a hand; the drawn coins are unknown, so they are
+    picked with a generator seeded by the position key, which gives the same draw every time the search reaches the
+    same position. The actions are ordered by the transposition table move, then the killer moves of the ply, then
+    the history heuristic and the kind of action.
+
+    Attributes:
+        budget: The wall-clock seconds the agent can spend on a turn, split between the actions left in the hand.
+        max_depth: The deepest iteration, in plies.
+        max_nodes: Optional number of nodes a search can visit, which unlike the time budget gives the same action
+            on every machine.
+        table: The TranspositionTable class object shared by every search of the agent.
+        killers: List following the structure [ply] -> [the two last actions that caused a cutoff at that ply]
+        history: Dictionary following the structure {Action: score}, raised every time the action causes a cutoff.
+        nodes: The number of nodes visited by the last search.
+        depth: The depth of the last completed iteration of the last search.
+        value: The value of the chosen action, from the point of view of the player that searched.
+        elapsed: The seconds taken by the last search.
+        clock: The TurnClock class object sharing the budget of the turn between its actions.
+    """
+    def __init__(
+        self, budget: float = 3.0, max_depth: int = 32, table: TranspositionTable = None, max_nodes: int = None
+    ) -> None:
+        self.budget: float = budget
+        self.max_depth: int = max_depth
+        self.max_nodes: int = max_nodes
+        self.table: TranspositionTable = table if table is not None else TranspositionTable()
+        self.killers: list = []
+        self.history: dict = {}
+        self.nodes: int = 0
+        self.depth: int = 0
+        self.value: int = 0
+        self.elapsed: float = 0.0
+        self.deadline: float = 0.0
+        self.node_limit: float = math.inf
+        self.partial: tuple = None
+        self.seat: int = 0
+        self.clock: TurnClock = TurnClock()
+
+    @property
+    def nodes_per_second(self) -> float:
+        """
+        The nodes visited per second by the last search.
+        """
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    def report(self) -> str:
+        return (
+            f'searched {self.nodes:,} nodes to depth {self.depth} in {self.elapsed:.2f}s '
+            f'({self.nodes_per_second:,.0f} nodes/s), value {self.value}'
+        )
+
+    def choose_action(self, board: Board, player: Player) -> Action:
+        # Every action of the turn gets the same share of the time left
+        return self.search(board, player, self.clock.share(player, self.budget))
+
+    def search(self, board: Board, player: Player, seconds: float) -> Action:
+        """
+        Runs iterative-deepening alpha-beta from the current position.
+
+        Args:
+            board: The Board class object, containing the grid with the unit coins.
+            player: The Player class object defining the current player.
+            seconds: The wall-clock seconds the search can take.
+
+        Returns:
+            The best Action found, there is always one as long as the player has a coin in its hand.
+        """
+        start: float = time.perf_counter()
+        self.deadline = start + seconds
+        self.node_limit = self.max_nodes if self.max_nodes is not None else math.inf
+        self.seat = board.seats[player]
+        self.nodes = 0
+        self.depth = 0
+        self.killers = []
+        # Old cutoffs still help ordering, but shouldn't outweigh the ones of this search
+        self.history = {action: score >> 2 for action, score in self.history.items() if score >= 4}
+        root: int = len(board.history)
+
+        actions: list = board.legal_actions(player)
+        # Without time for a single iteration, play the action the ordering likes best
+        best: Action = self.order(board, board.position_key(player), actions, 0)[0]
+        for depth in range(1, self.max_depth + 1):
+            self.partial = None
+            try:
+                value, action = self.root_search(board, player, actions, depth)
+            except SearchTimeout:
+                # Undo the actions of the interrupted line
+                while len(board.history) > root:
+                    board.pop()
+                # The previous best action is searched first, so a partial iteration can only improve on it
+                if self.partial is not None:
+                    self.value, best = self.partial
+                break
+            best, self.value, self.depth = action, value, depth
+            # Searching deeper can't change a won or lost game
+            if abs(value) >= WIN - self.max_depth:
+                break
+        self.elapsed = time.perf_counter() - start
+        return best
+
+    def root_search(self, board: Board, player: Player, actions: list, depth: int) -> tuple:
+        """
+        Searches every root action to the given depth, starting with the best one of the previous iteration.
+
+        Args:
+            board: The Board class object, containing the grid with the unit coins.
+            player: The Player class object defining the current player.
+            actions: The legal actions of the player.
+            depth: The depth to search to, in plies.
+
+        Returns:
+            Tuple containing the (value, Action) of the best action.
+        """
+        key: int = board.position_key(player)
+        alpha: int = -INFINITY
+        best: Action = None
+        for action in self.order(board, key, actions, 0):
+            board.push(player, action)
+            value: int = self.alphabeta(board, player, depth - 1, alpha, INFINITY, 1)
+            board.pop()
+            if best is None or value > alpha:
+                alpha, best = value, action
+                self.partial = (alpha, best)
+        self.table.store(key, depth, alpha, EXACT, best)
+        return alpha, best
+
+    def alphabeta(self, board: Board, player: Player, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Searches a position with alpha-beta, returning its value from the point of view of the player that searched.
+
+        Args:
+            board: The Board class object, containing the grid with the unit coins.
+            player: The Player class object defining the player that has to act.
+            depth: The plies left to search.
+            alpha: The value the searching player is already sure to get.
+            beta: The value the opponent is already sure to hold the searching player to.
+            ply: The plies from the root.
+
+        Returns:
+            The value of the position.
+        """
+        self.nodes += 1
+        if self.nodes > self.node_limit or not self.nodes & 255 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+        # A player that runs out of control tokens wins at the end of the turn whatever it does with the rest of its hand
+        if player.control_tokens == 0:
+            return WIN - ply if board.seats[player] == self.seat else ply - WIN
+
+        if not player.hand:
+            return self.next_turn(board, player, depth, alpha, beta, ply)
+
+        if depth <= 0:
+            return self.evaluate(board)
+
+        key: int = board.position_key(player)
+        entry: tuple = self.table.probe(key)
+        if entry is not None and entry[0] >= depth:
+            value, flag = entry[1], entry[2]
+            if flag == EXACT:
+                return value
+            if flag == LOWER and value >= beta:
+                return value
+            if flag == UPPER and value <= alpha:
+                return value
+
+        maximizing: bool = board.seats[player] == self.seat
+        original_alpha, original_beta = alpha, beta
+        best_value: int = -INFINITY if maximizing else INFINITY
+        best: Action = None
+        for action in self.order(board, key, board.legal_actions(player), ply):
+            board.push(player, action)
+            value: int = self.alphabeta(board, player, depth - 1, alpha, beta, ply + 1)
+            board.pop()
+            if maximizing and value > best_value:
+                best_value, best = value, action
+                alpha = max(alpha, value)
+            elif not maximizing and value < best_value:
+                best_value, best = value, action
+                beta = min(beta, value)
+            if alpha >= beta:
+                self.cutoff(action, depth, ply)
+                break
+
+        if best_value <= original_alpha:
+            flag = UPPER
+        elif best_value >= original_beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.store(key, depth, best_value, flag, best)
+        return best_value
+
+    def next_turn(self, board: Board, player: Player, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Passes the turn once the hand of the player is empty and draws the hand of the next player, which doesn't use
+        up a ply of the search.
+
+        Args:
+            board: The Board class object, containing the grid with the unit coins.
+            player: The Player class object defining the player whose hand is empty.
+            depth: The plies left to search.
+            alpha: The value the searching player is already sure to get.
+            beta: The value the opponent is already sure to hold the searching player to.
+            ply: The plies from the root.
+
+        Returns:
+            The value of the position.
+        """
+        if depth <= 0:
+            return self.evaluate(board)
+        next_player: Player = board.push_end_turn(player)
+        # The same position always draws the same coins, so the tree doesn't change between iterations
+        rng: random.Random = random.Random(board.position_key(next_player))
+        if not board.push_draw(next_player, rng):
+            board.pop()
+            # A player that can't make a hand loses
+            return ply - WIN if board.seats[next_player] == self.seat else WIN - ply
+        value: int = self.alphabeta(board, next_player, depth, alpha, beta, ply)
+        board.pop()
+        board.pop()
+        return value
+
+    def order(self, board: Board, key: int, actions: list, ply: int) -> list:
+        """
+        Sorts the actions of a position so that the ones most likely to cause a cutoff are searched first.
+
+        Args:
+            board: The Board class object, containing the grid with the unit coins.
+            key: The Zobrist key of the position.
+            actions: The legal actions of the position.
+            ply: The plies from the root.
+
+        Returns:
+            A new list with the sorted actions.
+        """
+        entry: tuple = self.table.probe(key)
+        hash_move: Action = entry[3] if entry is not None else None
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers: list = self.killers[ply]
+        history: dict = self.history
+
+        def score(action: Action) -> int:
+            if action == hash_move:
+                return HASH_ORDER
+            value: int = KIND_ORDER.get(action.kind, 0) + history.get(action, 0)
+            if action in killers:
+                value += KILLER_ORDER
+            return value
+
+        return sorted(actions, key=score, reverse=True)
+
+    def cutoff(self, action: Action, depth: int, ply: int) -> None:
+        """
+        Remembers an action that caused a cutoff, as a killer move of its ply and in the history heuristic.
+
+        Args:
+            action: The Action that caused the cutoff.
+            depth: The plies that were left to search.
+            ply: The plies from the root.
+        """
+        killers: list = self.killers[ply]
+        if action not in killers:
+            killers.insert(0, action)
+            del killers[2:]
+        self.history[action] = self.history.get(action, 0) + depth * depth
+
+    def evaluate(self, board: Board) -> int:
+        """
+        Scores an unfinished game from the point of view of the player that searched: control tokens used, control
+        zones and units on the board, units standing over zones they can control and coins left to play, which have to
+        be enough for another hand.
+
+        Args:
+            board: The Board class object, containing the grid with the unit coins.
+
+        Returns:
+            The value of the position.
+        """
+        bits = board.bits
+        value: int = 0
+        for player, seat in board.seats.items():
+            coins: int = len(player.bag) + len(player.hand) + len(player.discarded)
+            score: int = (
+                TOKEN_WEIGHT * (3 - player.control_tokens)
+                + ZONE_WEIGHT * bits.owned[seat].bit_count()
+                + UNIT_WEIGHT * bits.occupied[seat].bit_count()
+                + THREAT_WEIGHT * bits.control_mask(seat).bit_count()
+                + COIN_WEIGHT * coins
+            )
+            if coins < 3:
+                score -= SHORT_PENALTY
+            value += score if seat == self.seat else -score
+        return value
+
+# ExpectimaxAgent class with its respective methods and properties
+class ExpectimaxAgent(AlphaBetaAgent):
+    """
+    A class to represent an ExpectimaxAgent, an AlphaBetaAgent that doesn't guess the coins drawn at the start of a
+    turn: the draw is a chance node whose value is the average of the values of every possible hand, weighted by its
+    exact probability (see draws.hand_distribution()).
+
+    With pruning, the chance nodes follow Star1: as every value lies between -WIN and WIN, the hands already searched
+    bound the average, so each hand is searched with the window that would still change the result and the node stops
+    as soon as the average can't get back inside the window of its parent. The most likely hands are searched first,
+    so that the bounds tighten quickly. Without pruning, every hand is searched with a full window, as in a plain
+    expectimax search, which gives the same values.
+
+    Attributes:
+        pruning: Whether the chance nodes are pruned.
+        chance_nodes: The number of chance nodes visited by the last search.
+        chance_cutoffs: The number of chance nodes of the last search that stopped before searching every hand.
+    """
+    def __init__(
+        self, budget: float = 3.0, max_depth: int = 32, table: TranspositionTable = None, max_nodes: int = None,
+        pruning: bool = True
+    ) -> None:
+        super().__init__(budget, max_depth, table, max_nodes)
+        self.pruning: bool = pruning
+        self.chance_nodes: int = 0
+        self.chance_cutoffs: int = 0
+
+    def report(self) -> str:
+        return f'{super().report()}, {self.chance_nodes:,} chance nodes ({self.chance_cutoffs:,} cut)'
+
+    def search(self, board: Board, player: Player, seconds: float) -> Action:
+        self.chance_nodes = 0
+        self.chance_cutoffs = 0
+        return super().search(board, player, seconds)
+
+    def next_turn(self, board: Board, player: Player, depth: int, alpha: float, beta: float, ply: int) -> float:
+        """
+        Passes the turn once the hand of the player is empty and averages the values of every hand the next player can
+        draw, which doesn't use up a ply of the search.
+
+        Args:
+            board: The Board class object, containing the grid with the unit coins.
+            player: The Player class object defining the player whose hand is empty.
+            depth: The plies left to search.
+            alpha: The value the searching player is already sure to get.
+            beta: The value the opponent is already sure to hold the searching player to.
+            ply: The plies from the root.
+
+        Returns:
+            The value of the position, or a bound beyond the window if the chance node was cut.
+        """
+        if depth <= 0:
+            return self.evaluate(board)
+        next_player: Player = board.push_end_turn(player)
+        hands: tuple = player_distribution(next_player)
+        if not hands:
+            board.pop()
+            # A player that can't make a hand loses
+            return ply - WIN if board.seats[next_player] == self.seat else WIN - ply
+        self.chance_nodes += 1
+
+        # Weighted sum of the values of the hands searched, and probability of the hands left
+        total: float = 0.0
+        remaining: float = 1.0
+        value: float = 0.0
+        for hand, probability in sorted(hands, key=lambda outcome: outcome[1], reverse=True):
+            remaining -= probability
+            if self.pruning:
+                # The values of this hand that keep the average inside the window, whatever the other hands are worth
+                low: float = max(-WIN, (alpha - total - WIN * remaining) / probability)
+                high: float = min(WIN, (beta - total + WIN * remaining) / probability)
+            else:
+                low, high = -INFINITY, INFINITY
+            board.push_draw(next_player, None, hand)
+            value = self.alphabeta(board, next_player, depth, low, high, ply)
+            board.pop()
+            if self.pruning and (value <= low or value >= high):
+                self.chance_cutoffs += 1
+                # The average is at most (or at least) this, even if the hands left get the best (or worst) value
+                value = total + probability * value + (WIN if value <= low else -WIN) * remaining
+                break
+            total += probability * value
+        else:
+            value = total
+        board.pop()
+        return value
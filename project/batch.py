@@ -0,0 +1,508 @@
+import numpy as np
+
+from action import Action, ActionTable, get_action_table, INITIATIVE, RECRUIT, CONTROL, PLACE, MOVE, ATTACK, SOLDIER_TYPES, COIN_TYPES
+from bitboard import TYPE_INDEX, squares_of
+from board import Board
+from cell import UNIT_SPECS
+from config import BoardConfig, SMALL_BOARD
+from player import Player
+from zobrist import COIN_INDEX
+
+# Numbers of unit types and coin types, and the index of the Royal coin
+TYPES: int = len(SOLDIER_TYPES)
+COINS: int = len(COIN_TYPES)
+ROYAL: int = COIN_INDEX['Royal']
+
+# Slots of the discard pile of each player, more than all the coins a player can have
+DISCARD_SLOTS: int = 16
+
+# Game outcomes stored in BatchEngine.winner besides the seat of the winner
+PLAYING: int = -1
+STOPPED: int = 2
+
+# Units of play_game(), as (type of unit, the no. of units corresponding to it)
+UNITS: tuple = (('Archer', 4), ('Knight', 5), ('Mercenary', 5), ('Berserker', 4))
+
+def square_of(coordinate: tuple, cols: int) -> int:
+    """
+    Helper function that translates (row, col) coordinates to a square index, -1 for missing coordinates.
+    """
+    return coordinate[0] * cols + coordinate[1] if coordinate is not None else -1
+
+# ActionCatalog class with its respective properties
+class ActionCatalog:
+    """
+    A class to represent an ActionCatalog, every Action that Board.legal_actions() can generate on a board, numbered
+    so that a batch of games can refer to an action by its index. The fields of the actions are also stored in arrays
+    so that the legality of every action can be computed for a whole batch at once.
+
+    Attributes:
+        actions: List following the structure [index] -> Action
+        index: Dictionary following the structure {Action: index}
+        groups: Dictionary following the structure {kind: slice of the indices of its actions}
+        pairs: Slice of the indices of the attacks with two targets, the last ones of the attack group.
+        piece: Array following the structure [index] -> coin type index of the coin used.
+        unit: Array following the structure [index] -> unit type index of the unit that is placed, moves, attacks or
+            is recruited, 0 for the actions without one.
+        start: Array following the structure [index] -> square of the unit that moves or attacks, -1 if unused.
+        end: Array following the structure [index] -> square to move to, place at, control or attack, -1 if unused.
+        extra: Array following the structure [index] -> square of the second attack, -1 if there isn't one.
+        source: Array following the structure [index] -> unit type index * squares + start square, to look up whether
+            a unit of that type stands on the start square.
+
+    The place actions are ordered by coin type and square, and the control actions by coin type and control zone, so
+    that their legality is the outer product of the coins in the hand and the squares.
+    """
+    def __init__(self, rows: int, cols: int, zones: int) -> None:
+        table: ActionTable = get_action_table(rows, cols)
+        squares: int = rows * cols
+        groups: list = [
+            (INITIATIVE, [table.initiative[piece] for piece in COIN_TYPES]),
+            (RECRUIT, [
+                table.recruit[(piece, unit_type)]
+                for piece in COIN_TYPES for unit_type in SOLDIER_TYPES if piece in (unit_type, 'Royal')
+            ]),
+            (CONTROL, [table.control[piece][square] for piece in COIN_TYPES for square in squares_of(zones)]),
+            (PLACE, [table.place[piece][square] for piece in SOLDIER_TYPES for square in range(squares)]),
+            (MOVE, [action for piece in SOLDIER_TYPES for moves in table.move[piece] for action in moves.values()]),
+            (ATTACK, [action for piece in SOLDIER_TYPES for attacks in table.attack[piece] for action in attacks.values()]),
+        ]
+        # Same pairs as Board.legal_actions(), the first target being the lowest square, after every single attack
+        pairs: list = []
+        for piece in SOLDIER_TYPES:
+            if UNIT_SPECS[piece].no_of_attacks > 1:
+                for attacks in table.attack[piece]:
+                    targets: list = list(attacks.values())
+                    for i, action in enumerate(targets):
+                        for second in targets[i + 1:]:
+                            pairs.append(Action(ATTACK, piece, action.start, action.end, extra_targets=(second.end,)))
+        groups[-1][1].extend(pairs)
+
+        self.actions: list = []
+        self.groups: dict = {}
+        for kind, actions in groups:
+            self.groups[kind] = slice(len(self.actions), len(self.actions) + len(actions))
+            self.actions.extend(actions)
+        self.index: dict = {action: i for i, action in enumerate(self.actions)}
+        self.pairs: slice = slice(len(self.actions) - len(pairs), len(self.actions))
+
+        self.piece: np.ndarray = np.array([COIN_INDEX[action.piece] for action in self.actions], dtype=np.intp)
+        self.unit: np.ndarray = np.array([
+            TYPE_INDEX.get(action.recruit if action.kind == RECRUIT else action.piece, 0) for action in self.actions
+        ], dtype=np.intp)
+        self.start: np.ndarray = np.array([square_of(action.start, cols) for action in self.actions], dtype=np.intp)
+        self.end: np.ndarray = np.array([square_of(action.end, cols) for action in self.actions], dtype=np.intp)
+        self.extra: np.ndarray = np.array([
+            square_of(action.extra_targets[0] if action.extra_targets else None, cols) for action in self.actions
+        ], dtype=np.intp)
+        self.source: np.ndarray = self.unit * squares + self.start
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+# Catalogs already built for each board size and control zones
+_action_catalogs: dict = {}
+
+def get_action_catalog(rows: int, cols: int, zones: int) -> ActionCatalog:
+    """
+    Returns the ActionCatalog for a board, building it the first time it is requested.
+
+    Args:
+        rows: The number of rows in the board.
+        cols: The number of columns in the board.
+        zones: Mask of the control zones.
+
+    Returns:
+        The shared ActionCatalog class object.
+    """
+    catalog: ActionCatalog = _action_catalogs.get((rows, cols, zones))
+    if catalog is None:
+        catalog = _action_catalogs[(rows, cols, zones)] = ActionCatalog(rows, cols, zones)
+    return catalog
+
+# BatchEngine class with its respective methods and properties
+class BatchEngine:
+    """
+    A class to represent a BatchEngine, many games played in lockstep with their state stored in NumPy arrays, where
+    the first axis is the game. It follows the rules of Board.apply_action() and the turn order of play_game(): every
+    step() applies one action in every unfinished game, and a game whose player has played out its hand passes the
+    turn and draws the next hand.
+
+    The unit coins are only counted by type, since which coin of a type is used doesn't change the game, except for
+    the discard pile: the bag is refilled from its front, so its order is kept.
+
+    Attributes:
+        games: The number of games in the batch.
+        rows: The number of rows in the board.
+        cols: The number of columns in the board.
+        catalog: The ActionCatalog class object of the board.
+        zones: Array following the structure [square] -> True for the control zones.
+        adjacent: Array following the structure [square][square] -> 1 for orthogonally adjacent squares.
+        occupant: Array following the structure [game][square] -> seat * TYPES + unit type index, -1 if empty.
+        owned: Array following the structure [game][square] -> seat controlling the zone, -1 if none.
+        hand: Array following the structure [game][seat][coin type index] -> coins in the hand.
+        bag: Array following the structure [game][seat][coin type index] -> coins in the bag.
+        discard: Array following the structure [game][seat][slot] -> coin type index of the discarded coins in the
+            order they were discarded, -1 for the empty slots.
+        discarded: Array following the structure [game][seat] -> coins in the discard pile.
+        recruitment: Array following the structure [game][seat][unit type index] -> coins left to recruit.
+        assigned: Array following the structure [game][seat][unit type index] -> True for the units assigned to the player.
+        tokens: Array following the structure [game][seat] -> remaining control tokens.
+        initiative: Array following the structure [game][seat] -> True if the player has the initiative.
+        initiative_count: Array following the structure [game][seat] -> rounds played with the initiative.
+        turn: Array following the structure [game] -> seat of the player that has to act.
+        turns: Array following the structure [game] -> turns started.
+        winner: Array following the structure [game] -> seat of the winner, PLAYING or STOPPED.
+        rng: The numpy.random.Generator used for the setup, the draws and the random actions.
+    """
+    def __init__(
+        self, games: int, seed: int = None, units: tuple = UNITS, draw: bool = True, config: BoardConfig = SMALL_BOARD
+    ) -> None:
+        """
+        Sets up the games like play_game(): each player is assigned two different unit types at random, with two coins
+        of each and the Royal coin in its bag and the rest of the coins to recruit, and a random player starts.
+
+        Args:
+            games: The number of games.
+            seed: Optional seed of the random generator.
+            units: Tuple of (type of unit, the no. of units corresponding to it) to assign from.
+            draw: Whether the starting players draw their hand, which from_boards() skips.
+            config: The BoardConfig class object of the board.
+        """
+        # The initial board and its control zones come from the scalar engine
+        layout: Board = Board(Player('CROW', 's'), Player('WOLF', 'v'), config)
+        self.games: int = games
+        self.rows: int = len(layout.grid)
+        self.cols: int = layout.cols
+        squares: int = self.rows * self.cols
+        self.catalog: ActionCatalog = get_action_catalog(self.rows, self.cols, layout.bits.zones)
+        self.zones: np.ndarray = np.array([bool(layout.bits.zones >> square & 1) for square in range(squares)])
+        self.adjacent: np.ndarray = np.array([
+            [layout.bits.tables.orthogonal(1 << square) >> other & 1 for other in range(squares)]
+            for square in range(squares)
+        ], dtype=np.int8)
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+        self.occupant: np.ndarray = np.full((games, squares), -1, dtype=np.int8)
+        self.owned: np.ndarray = np.full((games, squares), -1, dtype=np.int8)
+        for seat in (0, 1):
+            self.owned[:, squares_of(layout.bits.owned[seat])] = seat
+        self.hand: np.ndarray = np.zeros((games, 2, COINS), dtype=np.int8)
+        self.bag: np.ndarray = np.zeros((games, 2, COINS), dtype=np.int8)
+        self.discard: np.ndarray = np.full((games, 2, DISCARD_SLOTS), -1, dtype=np.int8)
+        self.discarded: np.ndarray = np.zeros((games, 2), dtype=np.int8)
+        self.recruitment: np.ndarray = np.zeros((games, 2, TYPES), dtype=np.int8)
+        self.assigned: np.ndarray = np.zeros((games, 2, TYPES), dtype=bool)
+        self.tokens: np.ndarray = np.full((games, 2), 3, dtype=np.int8)
+        self.initiative: np.ndarray = np.zeros((games, 2), dtype=bool)
+        self.initiative_count: np.ndarray = np.zeros((games, 2), dtype=np.int8)
+        self.turn: np.ndarray = self.rng.integers(0, 2, games).astype(np.int8)
+        self.turns: np.ndarray = np.ones(games, dtype=np.int32)
+        self.winner: np.ndarray = np.full(games, PLAYING, dtype=np.int8)
+
+        # Four different unit types for the two players of each game, crow taking the first two
+        choices: np.ndarray = np.argsort(self.rng.random((games, len(units))), axis=1)[:, :4]
+        counts: np.ndarray = np.array([count for _, count in units])
+        types: np.ndarray = np.array([TYPE_INDEX[unit_type] for unit_type, _ in units])
+        everyone: np.ndarray = np.arange(games)
+        for seat in (0, 1):
+            for pick in choices[:, 2 * seat:2 * seat + 2].T:
+                self.bag[everyone, seat, types[pick]] = 2
+                self.recruitment[everyone, seat, types[pick]] = counts[pick] - 2
+                self.assigned[everyone, seat, types[pick]] = True
+            self.bag[:, seat, ROYAL] = 1
+        if draw:
+            self.draw(everyone)
+
+    @classmethod
+    def from_boards(cls, games: list):
+        """
+        Creates a batch with the state of games of the scalar engine, whose players haven't drawn their hand yet.
+
+        Args:
+            games: List of (board, player) tuples, where player is the player that draws next, all on the same board.
+
+        Returns:
+            The BatchEngine class object.
+        """
+        engine: BatchEngine = cls(len(games), draw=False, config=games[0][0].config)
+        for game, (board, player) in enumerate(games):
+            engine.load(game, board, player)
+        return engine
+
+    def load(self, game: int, board: Board, player: Player) -> None:
+        """
+        Copies the state of a game of the scalar engine into the batch.
+
+        Args:
+            game: The index of the game in the batch.
+            board: The Board class object of the game.
+            player: The Player class object of the player that has to act.
+        """
+        bits = board.bits
+        self.occupant[game] = -1
+        self.owned[game] = -1
+        for seat in (0, 1):
+            for unit_type, mask in enumerate(bits.units[seat]):
+                self.occupant[game, squares_of(mask)] = seat * TYPES + unit_type
+            self.owned[game, squares_of(bits.owned[seat])] = seat
+        for seated, seat in board.seats.items():
+            for counts, coins in ((self.hand, seated.hand), (self.bag, seated.bag)):
+                counts[game, seat] = 0
+                for coin in coins:
+                    counts[game, seat, COIN_INDEX[coin.unit_type]] += 1
+            self.discard[game, seat] = -1
+            self.discard[game, seat, :len(seated.discarded)] = [COIN_INDEX[coin.unit_type] for coin in seated.discarded]
+            self.discarded[game, seat] = len(seated.discarded)
+            self.recruitment[game, seat] = 0
+            self.assigned[game, seat] = False
+            for unit_type, stack in seated.assigned_units.items():
+                self.recruitment[game, seat, TYPE_INDEX[unit_type]] = len(stack)
+                self.assigned[game, seat, TYPE_INDEX[unit_type]] = True
+            self.tokens[game, seat] = seated.control_tokens
+            self.initiative[game, seat] = seated.has_initiative
+            self.initiative_count[game, seat] = seated.initiative_count
+        self.turn[game] = board.seats[player]
+        self.winner[game] = PLAYING
+
+    def state(self, game: int) -> tuple:
+        """
+        Returns the whole state of a game as plain Python values, to compare games between batches.
+        """
+        return tuple(
+            getattr(self, name)[game].tolist()
+            for name in ('occupant', 'owned', 'hand', 'bag', 'discard', 'recruitment', 'tokens', 'initiative',
+                         'initiative_count', 'turn', 'winner')
+        )
+
+    def legal_mask(self, games: np.ndarray = None) -> np.ndarray:
+        """
+        Computes which actions of the ActionCatalog are legal for the player that has to act. The games that have
+        ended have no legal actions. The mask is action-major, so that looking up the squares of every action copies
+        whole rows.
+
+        Args:
+            games: Optional array of the indices of the games, all of them by default.
+
+        Returns:
+            Boolean array following the structure [action index][game], with a column for each of the games.
+        """
+        if games is None:
+            games = np.arange(self.games)
+        catalog: ActionCatalog = self.catalog
+        count: int = len(games)
+        seat: np.ndarray = self.turn[games].astype(np.intp)
+        hand: np.ndarray = ((self.hand[games, seat] > 0) & (self.winner[games] == PLAYING)[:, None]).T
+        occupant: np.ndarray = self.occupant[games].T
+        owned: np.ndarray = self.owned[games].T
+        free: np.ndarray = occupant < 0
+        own: np.ndarray = ~free & (occupant // TYPES == seat)
+        enemy: np.ndarray = ~free & ~own
+        mask: np.ndarray = np.empty((len(catalog), count), dtype=bool)
+
+        group: slice = catalog.groups[INITIATIVE]
+        mask[group] = hand[catalog.piece[group]]
+
+        group = catalog.groups[RECRUIT]
+        recruitment: np.ndarray = (self.recruitment[games, seat] > 0).T
+        mask[group] = hand[catalog.piece[group]] & recruitment[catalog.unit[group]]
+
+        # Control the zones the player units are standing on, unless it already controls them or has no tokens left
+        group = catalog.groups[CONTROL]
+        zones: np.ndarray = own[self.zones] & (owned[self.zones] != seat) & (self.tokens[games, seat] > 0)
+        mask[group] = (hand[:, None, :] & zones[None, :, :]).reshape(-1, count)
+
+        # Place on the empty squares next to the zones the player controls without an opponent unit over them
+        group = catalog.groups[PLACE]
+        sources: np.ndarray = ((owned == seat) & ~enemy).astype(np.int8)
+        placements: np.ndarray = (self.adjacent @ sources > 0) & free & ~self.zones[:, None]
+        mask[group] = (hand[:TYPES, None, :] & placements[None, :, :]).reshape(-1, count)
+
+        # Move or attack with a unit of the same type as the coin, looked up by unit type and square
+        ready: np.ndarray = (
+            hand[:TYPES, None, :] & (occupant[None, :, :] == seat * TYPES + np.arange(TYPES)[:, None, None])
+        ).reshape(-1, count)
+        group = catalog.groups[MOVE]
+        mask[group] = ready[catalog.source[group]] & free[catalog.end[group]]
+        group = catalog.groups[ATTACK]
+        mask[group] = ready[catalog.source[group]] & enemy[catalog.end[group]]
+        mask[catalog.pairs] &= enemy[catalog.extra[catalog.pairs]]
+        return mask
+
+    def random_actions(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Picks a uniformly random legal action in every column of a legal_mask(), -1 in the columns without legal
+        actions.
+
+        Args:
+            mask: Boolean array following the structure [action index][game].
+
+        Returns:
+            Array following the structure [game] -> action index.
+        """
+        # Decoding the flat positions is much faster than a two-dimensional np.nonzero()
+        actions, games = np.divmod(np.flatnonzero(mask), mask.shape[1])
+        # Group the legal actions by game, keeping them in catalog order
+        order: np.ndarray = np.argsort(games, kind='stable')
+        counts: np.ndarray = np.bincount(games, minlength=mask.shape[1])
+        first: np.ndarray = np.cumsum(counts) - counts
+        picks: np.ndarray = first + (self.rng.random(len(counts)) * counts).astype(np.intp)
+        chosen: np.ndarray = np.full(len(counts), -1, dtype=np.intp)
+        legal: np.ndarray = counts > 0
+        chosen[legal] = actions[order[picks[legal]]]
+        return chosen
+
+    def step(self, actions: np.ndarray, hands: np.ndarray = None) -> None:
+        """
+        Applies one action in every game, then passes the turn in the games whose player has played out its hand. The
+        actions must be legal, the games with a negative action are left untouched.
+
+        Args:
+            actions: Array following the structure [game] -> action index.
+            hands: Optional array following the structure [game][coin type index] with the hands drawn by the games
+                that pass the turn, see draw().
+        """
+        catalog: ActionCatalog = self.catalog
+        games: np.ndarray = np.flatnonzero((actions >= 0) & (self.winner == PLAYING))
+        actions = actions[games]
+        seat: np.ndarray = self.turn[games].astype(np.intp)
+        piece: np.ndarray = catalog.piece[actions]
+        unit: np.ndarray = catalog.unit[actions]
+        start: np.ndarray = catalog.start[actions]
+        end: np.ndarray = catalog.end[actions]
+        self.hand[games, seat, piece] -= 1
+
+        # Every used coin is discarded, except the placed ones that go to the board
+        placed: slice = catalog.groups[PLACE]
+        used: np.ndarray = (actions < placed.start) | (actions >= placed.stop)
+        rows: np.ndarray = games[used]
+        self.discard[rows, seat[used], self.discarded[rows, seat[used]]] = piece[used]
+        self.discarded[rows, seat[used]] += 1
+
+        def kind(name: str) -> np.ndarray:
+            group: slice = catalog.groups[name]
+            return (actions >= group.start) & (actions < group.stop)
+
+        chosen: np.ndarray = kind(RECRUIT)
+        self.recruitment[games[chosen], seat[chosen], unit[chosen]] -= 1
+        self.bag[games[chosen], seat[chosen], unit[chosen]] += 1
+
+        chosen = kind(CONTROL)
+        self.owned[games[chosen], end[chosen]] = seat[chosen]
+        self.tokens[games[chosen], seat[chosen]] -= 1
+
+        chosen = kind(PLACE)
+        self.occupant[games[chosen], end[chosen]] = seat[chosen] * TYPES + unit[chosen]
+
+        chosen = kind(MOVE)
+        self.occupant[games[chosen], end[chosen]] = self.occupant[games[chosen], start[chosen]]
+        self.occupant[games[chosen], start[chosen]] = -1
+
+        chosen = kind(ATTACK)
+        self.occupant[games[chosen], end[chosen]] = -1
+        extra: np.ndarray = catalog.extra[actions]
+        chosen &= extra >= 0
+        self.occupant[games[chosen], extra[chosen]] = -1
+
+        chosen = kind(INITIATIVE)
+        self.initiative[games[chosen], seat[chosen]] = True
+
+        # Pass the turn once the hand has been played out
+        done: np.ndarray = games[self.hand[games, seat].sum(axis=1) == 0]
+        if len(done):
+            self.end_turn(done, hands[done] if hands is not None else None)
+
+    def end_turn(self, games: np.ndarray, hands: np.ndarray = None) -> None:
+        """
+        Ends the turn of the player that has to act, like play_game(): the player wins if it has no control tokens
+        left, otherwise the turn passes as in main.swap_turns() and the next player draws its hand.
+
+        Args:
+            games: Array of the indices of the games.
+            hands: Optional array following the structure [game][coin type index] with the hands to draw, see draw().
+        """
+        seat: np.ndarray = self.turn[games].astype(np.intp)
+        won: np.ndarray = self.tokens[games, seat] == 0
+        self.winner[games[won]] = seat[won]
+        games, seat = games[~won], seat[~won]
+        if hands is not None:
+            hands = hands[~won]
+
+        # A player with the initiative plays at most two rounds in a row
+        keep: np.ndarray = self.initiative[games, seat] & (self.initiative_count[games, seat] + 1 < 2)
+        self.initiative_count[games[keep], seat[keep]] += 1
+        lose: np.ndarray = self.initiative[games, seat] & ~keep
+        self.initiative[games[lose], seat[lose]] = False
+        self.initiative_count[games[lose], seat[lose]] = 0
+        self.turn[games[~keep]] = 1 - seat[~keep]
+        self.turns[games] += 1
+        self.draw(games, hands)
+
+    def draw(self, games: np.ndarray, hands: np.ndarray = None) -> None:
+        """
+        Draws the hand of the player that has to act, like Board.draw(): the bag is refilled from the front of the
+        discard pile while it has less than three coins, and three coins are drawn from it. A player that can't make a
+        hand loses.
+
+        Args:
+            games: Array of the indices of the games.
+            hands: Optional array following the structure [game][coin type index] with the coins to draw instead of
+                random ones, used to follow games of the scalar engine.
+        """
+        seat: np.ndarray = self.turn[games].astype(np.intp)
+        bag: np.ndarray = self.bag[games, seat].sum(axis=1)
+        short: np.ndarray = bag + self.discarded[games, seat] < 3
+        self.winner[games[short]] = 1 - seat[short]
+        games, seat, bag = games[~short], seat[~short], bag[~short]
+        if hands is not None:
+            hands = hands[~short]
+
+        # At most three coins have to be moved to the bag
+        for _ in range(3):
+            refill: np.ndarray = bag < 3
+            if not refill.any():
+                break
+            rows, seats = games[refill], seat[refill]
+            coins: np.ndarray = self.discard[rows, seats, 0].astype(np.intp)
+            self.bag[rows, seats, coins] += 1
+            self.discard[rows, seats, :-1] = self.discard[rows, seats, 1:]
+            self.discard[rows, seats, -1] = -1
+            self.discarded[rows, seats] -= 1
+            bag[refill] += 1
+
+        self.hand[games, seat] = 0
+        if hands is not None:
+            self.hand[games, seat] = hands
+            self.bag[games, seat] -= hands.astype(np.int8)
+            return
+        # Drawing a uniformly random coin of the bag is drawing a type in proportion to its count
+        for _ in range(3):
+            counts: np.ndarray = self.bag[games, seat]
+            picks: np.ndarray = (self.rng.random(len(games)) * counts.sum(axis=1)).astype(np.int32)
+            coins = (counts.cumsum(axis=1) > picks[:, None]).argmax(axis=1)
+            self.bag[games, seat, coins] -= 1
+            self.hand[games, seat, coins] += 1
+
+    def rollout(self, policy=None, max_turns: int = 200) -> np.ndarray:
+        """
+        Plays every game until it ends.
+
+        Args:
+            policy: Optional function that takes the BatchEngine class object, the indices of the unfinished games and
+                their legal_mask() rows, and returns the action index of each of those games. It plays random legal
+                actions by default.
+            max_turns: The number of turns after which a game is stopped without a winner.
+
+        Returns:
+            Array following the structure [game] -> seat of the winner, or STOPPED.
+        """
+        actions: np.ndarray = np.full(self.games, -1, dtype=np.intp)
+        while True:
+            self.winner[(self.winner == PLAYING) & (self.turns > max_turns)] = STOPPED
+            games: np.ndarray = np.flatnonzero(self.winner == PLAYING)
+            if not len(games):
+                return self.winner
+            mask: np.ndarray = self.legal_mask(games)
+            actions[:] = -1
+            actions[games] = policy(self, games, mask) if policy is not None else self.random_actions(mask)
+            self.step(actions)
@@ -0,0 +1,715 @@
+import asyncio
+import contextlib
+import copy
+import io
+import math
+import multiprocessing
+import os
+import pickle
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from agent import AlphaBetaAgent, ExpectimaxAgent
+from board import Board
+from config import BOARDS, BoardConfig, SMALL_BOARD
+from events import NULL_SINK, TERMINAL
+from high_scores import (
+    GAME_COLUMNS, FinishedGame, ScoreWriter, close_connections, get_connection, high_scores, recent_games, top_players
+)
+from player import Player
+from main import initialize_player
+from mcts import MCTSAgent
+from records import Draw, positions, read_games
+from server import GameClient, GameServer
+from simulate import play_headless
+from snapshot import from_bytes, to_bytes
+
+try:
+    from batch import BatchEngine
+except ImportError:
+    # NumPy is optional, only the batched engine needs it
+    BatchEngine = None
+
+def random_positions(count: int, seed: int = 0, config: BoardConfig = SMALL_BOARD) -> list:
+    """
+    Plays random games and keeps copies of the positions reached before every action.
+
+    Args:
+        count: The number of positions to collect.
+        seed: The seed used for the random unit assignment, draws and actions.
+        config: The BoardConfig class object of the board to play on.
+
+    Returns:
+        A list of (board, player) tuples, where player is the player that has to act.
+    """
+    random.seed(seed)
+    positions: list = []
+    while len(positions) < count:
+        units: list[tuple] = [('Archer', 4), ('Knight', 5), ('Mercenary', 5), ('Berserker', 4)]
+        # The drawn hands are not relevant for the benchmarks
+        crow: Player = initialize_player(Player('CROW', 's', events=NULL_SINK), units)
+        wolf: Player = initialize_player(Player('WOLF', 'v', events=NULL_SINK), units)
+        board: Board = Board(crow, wolf, config, NULL_SINK)
+        player: Player = crow
+        while len(positions) < count and player.control_tokens > 0 and player.get_hand():
+            while player.hand:
+                positions.append(copy.deepcopy((board, player)))
+                board.apply_action(player, random.choice(board.legal_actions(player)))
+            player = wolf if player == crow else crow
+    return positions[:count]
+
+def bench_events(games: int = 300, seed: int = 0) -> tuple:
+    """
+    Measures how many random games per second are played through the interactive rule code, Player.get_hand(),
+    Player.get_recruitment_units() and Board.perform(), when their events are printed (to a buffer, so that the terminal speed doesn't count) and when
+    they go to the NULL_SINK.
+
+    Args:
+        games: The number of games played with each sink.
+        seed: The seed used for the random unit assignment, draws and actions.
+
+    Returns:
+        Tuple containing the games per second with the (terminal subscriber, NULL_SINK).
+    """
+    speeds: list = []
+    for events in (TERMINAL, NULL_SINK):
+        random.seed(seed)
+        start: float = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(games):
+                units: list[tuple] = [('Archer', 4), ('Knight', 5), ('Mercenary', 5), ('Berserker', 4)]
+                crow: Player = initialize_player(Player('CROW', 's', events=events), units)
+                wolf: Player = initialize_player(Player('WOLF', 'v', events=events), units)
+                board: Board = Board(crow, wolf, events=events)
+                player: Player = crow
+                for _ in range(200):
+                    player.get_recruitment_units()
+                    if not player.get_hand():
+                        break
+                    while player.hand:
+                        board.perform(player, random.choice(board.legal_actions(player)))
+                    if player.control_tokens == 0:
+                        break
+                    player = wolf if player == crow else crow
+        speeds.append(games / (time.perf_counter() - start))
+    return tuple(speeds)
+
+def bench_legal_actions(positions: list, seconds: float = 1.0) -> float:
+    """
+    Measures how many legal actions per second Board.legal_actions() generates over a set of positions.
+
+    Args:
+        positions: List of (board, player) tuples.
+        seconds: The minimum time to run the benchmark for.
+
+    Returns:
+        The number of generated actions per second.
+    """
+    buffer: list = []
+    generated: int = 0
+    start: float = time.perf_counter()
+    elapsed: float = 0.0
+    while elapsed < seconds:
+        for board, player in positions:
+            generated += len(board.legal_actions(player, buffer))
+        elapsed = time.perf_counter() - start
+    return generated / elapsed
+
+def bench_copy(positions: list, repeat: int = 5) -> tuple:
+    """
+    Measures how long copying the state of a board takes, as a deep copy of the Board class object (with its Cell and
+    Unit class objects) and as a copy of its BitBoard.
+
+    Args:
+        positions: List of (board, player) tuples.
+        repeat: The number of times every position is copied.
+
+    Returns:
+        Tuple containing the microseconds per copy of the (Board, BitBoard).
+    """
+    start: float = time.perf_counter()
+    for _ in range(repeat):
+        for board, _ in positions:
+            copy.deepcopy(board)
+    board_time: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for board, _ in positions:
+            board.bits.copy()
+    bits_time: float = time.perf_counter() - start
+
+    copies: int = repeat * len(positions)
+    return board_time / copies * 1e6, bits_time / copies * 1e6
+
+def bench_memory(positions: list) -> float:
+    """
+    Measures the memory taken by a copy of a game state, the Board class object with its grid, BitBoard and both
+    Player class objects with their coins, as traced by tracemalloc.
+
+    Args:
+        positions: List of (board, player) tuples.
+
+    Returns:
+        The number of bytes per game state.
+    """
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    copies: list = [copy.deepcopy(position) for position in positions]
+    after: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(copies)
+
+def bench_snapshot(positions: list, repeat: int = 3) -> dict:
+    """
+    Measures the size of a game state and the microseconds taken to save and load it, with snapshot.to_bytes() and
+    from_bytes() and with pickle of the Board and Player class objects.
+
+    Args:
+        positions: The (board, player) tuples to save.
+        repeat: The number of times every position is saved and loaded.
+
+    Returns:
+        Dictionary following the structure {'bytes' or 'pickle': (bytes per state, save us, load us)}
+    """
+    formats: dict = {
+        'bytes': (lambda position: to_bytes(*position), lambda data: from_bytes(data, NULL_SINK)),
+        'pickle': (lambda position: pickle.dumps(position, pickle.HIGHEST_PROTOCOL), pickle.loads),
+    }
+    results: dict = {}
+    for name, (save, load) in formats.items():
+        start: float = time.perf_counter()
+        for _ in range(repeat):
+            saved: list = [save(position) for position in positions]
+        save_time: float = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for data in saved:
+                load(data)
+        load_time: float = time.perf_counter() - start
+        count: int = repeat * len(positions)
+        results[name] = (sum(map(len, saved)) / len(saved), save_time / count * 1e6, load_time / count * 1e6)
+    return results
+
+def bench_push_pop(positions: list) -> float:
+    """
+    Measures how long exploring a child node takes with Board.push() and Board.pop().
+
+    Args:
+        positions: List of (board, player) tuples.
+
+    Returns:
+        The microseconds per push and pop.
+    """
+    explored: int = 0
+    start: float = time.perf_counter()
+    for board, player in positions:
+        for action in board.legal_actions(player):
+            board.push(player, action)
+            board.pop()
+            explored += 1
+    return (time.perf_counter() - start) / explored * 1e6
+
+def bench_search(positions: list, seconds: float = 0.05) -> tuple:
+    """
+    Measures the speed of the AlphaBetaAgent search, searching every position for a fixed time.
+
+    Args:
+        positions: List of (board, player) tuples.
+        seconds: The time each search can take.
+
+    Returns:
+        Tuple containing the (nodes per second, average depth reached).
+    """
+    agent: AlphaBetaAgent = AlphaBetaAgent()
+    nodes: int = 0
+    depth: int = 0
+    elapsed: float = 0.0
+    for board, player in positions:
+        agent.search(board, player, seconds)
+        nodes += agent.nodes
+        depth += agent.depth
+        elapsed += agent.elapsed
+    return nodes / elapsed, depth / len(positions)
+
+def bench_expectimax(positions: list, depth: int = 5) -> tuple:
+    """
+    Measures the ExpectimaxAgent searching the positions where the player has a single coin left to the same depth,
+    so that every line goes through a draw, with and without pruning the chance nodes.
+
+    Args:
+        positions: List of (board, player) tuples.
+        depth: The depth of the searches, in plies.
+
+    Returns:
+        Tuple containing the (nodes per second with pruning, nodes with pruning, nodes without pruning).
+    """
+    last_coin: list = [(board, player) for board, player in positions if len(player.hand) == 1]
+    nodes: dict = {}
+    elapsed: float = 0.0
+    for pruning in (True, False):
+        nodes[pruning] = 0
+        for board, player in last_coin:
+            agent: ExpectimaxAgent = ExpectimaxAgent(max_depth=depth, pruning=pruning)
+            agent.search(board, player, math.inf)
+            nodes[pruning] += agent.nodes
+            if pruning:
+                elapsed += agent.elapsed
+    return nodes[True] / elapsed, nodes[True], nodes[False]
+
+def bench_mcts(positions: list, seconds: float = 1.0) -> dict:
+    """
+    Measures the playouts per second of the MCTSAgent, from one worker process up to one per core, searching each
+    position for the same time.
+
+    Args:
+        positions: List of (board, player) tuples.
+        seconds: The time each search can take.
+
+    Returns:
+        Dictionary following the structure {workers: playouts per second, over all the trees}
+    """
+    cores: int = os.cpu_count() or 1
+    speeds: dict = {}
+    for workers in sorted({1, cores} | {workers for workers in (2, 4, 8, 16) if workers < cores}):
+        agent: MCTSAgent = MCTSAgent(workers=workers, seed=0)
+        playouts: int = 0
+        elapsed: float = 0.0
+        for board, player in positions:
+            agent.search(board, player, seconds)
+            playouts += agent.playouts
+            elapsed += agent.elapsed
+        agent.close()
+        speeds[workers] = playouts / elapsed
+    return speeds
+
+def bench_rollouts(games: int = 4096, size: str = '5x5') -> tuple:
+    """
+    Measures how many random games per second the scalar engine and the BatchEngine play to the end.
+
+    Args:
+        games: The number of games played by the BatchEngine, the scalar engine plays a tenth of them.
+        size: The name of the board in BOARDS.
+
+    Returns:
+        Tuple containing the games per second of the (scalar engine, BatchEngine), the latter None without NumPy.
+    """
+    start: float = time.perf_counter()
+    for game in range(games // 10):
+        play_headless(game, 0, size=size)
+    scalar: float = games // 10 / (time.perf_counter() - start)
+    if BatchEngine is None:
+        return scalar, None
+    start = time.perf_counter()
+    BatchEngine(games, seed=0, config=BOARDS[size]).rollout()
+    return scalar, games / (time.perf_counter() - start)
+
+def bench_records(games: int = 200, size: str = '5x5') -> tuple:
+    """
+    Measures the size of the binary records of random games and how fast they are read back and played again.
+
+    Args:
+        games: The number of games recorded.
+        size: The name of the board in BOARDS.
+
+    Returns:
+        Tuple containing the (bytes per action, games read per second, entries replayed per second).
+    """
+    data: bytes = b''.join(play_headless(game, 0, size=size, record=True).record for game in range(games))
+    start: float = time.perf_counter()
+    records: list = list(read_games(io.BytesIO(data)))
+    read: float = games / (time.perf_counter() - start)
+    actions: int = sum(type(entry) is not Draw for record in records for entry in record.entries)
+    entries: int = 0
+    start = time.perf_counter()
+    for record in records:
+        for entries_played, _, _ in positions(record):
+            pass
+        entries += entries_played
+    return len(data) / actions, read, entries / (time.perf_counter() - start)
+
+def bench_high_scores(wins: int = 20000, producers: int = 8, players: int = 200, direct: int = 300) -> tuple:
+    """
+    Measures how fast wins reach the high scores database when many games finish at once: several threads submit games
+    to a ScoreWriter at the same time, and wins are also committed one at a time on a plain connection to the old
+    high scores table, the way a game did without the writer.
+
+    Args:
+        wins: The number of wins submitted to the ScoreWriter.
+        producers: The number of threads submitting them.
+        players: The number of different winners.
+        direct: The number of wins committed one at a time.
+
+    Returns:
+        Tuple containing the (wins per second of the ScoreWriter, average submit() in microseconds, wins per second
+        committed one at a time). The submit() time includes waiting for the other threads to release the GIL.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        writer: ScoreWriter = ScoreWriter(os.path.join(directory, 'batched.db'))
+        submitting: list = [0.0] * producers
+
+        def produce(producer: int) -> None:
+            for win in range(producer, wins, producers):
+                start: float = time.perf_counter()
+                writer.submit(FinishedGame(
+                    None, f'player{win % players}', f'player{(win + 1) % players}', f'player{win % players}',
+                    ('Archer', 'Knight'), ('Mercenary', 'Berserker'), 40
+                ))
+                submitting[producer] += time.perf_counter() - start
+
+        start: float = time.perf_counter()
+        threads: list = [threading.Thread(target=produce, args=(producer,)) for producer in range(producers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.close()
+        batched: float = wins / (time.perf_counter() - start)
+
+        conn: sqlite3.Connection = sqlite3.connect(os.path.join(directory, 'direct.db'))
+        conn.execute('CREATE TABLE high_scores (player_name text, victories integer, date text)')
+        start = time.perf_counter()
+        for win in range(direct):
+            player_name: str = f'player{win % players}'
+            cursor: sqlite3.Cursor = conn.execute(
+                "UPDATE high_scores SET victories = victories + 1, date = datetime('now') WHERE player_name = ?",
+                (player_name,)
+            )
+            if cursor.rowcount == 0:
+                conn.execute("INSERT INTO high_scores VALUES (?, 1, datetime('now'))", (player_name,))
+            conn.commit()
+        unbatched: float = direct / (time.perf_counter() - start)
+        conn.close()
+    return batched, sum(submitting) / wins * 1e6, unbatched
+
+def bench_high_score_reads(reads: int = 2000) -> tuple:
+    """
+    Measures the microseconds taken to read the high scores with high_scores(), which reuses the connection of the
+    thread, and the way it used to be done: connecting, creating the table, counting its rows and closing on every read.
+
+    Args:
+        reads: The number of reads of each kind.
+
+    Returns:
+        Tuple containing the microseconds per read of the (persistent connection, new connection).
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'high_scores.db')
+        high_scores(path)
+        start: float = time.perf_counter()
+        for _ in range(reads):
+            high_scores(path)
+        persistent: float = (time.perf_counter() - start) / reads * 1e6
+
+        start = time.perf_counter()
+        for _ in range(reads):
+            conn: sqlite3.Connection = sqlite3.connect(path)
+            conn.execute('CREATE TABLE IF NOT EXISTS high_scores (player_name text, victories integer, date text)')
+            conn.execute('SELECT COUNT(*) FROM high_scores').fetchone()
+            conn.execute('SELECT player_name, victories, date FROM high_scores ORDER BY date DESC').fetchall()
+            conn.close()
+        reconnecting: float = (time.perf_counter() - start) / reads * 1e6
+        close_connections()
+    return persistent, reconnecting
+
+def bench_results_queries(games: int = 200000, players: int = 1000, depth: int = 100000, repeat: int = 20) -> dict:
+    """
+    Measures the leaderboard queries on a large results database: a page of recent games found by key against the same
+    page found with OFFSET, and the top players read from the per-player totals against adding up the games table.
+
+    Args:
+        games: The number of games in the database.
+        players: The number of different players.
+        depth: The number of recent games before the page of recent games read.
+        repeat: The number of times each query is run.
+
+    Returns:
+        Dictionary following the structure {query: milliseconds per query}.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'results.db')
+        writer: ScoreWriter = ScoreWriter(path, batch_size=4096)
+        rng: random.Random = random.Random(0)
+        for game in range(games):
+            crow, wolf = rng.sample(range(players), 2)
+            writer.submit(FinishedGame(
+                f'2024-{game * 12 // games + 1:02}-01 {game % 86400 // 3600:02}:00:00', f'player{crow}',
+                f'player{wolf}', f'player{rng.choice((crow, wolf))}', ('Archer', 'Knight'), ('Mercenary', 'Berserker'),
+                rng.randint(10, 80)
+            ))
+        writer.close()
+
+        def timed(query) -> float:
+            start: float = time.perf_counter()
+            for _ in range(repeat):
+                query()
+            return (time.perf_counter() - start) / repeat * 1e3
+
+        conn: sqlite3.Connection = get_connection(path)
+        # The key a reader paging through the recent games would have at that depth
+        key: tuple = conn.execute(
+            'SELECT date, id FROM games ORDER BY date DESC, id DESC LIMIT 1 OFFSET ?', (depth - 1,)
+        ).fetchone()
+        times: dict = {
+            'recent page by key': timed(lambda: recent_games(path, before=key)),
+            'recent page by OFFSET': timed(lambda: conn.execute(
+                f'{GAME_COLUMNS} ORDER BY g.date DESC, g.id DESC LIMIT 20 OFFSET ?', (depth,)
+            ).fetchall()),
+            'top players from totals': timed(lambda: top_players(path)),
+            'top players from games': timed(lambda: conn.execute(
+                'SELECT winner, count(*) AS victories FROM games GROUP BY winner ORDER BY victories DESC LIMIT 20'
+            ).fetchall()),
+        }
+        close_connections()
+    return times
+
+# Program timed by bench_startup(): it starts a game of two computer players in the working directory, prints the
+# seconds since its imports finished at the first board render and exits. The blocking variant reads the high scores
+# before the game, as play_game() did.
+STARTUP_PROGRAM: str = """
+import builtins, os, sys, time
+sys.path.insert(0, {directory!r})
+import main
+from board import Board
+from config import SMALL_BOARD
+from high_scores import high_scores
+
+def rendered(board):
+    print('rendered', time.perf_counter() - imported, flush=True)
+    os._exit(0)
+
+imported = time.perf_counter()
+builtins.input = lambda prompt='': 'ai'
+Board.print_board = rendered
+if {blocking}:
+    main.get_high_scores = lambda timeout=0.0: print(high_scores()) or True
+else:
+    main.get_leaderboard()
+main.play_game(config=SMALL_BOARD)
+"""
+
+def bench_startup(runs: int = 10, games: int = 20000) -> dict:
+    """
+    Measures the milliseconds from starting the program to its first board render, with the high scores loaded in the
+    background and read before the game, on a new database and on one with many games. Most of it is starting Python
+    and importing the modules, so the milliseconds from the end of the imports to the render are measured too.
+
+    Args:
+        runs: The number of times the program is started for each case, the fastest one is kept.
+        games: The number of games of the existing database.
+
+    Returns:
+        Dictionary following the structure {case: (milliseconds from the start, milliseconds from the imports)}.
+    """
+    times: dict = {}
+    with tempfile.TemporaryDirectory() as directory:
+        writer: ScoreWriter = ScoreWriter(os.path.join(directory, 'high_scores.db'), batch_size=4096)
+        for game in range(games):
+            writer.submit(FinishedGame(
+                None, f'player{game % 100}', f'player{(game + 1) % 100}', f'player{game % 100}',
+                ('Archer', 'Knight'), ('Mercenary', 'Berserker'), 40
+            ))
+        writer.close()
+        for database in ('new', 'existing'):
+            for blocking in (False, True):
+                program: str = STARTUP_PROGRAM.format(
+                    directory=os.path.dirname(os.path.abspath(__file__)), blocking=blocking
+                )
+                best: float = math.inf
+                after_imports: float = math.inf
+                for _ in range(runs):
+                    with tempfile.TemporaryDirectory() as working:
+                        if database == 'existing':
+                            with open(os.path.join(directory, 'high_scores.db'), 'rb') as source:
+                                with open(os.path.join(working, 'high_scores.db'), 'wb') as copied:
+                                    copied.write(source.read())
+                        start: float = time.perf_counter()
+                        with subprocess.Popen(
+                            [sys.executable, '-c', program], cwd=working, stdout=subprocess.PIPE, text=True
+                        ) as process:
+                            # Timed until the line is printed, not until the program exits
+                            for line in process.stdout:
+                                if line.startswith('rendered'):
+                                    best = min(best, time.perf_counter() - start)
+                                    after_imports = min(after_imports, float(line.split()[1]))
+                                    break
+                            else:
+                                raise RuntimeError('The game did not render the board')
+                case: str = f'{database} database, {"read before the game" if blocking else "loaded in the background"}'
+                times[case] = (best * 1e3, after_imports * 1e3)
+    return times
+
+def server_load(connection, idle: int, active: int, searching: int, seconds: float) -> None:
+    """
+    Client side of bench_server(), run in its own process so that the clients aren't measured with the server: opens
+    the idle sessions, waits for the server to measure them, then plays the active sessions with random legal actions
+    and sends back the time from each action sent to the next prompt of the sessions against random agents.
+
+    Args:
+        connection: The multiprocessing.Connection to the benchmark, the port of the server is read from it.
+        idle: The number of sessions left waiting for an action.
+        active: The number of sessions played at the same time against random agents.
+        searching: The number of sessions played at the same time against alpha-beta agents.
+        seconds: The seconds the active sessions are played for.
+    """
+    async def load() -> None:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        port: int = await loop.run_in_executor(None, connection.recv)
+        waiting: list = []
+        # A hundred at a time, so the listen backlog of the server isn't overflowed
+        for start in range(0, idle, 100):
+            clients: list = await asyncio.gather(*(
+                GameClient.connect(port=port, opponent='random') for _ in range(min(100, idle - start))
+            ))
+            await asyncio.gather(*(client.read() for client in clients))
+            waiting.extend(clients)
+        connection.send(len(waiting))
+        await loop.run_in_executor(None, connection.recv)
+
+        latencies: list = []
+        games: list = []
+        deadline: float = time.perf_counter() + seconds
+
+        async def play(seed: int, opponent: str) -> None:
+            rng: random.Random = random.Random(seed)
+            client: GameClient = await GameClient.connect(port=port, opponent=opponent)
+            _, prompt = await client.read()
+            while time.perf_counter() < deadline:
+                if prompt is None:
+                    games.append(seed)
+                    client = await GameClient.connect(port=port, opponent=opponent)
+                    _, prompt = await client.read()
+                    continue
+                actions: list = await client.legal_actions()
+                start: float = time.perf_counter()
+                await client.send(rng.choice(actions) if actions else 'forfeit')
+                _, prompt = await client.read()
+                # The turns of the alpha-beta agents take as long as their search, only the others show the delays
+                if opponent == 'random':
+                    latencies.append(time.perf_counter() - start)
+            await client.close()
+
+        await asyncio.gather(
+            *(play(seed, 'random') for seed in range(active)),
+            *(play(seed, 'alphabeta') for seed in range(active, active + searching))
+        )
+        for client in waiting:
+            await client.close()
+        connection.send((sorted(latencies), len(games)))
+
+    asyncio.run(load())
+
+def bench_server(idle: int = 2000, active: int = 200, searching: int = 10, seconds: float = 5.0) -> dict:
+    """
+    Load test of the GameServer: thousands of sessions waiting for their player to act while hundreds of others are
+    played as fast as their clients can against random agents, and a few against alpha-beta agents searching 2000
+    nodes per action, all of them hosted by one event loop. The clients run in another process, on the same cores.
+
+    Args:
+        idle: The number of sessions left waiting for an action.
+        active: The number of sessions played at the same time against random agents.
+        searching: The number of sessions played at the same time against alpha-beta agents.
+        seconds: The seconds the active sessions are played for.
+
+    Returns:
+        Dictionary following the structure {measure: value} with the sessions open at once, the bytes the server
+        takes per idle session as traced by tracemalloc (the socket buffers of the kernel aren't counted), the actions
+        per second of the sessions against random agents and the median and 99th percentile milliseconds from sending
+        one of their actions to the next prompt, which the searches of the alpha-beta agents must not delay.
+    """
+    parent, child = multiprocessing.Pipe()
+    # Started before the event loop of the benchmark exists, so the fork doesn't copy it
+    process: multiprocessing.Process = multiprocessing.Process(
+        target=server_load, args=(child, idle, active, searching, seconds)
+    )
+    process.start()
+
+    async def serve() -> dict:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        server: GameServer = GameServer(port=0, seed=0)
+        parent.send(await server.start())
+        tracemalloc.start()
+        before: int = tracemalloc.get_traced_memory()[0]
+        await loop.run_in_executor(None, parent.recv)
+        sessions: int = len(server.sessions)
+        after: int = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        parent.send(None)
+        latencies, games = await loop.run_in_executor(None, parent.recv)
+        await server.close()
+        return {
+            'idle sessions': sessions,
+            'active sessions': active,
+            'searching sessions': searching,
+            'bytes per idle session': (after - before) / sessions,
+            'actions/s': len(latencies) / seconds,
+            'games finished': games,
+            'median ms': latencies[len(latencies) // 2] * 1e3,
+            'p99 ms': latencies[len(latencies) * 99 // 100] * 1e3,
+        }
+
+    try:
+        return asyncio.run(serve())
+    finally:
+        process.join()
+
+def main():
+    """
+    Runs every benchmark and prints its results.
+    """
+    terminal, null = bench_events()
+    print(f'interactive rules: {terminal:,.0f} games/s printing events, {null:,.0f} games/s with the NULL_SINK')
+    persistent, reconnecting = bench_high_score_reads()
+    print(f'high score reads: {persistent:.1f} us with the connection of the thread, {reconnecting:.1f} us reconnecting')
+    batched, submit, unbatched = bench_high_scores()
+    print(
+        f'high scores: {batched:,.0f} wins/s batched in the background ({submit:.1f} us per submit), '
+        f'{unbatched:,.0f} wins/s committed one at a time'
+    )
+    for case, (total, after_imports) in bench_startup().items():
+        print(f'first board render, {case}: {total:.1f} ms from the start, {after_imports:.2f} ms after the imports')
+    for query, milliseconds in bench_results_queries().items():
+        print(f'results of 200,000 games: {query} {milliseconds:.2f} ms')
+    load: dict = bench_server()
+    print(
+        f'server: {load["idle sessions"]:,} idle sessions at {load["bytes per idle session"]:,.0f} bytes each, '
+        f'{load["active sessions"]} active ones playing {load["actions/s"]:,.0f} actions/s with '
+        f'{load["median ms"]:.1f} ms median and {load["p99 ms"]:.1f} ms p99 latency next to '
+        f'{load["searching sessions"]} alpha-beta games'
+    )
+    for size, config in BOARDS.items():
+        print(f'{size} board')
+        positions: list = random_positions(500, config=config)
+        print(f'  legal_actions: {bench_legal_actions(positions):,.0f} actions/s')
+        board_copy, bits_copy = bench_copy(positions)
+        print(f'  copy: Board {board_copy:.1f} us, BitBoard {bits_copy:.2f} us')
+        print(f'  memory: {bench_memory(positions):,.0f} bytes per game state')
+        print(f'  push/pop: {bench_push_pop(positions):.2f} us')
+        for name, (size, save, load) in bench_snapshot(positions).items():
+            print(f'  {name}: {size:,.0f} bytes per state, save {save:.1f} us, load {load:.1f} us')
+        nodes_per_second, depth = bench_search(positions[:40])
+        print(f'  search: {nodes_per_second:,.0f} nodes/s, depth {depth:.1f} in 50 ms')
+        nodes_per_second, pruned, full = bench_expectimax(positions[:60])
+        print(f'  expectimax: {nodes_per_second:,.0f} nodes/s, Star1 pruning visits {pruned:,} of {full:,} nodes')
+        scaling: str = ', '.join(
+            f'{workers} workers {speed:,.0f}' for workers, speed in bench_mcts(positions[::100]).items()
+        )
+        print(f'  mcts playouts/s: {scaling}')
+        scalar, batched = bench_rollouts(size=size)
+        batched_speed: str = f'{batched:,.0f} games/s' if batched is not None else 'needs NumPy'
+        print(f'  random rollouts: scalar {scalar:,.0f} games/s, batched {batched_speed}')
+        per_action, read, replayed = bench_records(size=size)
+        print(f'  records: {per_action:.2f} bytes per action, read {read:,.0f} games/s, replay {replayed:,.0f} entries/s')
+
+if __name__ == "__main__":
+    """
+    Standard python boilerplate.
+    """
+    # This is executed when run from the command line
+    main()
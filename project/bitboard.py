@@ -0,0 +1,275 @@
+from action import SOLDIER_TYPES
+from cell import UNIT_SPECS, get_unit_tables
+
+# Translates a unit type to its index in the unit masks of a BitBoard
+TYPE_INDEX: dict = {unit_type: i for i, unit_type in enumerate(SOLDIER_TYPES)}
+
+# BitTables class with its respective properties
+class BitTables:
+    """
+    A class to represent the BitTables of a board size, the masks that only depend on the board size so that they are
+    computed once and shared by every BitBoard. A square is the index row * cols + col, and its bit is 1 << square.
+
+    Attributes:
+        rows: The number of rows in the board.
+        cols: The number of columns in the board.
+        full: Mask with every square of the board.
+        not_first_col: Mask with every square except the ones in the first column.
+        not_last_col: Mask with every square except the ones in the last column.
+        move: List following the structure [unit type index][square] -> mask of the squares the unit can move to.
+        attack: List following the structure [unit type index][square] -> mask of the squares the unit can attack.
+        no_of_attacks: List following the structure [unit type index] -> number of attacks of the unit.
+    """
+    def __init__(self, rows: int, cols: int) -> None:
+        self.rows: int = rows
+        self.cols: int = cols
+        self.full: int = (1 << (rows * cols)) - 1
+        first_col: int = sum(1 << (row * cols) for row in range(rows))
+        self.not_first_col: int = self.full & ~first_col
+        self.not_last_col: int = self.full & ~(first_col << (cols - 1))
+        self.move: list = []
+        self.attack: list = []
+        self.no_of_attacks: list = []
+        unit_tables: dict = get_unit_tables(rows, cols)
+        for unit_type in SOLDIER_TYPES:
+            move, attack = unit_tables[unit_type]
+            self.move.append([sum(1 << end for end in ends) for ends in move])
+            self.attack.append([sum(1 << end for end in ends) for ends in attack])
+            self.no_of_attacks.append(UNIT_SPECS[unit_type].no_of_attacks)
+
+    def __deepcopy__(self, memo: dict):
+        """
+        The tables never change once they are built, so copies of a BitBoard class object can share them.
+        """
+        return self
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickles the tables as their board size, so that a BitBoard class object sent to another process uses the
+        tables of that process.
+        """
+        return get_bit_tables, (self.rows, self.cols)
+
+    def orthogonal(self, mask: int) -> int:
+        """
+        Returns the squares orthogonally adjacent to any of the squares of a mask.
+
+        Args:
+            mask: The squares to spread from.
+
+        Returns:
+            The mask of the adjacent squares.
+        """
+        cols: int = self.cols
+        return (
+            ((mask << 1) & self.not_first_col)
+            | ((mask >> 1) & self.not_last_col)
+            | ((mask << cols) & self.full)
+            | (mask >> cols)
+        )
+
+# Tables already built for each board size
+_bit_tables: dict = {}
+
+def get_bit_tables(rows: int, cols: int) -> BitTables:
+    """
+    Returns the BitTables for a board size, building them the first time they are requested.
+
+    Args:
+        rows: The number of rows in the board.
+        cols: The number of columns in the board.
+
+    Returns:
+        The shared BitTables class object.
+    """
+    tables: BitTables = _bit_tables.get((rows, cols))
+    if tables is None:
+        tables = _bit_tables[(rows, cols)] = BitTables(rows, cols)
+    return tables
+
+def squares_of(mask: int) -> list:
+    """
+    Returns the squares set in a mask, from the lowest to the highest.
+
+    Args:
+        mask: The mask to decode.
+
+    Returns:
+        List of square indices.
+    """
+    squares: list = []
+    while mask:
+        low: int = mask & -mask
+        squares.append(low.bit_length() - 1)
+        mask ^= low
+    return squares
+
+# BitBoard class with its respective methods and properties
+class BitBoard:
+    """
+    A class to represent a BitBoard, the state of the units and control zones of a board stored as integer masks. The
+    two players are referred to by their seat, 0 or 1.
+
+    Attributes:
+        tables: The BitTables class object for the board size.
+        units: List following the structure [seat][unit type index] -> mask of the squares with those units.
+        occupied: List following the structure [seat] -> mask of the squares with any unit of that player.
+        zones: Mask of the control zones, whether they are free or controlled.
+        owned: List following the structure [seat] -> mask of the control zones controlled by that player.
+        reach: List following the structure [seat] -> mask of the squares orthogonally adjacent to the placement
+            sources of that player, kept up to date by every change so that placements only have to drop the squares
+            that aren't empty.
+    """
+    def __init__(self, rows: int, cols: int) -> None:
+        self.tables: BitTables = get_bit_tables(rows, cols)
+        self.units: list = [[0] * len(SOLDIER_TYPES), [0] * len(SOLDIER_TYPES)]
+        self.occupied: list = [0, 0]
+        self.zones: int = 0
+        self.owned: list = [0, 0]
+        self.reach: list = [0, 0]
+
+    def copy(self):
+        """
+        Returns an independent copy of the BitBoard class object, sharing only the tables.
+        """
+        bits: BitBoard = BitBoard.__new__(BitBoard)
+        bits.tables = self.tables
+        bits.units = [self.units[0][:], self.units[1][:]]
+        bits.occupied = self.occupied[:]
+        bits.zones = self.zones
+        bits.owned = self.owned[:]
+        bits.reach = self.reach[:]
+        return bits
+
+    @property
+    def covered(self) -> int:
+        """
+        Mask of the control zones that have a unit standing over them, the layer the Cell previous_unit models.
+        """
+        return self.zones & (self.occupied[0] | self.occupied[1])
+
+    @property
+    def empty(self) -> int:
+        """
+        Mask of the squares without a unit and without a control zone.
+        """
+        return self.tables.full & ~(self.occupied[0] | self.occupied[1] | self.zones)
+
+    def add_zone(self, square: int, seat: int = None) -> None:
+        """
+        Adds a control zone, free or controlled by a player.
+
+        Args:
+            square: The square of the control zone.
+            seat: Optional seat of the player that controls it.
+        """
+        bit: int = 1 << square
+        self.zones |= bit
+        self.owned[0] &= ~bit
+        self.owned[1] &= ~bit
+        if seat is not None:
+            self.owned[seat] |= bit
+        self.update_reach(0)
+        self.update_reach(1)
+
+    def control(self, seat: int, square: int) -> None:
+        """
+        Gives the control zone at the square to a player, taking it from the opponent if it was controlling it.
+        """
+        bit: int = 1 << square
+        self.owned[seat] |= bit
+        self.owned[1 - seat] &= ~bit
+        self.update_reach(0)
+        self.update_reach(1)
+
+    def place(self, seat: int, unit_type: int, square: int) -> None:
+        """
+        Adds a unit of the player at the square.
+        """
+        bit: int = 1 << square
+        self.units[seat][unit_type] |= bit
+        self.occupied[seat] |= bit
+        # A unit over a control zone stops the opponent from placing next to it
+        if self.zones & bit:
+            self.update_reach(1 - seat)
+
+    def remove(self, seat: int, unit_type: int, square: int) -> None:
+        """
+        Removes the unit of the player at the square.
+        """
+        bit: int = 1 << square
+        self.units[seat][unit_type] &= ~bit
+        self.occupied[seat] &= ~bit
+        if self.zones & bit:
+            self.update_reach(1 - seat)
+
+    def move(self, seat: int, unit_type: int, start: int, end: int) -> None:
+        """
+        Moves the unit of the player from the start square to the end square.
+        """
+        change: int = (1 << start) | (1 << end)
+        self.units[seat][unit_type] ^= change
+        self.occupied[seat] ^= change
+        if self.zones & change:
+            self.update_reach(1 - seat)
+
+    def clear(self, square: int) -> None:
+        """
+        Removes any unit at the square.
+        """
+        bit: int = ~(1 << square)
+        for seat in (0, 1):
+            self.occupied[seat] &= bit
+            for unit_type in range(len(self.units[seat])):
+                self.units[seat][unit_type] &= bit
+            self.update_reach(seat)
+
+    def unit_type_at(self, seat: int, square: int) -> int:
+        """
+        Returns the unit type index of the player unit at the square, or None if the player has no unit there.
+        """
+        bit: int = 1 << square
+        if not self.occupied[seat] & bit:
+            return None
+        for unit_type, mask in enumerate(self.units[seat]):
+            if mask & bit:
+                return unit_type
+
+    def placement_sources(self, seat: int) -> int:
+        """
+        Mask of the control zones the player can place units next to: the ones it controls, as long as the opponent
+        isn't standing over them.
+        """
+        return self.owned[seat] & ~self.occupied[1 - seat]
+
+    def update_reach(self, seat: int) -> None:
+        """
+        Recomputes the squares orthogonally adjacent to the placement sources of the player.
+        """
+        self.reach[seat] = self.tables.orthogonal(self.placement_sources(seat))
+
+    def placement_mask(self, seat: int) -> int:
+        """
+        Mask of the squares where the player can place a unit: empty squares orthogonally adjacent to one of its
+        placement sources.
+        """
+        return self.reach[seat] & self.empty
+
+    def move_mask(self, unit_type: int, square: int) -> int:
+        """
+        Mask of the squares the unit of the player at the square can move to: empty squares or control zones without
+        a unit.
+        """
+        return self.tables.move[unit_type][square] & ~(self.occupied[0] | self.occupied[1])
+
+    def attack_mask(self, seat: int, unit_type: int, square: int) -> int:
+        """
+        Mask of the opponent units the unit of the player at the square can attack.
+        """
+        return self.tables.attack[unit_type][square] & self.occupied[1 - seat]
+
+    def control_mask(self, seat: int) -> int:
+        """
+        Mask of the control zones the player can control: the ones it doesn't control yet with one of its units over them.
+        """
+        return self.zones & self.occupied[seat] & ~self.owned[seat]
@@ -1,4 +1,12 @@
-from cell import Cell, Unit, Archer
+import random
+import string
+
+from action import Action, ActionTable, Result, OK, get_action_table, MOVE, RECRUIT, PLACE, ATTACK, CONTROL, INITIATIVE, SOLDIER_TYPES, COIN_TYPES
+from bitboard import BitBoard, BitTables, TYPE_INDEX, squares_of
+from zobrist import ZOBRIST, ZobristKeys, HAND, BAG, DISCARD, RECRUITMENT, MAX_SQUARES
+from cell import Cell, Unit, Marker, EMPTY, FREE_CONTROL
+from config import BoardConfig, SMALL_BOARD
+from events import EventSink, TERMINAL, INVALID_ACTION, PIECE_NOT_IN_HAND, INVALID_COORDINATE, RULE_ERROR, NO_UNITS_LEFT, COIN_RECRUITED
 from player import Player
 
 class Board:
@@ -7,34 +15,174 @@ class Board:
 
     Attributes:
         board: A 2D list containing a Cell class object at each index
+        config: The BoardConfig class object with the size of the board and its control zones
+        events: The EventSink class object the interactive rule checks report to, the terminal by default
         letter_to_num: Translated a letter to a row coordinate
+        seats: Dictionary following the structure {Player: seat}, the index of each player in the BitBoard
+        controls: Dictionary following the structure {Player: Marker}, the control point of each player
+        coordinates: Tuple following the structure [square] -> (row, col), the inverse of square()
+        bits: The BitBoard class object with the same units and control zones as the grid, used by the rule checks
+        key: The Zobrist key of the units and control zones, updated incrementally by every action. See position_key()
+            for the key of the whole game state.
+
+    The grid is kept for rendering and for the Unit class objects, while every rule check is done with the masks of
+    the BitBoard, so both are updated together by the apply_* methods.
     """
-    def __init__(self, crow: Player, wolf: Player) -> None:
-        self.grid: list = [[Cell(row, col, Unit()) for col in range(5)] for row in range(5)]
+    def __init__(
+        self, crow: Player, wolf: Player, config: BoardConfig = SMALL_BOARD, events: EventSink = TERMINAL
+    ) -> None:
+        if config.rows > len(string.ascii_lowercase) or config.rows * config.cols > MAX_SQUARES:
+            raise ValueError(f'A {config.rows}x{config.cols} board is too big')
+        self.config: BoardConfig = config
+        self.events: EventSink = events
+        self.grid: list = [[Cell(row, col, EMPTY) for col in range(config.cols)] for row in range(config.rows)]
+        self.cols: int = config.cols
         # Translates a letter to its respective row coordinate
-        self.letter_to_num: dict = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4}
+        self.letter_to_num: dict = {letter: row for row, letter in enumerate(string.ascii_lowercase[:config.rows])}
+        self.seats: dict = {crow: 0, wolf: 1}
+        # Control point of each player, shared by every zone it controls
+        self.controls: dict = {crow: Marker(crow, 'Control', 'C'), wolf: Marker(wolf, 'Control', 'C')}
+        self.bits: BitBoard = BitBoard(len(self.grid), self.cols)
+        self.key: int = 0
         # Set the initial control points
         self.control_points(crow, wolf)
+        # Every single-target action on a board of this size, looked up by legal_actions()
+        self.action_table: ActionTable = get_action_table(len(self.grid), len(self.grid[0]))
+        # Translates a square index of the BitBoard back to its (row, col) coordinates, a tuple so copies share it
+        self.coordinates: tuple = self.action_table.coordinates
+        # Undo records of the actions applied with push(), one list of (function, args) per action
+        self.history: list = []
+        self._journal: list = None
 
     def control_points(self, crow, wolf) -> None:
         """
-        Sets the initial control points in the Board class object, they contain the Cell class object
-        with its relevant attributes.
+        Sets the initial control points of the board configuration in the Board class object, they contain the Cell
+        class object with its relevant attributes.
 
         Args:
             crow: Player class object belonging to the crow player.
             wolf: Player class object belonging to the wolf player.
         """
         # Crow starting control point
-        self.grid[0][2] = Cell(0, 2, Unit(crow, 'Control', 'C'))
+        self.set_control_point(*self.config.crow_zone, self.controls[crow])
         # Wolf starting control point
-        self.grid[4][2] = Cell(4, 2, Unit(wolf, 'Control', 'C')) 
+        self.set_control_point(*self.config.wolf_zone, self.controls[wolf])
 
         # Set the 'free' control points
-        self.grid[2][0] = Cell(2, 0, Unit(None, 'Control', '@'))
-        self.grid[2][2] = Cell(2, 2, Unit(None, 'Control', '@'))
-        self.grid[2][3] = Cell(2, 3, Unit(None, 'Control', '@'))
-        self.grid[2][4] = Cell(2, 4, Unit(None, 'Control', '@'))
+        for row, col in self.config.free_zones:
+            self.set_control_point(row, col, FREE_CONTROL)
+        self.rehash()
+
+    def set_control_point(self, row: int, col: int, control: Unit) -> None:
+        """
+        Resets the Cell class object at the given coordinates so that it only contains a control point, the Cell class
+        object itself is kept.
+
+        Args:
+            row: The row index in the board.
+            col: The col index in the board.
+            control: The 'Control' Unit class object.
+        """
+        cell: Cell = self.grid[row][col]
+        cell.unit = control
+        cell.previous_unit = EMPTY
+        square: int = self.square((row, col))
+        # Only a square with a unit has to be cleared, which is never the case for a new board
+        if (self.bits.occupied[0] | self.bits.occupied[1]) >> square & 1:
+            self.bits.clear(square)
+        self.bits.add_zone(square, self.seats.get(control.player))
+
+    def rehash(self) -> None:
+        """
+        Recomputes the Zobrist key of the board and the keys of both players from scratch, seating the players.
+        """
+        zobrist: ZobristKeys = ZOBRIST
+        bits: BitBoard = self.bits
+        key: int = 0
+        for player, seat in self.seats.items():
+            player.seat = seat
+            player.rehash()
+            for unit_type, mask in enumerate(bits.units[seat]):
+                while mask:
+                    low: int = mask & -mask
+                    mask ^= low
+                    key ^= zobrist.unit[seat][unit_type][low.bit_length() - 1]
+            mask = bits.owned[seat]
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                key ^= zobrist.owned[seat][low.bit_length() - 1]
+        self.key = key
+
+    def position_key(self, turn: Player = None) -> int:
+        """
+        Returns the Zobrist key of the whole game state: the units and control zones, the coins of both players in each
+        zone, their control tokens and initiative, and optionally the player that has to act.
+
+        Args:
+            turn: Optional Player class object of the player that has to act.
+
+        Returns:
+            The 64-bit key.
+        """
+        zobrist: ZobristKeys = ZOBRIST
+        key: int = self.key
+        for player, seat in self.seats.items():
+            key ^= player.key ^ zobrist.tokens[seat][player.control_tokens]
+            key ^= zobrist.initiative_count[seat][player.initiative_count]
+            if player.has_initiative:
+                key ^= zobrist.initiative[seat]
+        if turn is not None:
+            key ^= zobrist.turn[self.seats[turn]]
+        return key
+
+    def square(self, coordinate: tuple) -> int:
+        """
+        Helper function that translates (row, col) coordinates to the square index used by the BitBoard.
+
+        Args:
+            coordinate: Tuple containing the row and column indices in the board.
+
+        Returns:
+            The square index.
+        """
+        return coordinate[0] * self.cols + coordinate[1]
+
+    def unit_squares(self, player: Player, unit_type: str) -> set:
+        """
+        Returns where the units of one type of a player are, read from the masks of the BitBoard that every action and
+        undo keeps up to date, so that only the squares with those units are visited.
+
+        Args:
+            player: The Player class object owning the units.
+            unit_type: The type of the units, e.g: 'Knight'.
+
+        Returns:
+            A set of (row, col) coordinates, empty if the player has no such units on the board.
+        """
+        index: int = TYPE_INDEX.get(unit_type)
+        if index is None:
+            return set()
+        coordinates: tuple = self.coordinates
+        return {coordinates[square] for square in squares_of(self.bits.units[self.seats[player]][index])}
+
+    def pieces(self, player: Player) -> dict:
+        """
+        Returns the index of the units of a player on the board.
+
+        Args:
+            player: The Player class object owning the units.
+
+        Returns:
+            Dictionary following the structure {unit_type: set of (row, col) coordinates}, with only the unit types
+            the player has on the board.
+        """
+        seat: int = self.seats[player]
+        coordinates: tuple = self.coordinates
+        return {
+            unit_type: {coordinates[square] for square in squares_of(self.bits.units[seat][index])}
+            for unit_type, index in TYPE_INDEX.items() if self.bits.units[seat][index]
+        }
 
     def print_board(self) -> None:
         """
@@ -43,10 +191,10 @@ class Board:
         the unit symbol. This way there can be multiple units in the board which are easy to understand 
         and to determine to which player they correspond.
         """
-        row_letters: list = ['a', 'b', 'c', 'd', 'e']
+        row_letters: list = list(self.letter_to_num)
 
-        print('\n    0   1   2   3   4')
-        print('    -----------------')
+        print('\n    ' + '   '.join(str(col) for col in range(self.cols)))
+        print('    ' + '-' * (4 * self.cols - 3))
         for i in range(len(self.grid)):
             print(f'{row_letters[i]}|', end='')
             for j in range(len(self.grid[0])):
@@ -95,7 +243,7 @@ class Board:
                 forfeit = True
 
             case _:
-                print('That is not a valid action, please try again.')
+                self.events.emit(INVALID_ACTION)
 
         # Show the current state of the player hand
         if not forfeit:
@@ -116,18 +264,18 @@ class Board:
         Returns:
             True if the piece is found in the player hand, False if it is not found. 
         """
-        for unit in player.hand:
-            if unit.unit_type == piece:
-                # Move to discard section
-                if discard:
-                    player.discarded.append(unit)
-                # Remove from hand
-                if remove:
-                    player.hand.remove(unit)
-                # Piece has been found in player hand
-                return True
+        unit: Unit = player.hand.find(piece)
+        if unit is not None:
+            # Move to discard section
+            if discard:
+                player.discarded.append(unit)
+            # Remove from hand
+            if remove:
+                player.hand.remove(unit)
+            # Piece has been found in player hand
+            return True
         # If it's not in hand return False
-        print('Invalid input, piece is not in hand')
+        self.events.emit(PIECE_NOT_IN_HAND)
         return False
     
     def valid_board_position(self, position: str) -> bool:
@@ -152,7 +300,7 @@ class Board:
             or int(col) < 0 
             or int(col) >= len(self.grid[0])
             ):
-            print('Invalid coordinate input')
+            self.events.emit(INVALID_COORDINATE)
             return False
         # Else return True
         return True
@@ -169,12 +317,29 @@ class Board:
         Returns:
             True if it is a valid starting position, False if it is not.
         """
-        # Check if the cell at the start coordinate is valid
-        if unit.unit_type == 'Empty' or unit.player != player or unit.unit_type == 'Control':
-            print('Cell is empty, a control point or it doesn\'t belong to the player')
+        error = self.start_position_error(unit, player)
+        if error:
+            self.events.emit(RULE_ERROR, message=error)
             return False
         # Valid cell
         return True
+
+    def start_position_error(self, unit: Unit, player: Player) -> str:
+        """
+        Helper function that returns why a unit can't be used as the starting unit of a move or an attack, without
+        printing it.
+
+        Args:
+            unit: The Unit class object containing the unit that is being used.
+            player: The Player class object defining the current player.
+
+        Returns:
+            The error message, or None if it is a valid starting position.
+        """
+        # Check if the cell at the start coordinate is valid
+        if unit.unit_type == 'Empty' or unit.player != player or unit.unit_type == 'Control':
+            return 'Cell is empty, a control point or it doesn\'t belong to the player'
+        return None
     
     def valid_end_position(self, end_position: tuple, control_pos_allowed: bool = True) -> bool:
         """
@@ -189,19 +354,37 @@ class Board:
         Returns:
             True if it is a valid end position, False if it is not.
         """
-        # Check the to_position is either a control unit or an empty unit
-        unit: Unit = self.grid[end_position[0]][end_position[1]].unit
-        # Allow the end position to be a 'Control' unit
-        if control_pos_allowed:
-            if unit.unit_type != 'Control' and unit.unit_type != 'Empty':
-                print('Cell is occupied and piece can not be moved to the position')
-                return False
-        # Don't allow it and only allow the end position to be an 'Empty' unit
-        else:
-            if unit.unit_type != 'Empty':
-                return False
+        error = self.end_position_error(end_position, control_pos_allowed)
+        if error:
+            # Placing on an occupied cell has always been rejected silently
+            if control_pos_allowed:
+                self.events.emit(RULE_ERROR, message=error)
+            return False
         # Valid cell
         return True
+
+    def end_position_error(self, end_position: tuple, control_pos_allowed: bool = True) -> str:
+        """
+        Helper function that returns why a unit can't end up at the given position, without printing it.
+
+        Args:
+            end_position: Tuple containing the end position coordinates.
+            control_pos_allowed: Optional parameters that allows the position to be of type 'Control'.
+
+        Returns:
+            The error message, or None if it is a valid end position.
+        """
+        bits: BitBoard = self.bits
+        bit: int = 1 << self.square(end_position)
+        # Check the to_position is either a control unit or an empty unit
+        if (bits.occupied[0] | bits.occupied[1]) & bit:
+            if control_pos_allowed:
+                return 'Cell is occupied and piece can not be moved to the position'
+            return 'Cell is occupied and piece can not be placed in the position'
+        # Don't allow a 'Control' unit if it is not allowed, only allowing the end position to be an 'Empty' unit
+        if not control_pos_allowed and bits.zones & bit:
+            return 'Cell is occupied and piece can not be placed in the position'
+        return None
     
     def valid_attack_position(self, end_position: tuple, curr_player: Player) -> bool:
         """
@@ -216,14 +399,28 @@ class Board:
         Returns:
             True if it is a valid attack position, False if it is not.
         """
-        # Get the unit at the end position
-        unit: Unit = self.grid[end_position[0]][end_position[1]].unit
-        # Check it can only be a unit that doesn't belong to the current player and is not a control or empty unit
-        if unit.player == curr_player or unit.unit_type == 'Control' or unit.unit_type == 'Empty':
-            print('Can\'t attack own player unit, control units or empty units.')
+        error = self.attack_position_error(end_position, curr_player)
+        if error:
+            self.events.emit(RULE_ERROR, message=error)
             return False
         # Valid attack position
         return True
+
+    def attack_position_error(self, end_position: tuple, curr_player: Player) -> str:
+        """
+        Helper function that returns why the unit at the given position can't be attacked, without printing it.
+
+        Args:
+            end_position: Tuple containing the end position coordinates.
+            curr_player: The Player class object defining the current player.
+
+        Returns:
+            The error message, or None if it is a valid attack position.
+        """
+        # Check it can only be a unit that doesn't belong to the current player and is not a control or empty unit
+        if not self.bits.occupied[1 - self.seats[curr_player]] & (1 << self.square(end_position)):
+            return 'Can\'t attack own player unit, control units or empty units.'
+        return None
     
     def translate_to_coordinate(self, position: str) -> tuple:
         """
@@ -271,48 +468,38 @@ class Board:
         Returns:
             True if the coordinates are orthogonal to the control point, False if they are not.
         """
-        x, y = coordinate[0], coordinate[1]
-        # Check it's not a control point
-        if self.grid[x][y].unit.unit_symbol[0] == 'C':
-            print('Placing in the same coordinates as a control point is not valid.')
+        error = self.placement_error(coordinate, player)
+        if error:
+            self.events.emit(RULE_ERROR, message=error)
             return False
+        return True
+
+    def placement_error(self, coordinate: tuple, player: Player) -> str:
+        """
+        Helper function that returns why a unit can't be placed at the given coordinates because of the control
+        points around it, without printing it.
+
+        Args:
+            coordinate: Tuple containing the row and column indices in the board.
+            player: The Player class object defining the current player.
+
+        Returns:
+            The error message, or None if the coordinates are orthogonal to one of the player control points.
+        """
+        bits: BitBoard = self.bits
+        seat: int = self.seats[player]
+        bit: int = 1 << self.square(coordinate)
+        # Check it's not a control point
+        if bits.zones & bit:
+            return 'Placing in the same coordinates as a control point is not valid.'
         
-        # We need to get the first letter of the unit_symbol since a Control point could be associated to a 
-        # player and thus the unit_symbol could contain something like 'Cv', so we can't directly compare it
-        # We also need to check if the previous_unit.unit_symbol is a control point as that means that a unit
-        # is directly above a control point, but is still a valid control point
-        # Check upward
-        if ( 
-            x - 1  >= 0 
-            and (self.grid[x-1][y].unit.unit_symbol[0] == 'C' or self.grid[x-1][y].previous_unit.unit_symbol[0] == 'C') 
-            and self.grid[x-1][y].unit.player == player
-        ):
-            return True 
-        # Check rightward
-        if (
-            y + 1 < len(self.grid[0]) 
-            and (self.grid[x][y+1].unit.unit_symbol[0] == 'C' or self.grid[x][y+1].previous_unit.unit_symbol[0] == 'C')
-            and self.grid[x][y+1].unit.player == player
-        ):
-            return True 
-        # Check downward
-        if (
-            x + 1 < len(self.grid) 
-            and (self.grid[x+1][y].unit.unit_symbol[0] == 'C' or self.grid[x+1][y].previous_unit.unit_symbol[0] == 'C')
-            and self.grid[x+1][y].unit.player == player
-        ):
-            return True
-        # Check leftward
-        if (
-            y - 1 >= 0 
-            and (self.grid[x][y-1].unit.unit_symbol[0] == 'C' or self.grid[x][y-1].previous_unit.unit_symbol[0] == 'C') 
-            and self.grid[x][y-1].unit.player == player
-        ):
-            return True
+        # The control points the player controls are valid even if one of its units is directly above them, but not if
+        # an opponent unit is standing over them
+        if bits.reach[seat] & bit:
+            return None
         
         # If none of the above conditions haven't been satisfied then it is not orthogonal to a control point
-        print('The coordinates to place the piece are not orthogonal to a control point')
-        return False
+        return 'The coordinates to place the piece are not orthogonal to a control point'
     
     def get_unit_from_hand(self, piece: str, player: Player, remove: bool = False) -> Unit:
         """
@@ -326,12 +513,11 @@ class Board:
         Returns:
             The Unit class object in the player hand. 
         """
-        for unit in player.hand:
-            if unit.unit_type == piece:
-                # Remove from hand if the optional parameter is set to True
-                if remove:
-                    player.hand.remove(unit)
-                return unit
+        unit: Unit = player.hand.find(piece)
+        # Remove from hand if the optional parameter is set to True
+        if unit is not None and remove:
+            player.hand.remove(unit)
+        return unit
             
     def can_recruit_piece(self, piece: str, player: Player) -> bool:
         """
@@ -347,12 +533,12 @@ class Board:
         """
         # Check if the piece still exists in the assigned units
         if piece not in player.assigned_units:
-            print('There are no more units of that type')
+            self.events.emit(NO_UNITS_LEFT)
             return False
         
         # Add it to the bag (pop a coin from the stack of coins)
         player.bag.append(player.assigned_units[piece].pop())
-        print(f'Added the {piece} coin to the bag')
+        self.events.emit(COIN_RECRUITED, piece=piece)
 
         # If there are no more units, remove them from the assigned units
         if len(player.assigned_units[piece]) == 0:
@@ -360,146 +546,682 @@ class Board:
         
         return True
     
-    def move(self, player: Player) -> None:
+    def in_bounds(self, coordinate: tuple) -> bool:
+        """
+        Helper function that checks if the coordinates of an Action are within board bounds.
+
+        Args:
+            coordinate: Tuple containing the row and column indices in the board.
+
+        Returns:
+            True if the coordinates are within the board bounds, False if they are not.
+        """
+        return (
+            coordinate is not None
+            and 0 <= coordinate[0] < len(self.grid)
+            and 0 <= coordinate[1] < len(self.grid[0])
+        )
+
+    def coin_in_hand(self, piece: str, player: Player) -> Unit:
+        """
+        Helper function that finds a unit coin of the given type in the player hand, without printing or removing it.
+
+        Args:
+            piece: String containing the unit type.
+            player: The Player class object defining the current player.
+
+        Returns:
+            The Unit class object in the player hand, or None if there is no coin of that type.
+        """
+        return player.hand.find(piece)
+
+    def discard_coin(self, coin: Unit, player: Player) -> None:
+        """
+        Helper function that moves a unit coin from the player hand to its discard pile.
+
+        Args:
+            coin: The Unit class object in the player hand.
+            player: The Player class object defining the current player.
+        """
+        self.take_coin(coin, player)
+        player.discarded.append(coin)
+        self.record(player.discarded.pop)
+        player.count_coin(DISCARD, coin.unit_type, 1)
+
+    def take_coin(self, coin: Unit, player: Player) -> None:
+        """
+        Helper function that removes a unit coin from the player hand.
+
+        Args:
+            coin: The Unit class object in the player hand.
+            player: The Player class object defining the current player.
+        """
+        index: int = player.hand.remove(coin)
+        self.record(player.hand.insert, index, coin)
+        player.count_coin(HAND, coin.unit_type, -1)
+
+    def set_cell(self, coordinate: tuple, unit: Unit, previous_unit: Unit) -> None:
+        """
+        Helper function that changes the unit and previous unit of the Cell class object at the given coordinates.
+
+        Args:
+            coordinate: Tuple containing the row and column indices in the board.
+            unit: The new Unit class object in that cell.
+            previous_unit: The new previous Unit class object of that cell.
+        """
+        cell: Cell = self.grid[coordinate[0]][coordinate[1]]
+        self.record(self.set_cell, coordinate, cell.unit, cell.previous_unit)
+        cell.unit = unit
+        cell.previous_unit = previous_unit
+
+    def set_attribute(self, obj: object, name: str, value) -> None:
+        """
+        Helper function that changes an attribute of a Player or BitBoard class object.
+
+        Args:
+            obj: The object to change.
+            name: The name of the attribute.
+            value: The new value.
+        """
+        self.record(setattr, obj, name, getattr(obj, name))
+        setattr(obj, name, value)
+
+    def record(self, undo, *args) -> None:
+        """
+        Helper function that records how to undo a change when the action is being applied with push().
+
+        Args:
+            undo: The function that undoes the change.
+            args: The arguments to call it with.
+        """
+        if self._journal is not None:
+            self._journal.append((undo, args))
+
+    def push(self, player: Player, action: Action) -> Result:
+        """
+        Applies an Action like apply_action() while recording the changes it makes (cells, masks, coins moved between
+        the hand, bag, discard pile and recruitment stacks, control tokens and initiative) so that pop() can undo it. Only
+        valid actions are recorded, so pop() must only be called for the pushes that returned a truthy Result.
+
+        Args:
+            player: The Player class object defining the current player.
+            action: The Action to perform.
+
+        Returns:
+            The Result of the action.
+        """
+        return self.journaled(self.apply_action, player, action)
+
+    def push_draw(self, player: Player, rng: random.Random, hand: tuple = None) -> bool:
+        """
+        Draws a new hand for the player like draw(), recording the changes so that pop() can undo it. Nothing is
+        recorded when no hand can be made.
+
+        Args:
+            player: The Player class object defining the player that draws.
+            rng: The random.Random generator that picks the coins.
+            hand: Optional tuple with the number of coins of each type to draw, see draw().
+
+        Returns:
+            True if a hand was drawn, False if the player can't make a hand.
+        """
+        return self.journaled(self.draw, player, rng, hand)
+
+    def push_end_turn(self, player: Player) -> Player:
+        """
+        Ends the turn of the player like end_turn(), recording the changes so that pop() can undo it.
+
+        Args:
+            player: The Player class object defining the player whose turn ends.
+
+        Returns:
+            The Player class object of the player that plays next.
+        """
+        return self.journaled(self.end_turn, player)
+
+    def journaled(self, change, *args):
+        """
+        Helper function that calls a function changing the board or the players while recording how to undo it, and
+        adds the recorded changes to the history when the function succeeds.
+
+        Args:
+            change: The function to call, e.g: apply_action().
+            args: The arguments to call it with.
+
+        Returns:
+            Whatever the function returns.
+        """
+        # The keys are restored as a whole, after undoing everything else
+        self._journal = [(setattr, (self, 'key', self.key))]
+        for seated in self.seats:
+            self._journal.append((setattr, (seated, 'key', seated.key)))
+        try:
+            result = change(*args)
+        finally:
+            journal, self._journal = self._journal, None
+        if result:
+            self.history.append(journal)
+        return result
+
+    def pop(self) -> None:
+        """
+        Undoes the last action applied with push(), restoring the board and the players exactly as they were.
+        """
+        for undo, args in reversed(self.history.pop()):
+            undo(*args)
+
+    def draw(self, player: Player, rng: random.Random, hand: tuple = None) -> bool:
+        """
+        Draws a new hand of three coins for the player following the rules of Player.get_hand() without printing
+        anything: the bag is refilled from the front of the discard pile while it has less than three coins, and any
+        coin left in the hand is dropped. The player is left untouched when no hand can be made.
+
+        Args:
+            player: The Player class object defining the player that draws.
+            rng: The random.Random generator that picks the coins.
+            hand: Optional tuple with the number of coins of each type to draw instead of random ones, following the
+                order of COIN_TYPES, e.g: a hand of draws.hand_distribution(). The bag has to hold them after the refill.
+
+        Returns:
+            True if a hand was drawn, False if the player can't make a hand.
+        """
+        if len(player.bag) + len(player.discarded) < 3:
+            return False
+        while len(player.bag) < 3:
+            coin: Unit = player.discarded.popleft()
+            self.record(player.discarded.appendleft, coin)
+            player.bag.append(coin)
+            self.record(player.bag.take, coin.unit_type)
+            player.count_coin(DISCARD, coin.unit_type, -1)
+            player.count_coin(BAG, coin.unit_type, 1)
+        for coin in list(player.hand):
+            self.take_coin(coin, player)
+        if hand is None:
+            coins: list = [player.bag.draw(rng) for _ in range(3)]
+        else:
+            coins = [player.bag.take(unit_type) for unit_type, count in zip(COIN_TYPES, hand) for _ in range(count)]
+        for coin in coins:
+            self.record(player.bag.append, coin)
+            player.hand.append(coin)
+            self.record(player.hand.take, coin.unit_type)
+            player.count_coin(BAG, coin.unit_type, -1)
+            player.count_coin(HAND, coin.unit_type, 1)
+        return True
+
+    def end_turn(self, player: Player) -> Player:
+        """
+        Ends the turn of the player following the rules of main.swap_turns(): a player with the initiative plays at most
+        two rounds in a row before the turn passes to the opponent.
+
+        Args:
+            player: The Player class object defining the player whose turn ends.
+
+        Returns:
+            The Player class object of the player that plays next.
+        """
+        opponent: Player = self.opponent(player)
+        if not player.has_initiative:
+            return opponent
+        if player.initiative_count + 1 < 2:
+            self.set_attribute(player, 'initiative_count', player.initiative_count + 1)
+            return player
+        self.set_attribute(player, 'has_initiative', False)
+        self.set_attribute(player, 'initiative_count', 0)
+        return opponent
+
+    def opponent(self, player: Player) -> Player:
+        """
+        Returns the Player class object seated in front of the given player.
+        """
+        for seated in self.seats:
+            if seated is not player:
+                return seated
+
+    def apply_action(self, player: Player, action: Action) -> Result:
+        """
+        Validates an Action and, if it is valid, performs it on the board and on the player coins. It never reads
+        from or writes to the terminal, so it can be used to play games programmatically. The board and the player
+        are left untouched when the action is rejected.
+
+        Args:
+            player: The Player class object defining the current player.
+            action: The Action to perform.
+
+        Returns:
+            A Result that is truthy if the action was performed, otherwise containing the reason it was rejected.
+        """
+        coin: Unit = self.coin_in_hand(action.piece, player)
+        if coin is None:
+            return Result(False, 'Invalid input, piece is not in hand')
+
+        match action.kind:
+            case 'move':
+                return self.apply_move(player, action, coin)
+
+            case 'recruit':
+                return self.apply_recruit(player, action, coin)
+
+            case 'place':
+                return self.apply_place(player, action, coin)
+
+            case 'attack':
+                return self.apply_attack(player, action, coin)
+
+            case 'control':
+                return self.apply_control(player, action, coin)
+
+            case 'initiative':
+                return self.apply_initiative(player, action, coin)
+
+            case _:
+                return Result(False, 'That is not a valid action, please try again.')
+
+    def apply_move(self, player: Player, action: Action, coin: Unit) -> Result:
         """
         Having a unit on the board and one of the same type in your hand, discard the unit in your hand to move the unit on 
         the board orthogonally.
 
         Args:
             player: The Player class object defining the current player.
+            action: The move Action, using its start and end coordinates.
+            coin: The unit coin in the player hand that is discarded.
+
+        Returns:
+            The Result of the action.
         """
-        # Check if the from_position is a valid position
-        from_position = str(input('Move from position (row, col): '))
-        if not self.valid_board_position(from_position):
-            return
-        
-        unit: Unit = self.get_unit(from_position)
+        start, end = action.start, action.end
+        if not self.in_bounds(start) or not self.in_bounds(end):
+            return Result(False, 'Invalid coordinate input')
+
+        bits: BitBoard = self.bits
+        seat: int = self.seats[player]
+        start_square, end_square = self.square(start), self.square(end)
         # Check the position isn't empty and belongs to the player (but is not a control point)
-        if not self.valid_start_position(unit, player):
-            return 
-        
-        # Check the piece to move is contained in the hand and the board
-        piece = str(input('Select a piece of the same type in your hand: '))
-        if not (self.piece_in_hand(piece, player, remove=True, discard=True) and unit.unit_type == piece):
-            return
-        
-        to_position = str(input('To position (row, col): '))
-        # Check if the to_position is a valid position
-        if not self.valid_board_position(to_position):
-            return
-        
-        # Get the translated coordinates
-        translated_start = self.translate_to_coordinate(from_position)
-        translated_end = self.translate_to_coordinate(to_position)
+        unit_type: int = bits.unit_type_at(seat, start_square)
+        if unit_type is None:
+            return Result(False, 'Cell is empty, a control point or it doesn\'t belong to the player')
+        # Check the piece in the hand matches the unit on the board
+        if SOLDIER_TYPES[unit_type] != action.piece:
+            return Result(False, 'The piece in hand is not the same type as the unit on the board')
+        # Check the end position is either a control unit or an empty unit
+        error = self.end_position_error(end)
+        if error:
+            return Result(False, error)
+        # Check the specific unit coin movement
+        if not bits.tables.move[unit_type][start_square] & (1 << end_square):
+            return Result(False, f'{action.piece} units can only move 1 unit at a time in an orthogonal way')
 
-        # Check the to_position is either a control unit or an empty unit
-        if not self.valid_end_position(translated_end):
-            return
-        
-        # If it was an invalid move due to the speficic unit coin movement, end the function
-        if not unit.move(translated_start, translated_end):
-            return
-        
-        # Change the board status given that all of the above operations were valid
+        self.discard_coin(coin, player)
+        bits.move(seat, unit_type, start_square, end_square)
+        self.record(bits.move, seat, unit_type, end_square, start_square)
+        keys: list = ZOBRIST.unit[seat][unit_type]
+        self.key ^= keys[start_square] ^ keys[end_square]
         # Revert the previous cell to its previous unit status
-        prev_cell: Cell = self.grid[translated_start[0]][translated_start[1]]
-        prev_cell.unit = prev_cell.previous_unit
+        prev_cell: Cell = self.grid[start[0]][start[1]]
+        unit: Unit = prev_cell.unit
+        self.set_cell(start, prev_cell.previous_unit, prev_cell.previous_unit)
         # Assign the new cell previous unit to its actual unit, and then change the actual unit to the new unit
-        new_cell: Cell = self.grid[translated_end[0]][translated_end[1]]
-        new_cell.previous_unit = new_cell.unit
-        new_cell.unit = unit
+        self.set_cell(end, unit, self.grid[end[0]][end[1]].unit)
+        return OK
 
-    def recruit(self, player: Player) -> None:
+    def apply_recruit(self, player: Player, action: Action, coin: Unit) -> Result:
         """
         Discard a unit from your hand to add to your bag one of the matching units from the “recruitment” zone. 
-        For example: discard a Mercenary to add another Mercenary to your bag.
+        For example: discard a Mercenary to add another Mercenary to your bag. The Royal coin can recruit any unit.
 
         Args:
             player: The Player class object defining the current player.
+            action: The recruit Action, using its recruit unit type.
+            coin: The unit coin in the player hand that is discarded.
+
+        Returns:
+            The Result of the action.
         """
-        # Check the piece is in the hand
-        piece_to_discard = str(input('Piece to discard from hand to recruit the same kind: '))
-        if not self.piece_in_hand(piece_to_discard, player, remove=True, discard=True):
-            return
-        
+        piece_to_recruit: str = action.recruit
         # Check there are available units in order to recruit
-        piece_to_recruit = str(input(f'Used {piece_to_discard} coin, type the piece you want to recruit: '))
-        if not self.can_recruit_piece(piece_to_recruit, player):
-            return
+        if piece_to_recruit not in player.assigned_units:
+            return Result(False, 'There are no more units of that type')
+        if action.piece != piece_to_recruit and action.piece != 'Royal':
+            return Result(False, 'Only units of the same type as the discarded coin (or any unit with the Royal coin) can be recruited')
 
-    def place(self, player: Player) -> None:
+        self.discard_coin(coin, player)
+        # Add it to the bag (pop a coin from the stack of coins)
+        stack: list = player.assigned_units[piece_to_recruit]
+        recruited: Unit = stack.pop()
+        self.record(stack.append, recruited)
+        player.bag.append(recruited)
+        self.record(player.bag.take, piece_to_recruit)
+        player.count_coin(RECRUITMENT, piece_to_recruit, -1)
+        player.count_coin(BAG, piece_to_recruit, 1)
+        # If there are no more units, remove them from the assigned units (in a new dictionary, so undoing it keeps the order)
+        if len(stack) == 0:
+            self.set_attribute(player, 'assigned_units', {
+                unit_type: units for unit_type, units in player.assigned_units.items() if unit_type != piece_to_recruit
+            })
+        return OK
+
+    def apply_place(self, player: Player, action: Action, coin: Unit) -> Result:
         """
         Take a unit from your hand and place it orthogonally adjacent to one of your control zones. If you don't have any,
-        you can't place a unit until you control one
+        you can't place a unit until you control one.
 
         Args:
             player: The Player class object defining the current player.
+            action: The place Action, using its end coordinates.
+            coin: The unit coin in the player hand that is placed.
+
+        Returns:
+            The Result of the action.
         """
-        piece_to_place = str(input('Piece to place from hand: '))
-        # Check the piece is in the hand
-        if not self.piece_in_hand(piece_to_place, player):
-            return
-        
         # Check it's not a royal unit (they can't be placed in the board)
-        if piece_to_place == 'Royal':
-            print('Royal unit coins can not be placed in the board')
-            return
-
-        position_to_place = str(input('Position to place (row, col): '))
-        # Check if the position to place is a valid position
-        if not self.valid_board_position(position_to_place):
-            return
-        
-        translated_coordinate = self.translate_to_coordinate(position_to_place)
+        if action.piece == 'Royal':
+            return Result(False, 'Royal unit coins can not be placed in the board')
+        end = action.end
+        if not self.in_bounds(end):
+            return Result(False, 'Invalid coordinate input')
         # Only allow the position where the unit will be placed to be an 'Empty' unit
-        if not self.valid_end_position(translated_coordinate, control_pos_allowed=False):
-            return
-        
+        error = self.end_position_error(end, control_pos_allowed=False)
+        if error:
+            return Result(False, error)
         # Check its orthogonal to a control point
-        if not self.is_orthogonal_to_control(translated_coordinate, player):
-            return
-        
-        # Place it in the board
-        row, col = translated_coordinate[0], translated_coordinate[1]
+        error = self.placement_error(end, player)
+        if error:
+            return Result(False, error)
+
+        self.take_coin(coin, player)
+        seat, unit_type, square = self.seats[player], TYPE_INDEX[action.piece], self.square(end)
+        self.bits.place(seat, unit_type, square)
+        self.record(self.bits.remove, seat, unit_type, square)
+        self.key ^= ZOBRIST.unit[seat][unit_type][square]
         # Save it's previous status so we can revert back to it whenever a piece moves from that position
-        self.grid[row][col].previous_unit = self.grid[row][col].unit
-        self.grid[row][col].unit = self.get_unit_from_hand(piece_to_place, player, remove=True)
+        self.set_cell(end, coin, self.grid[end[0]][end[1]].unit)
+        return OK
 
-    def can_attack(self, from_position: str, player: Player, unit: Unit) -> None:
+    def apply_attack(self, player: Player, action: Action, coin: Unit) -> Result:
         """
-        Helper function that checks if it is possible to attack a unit given the positon of the unit and the position of the 
-        unit to attack. It allows units with more than one attack to attack multiple times.
+        Having a unit in the board and one of the same type in your hand, discard the unit in your hand to attack one unit of 
+        the opponent. This attacked unit gets removed from the game. Units with more than one attack can attack again, using
+        the extra targets of the action.
 
         Args:
-            from_position: Coordinates input by the user.
             player: The Player class object defining the current player.
-            unit: The Unit class object that is being used to attack.
+            action: The attack Action, using its start, end and extra target coordinates.
+            coin: The unit coin in the player hand that is discarded.
+
+        Returns:
+            The Result of the action.
         """
+        start = action.start
+        if not self.in_bounds(start):
+            return Result(False, 'Invalid coordinate input')
+
+        bits: BitBoard = self.bits
+        seat: int = self.seats[player]
+        start_square: int = self.square(start)
+        # Check the position isn't empty and belongs to the player (but is not a control point)
+        unit_type: int = bits.unit_type_at(seat, start_square)
+        if unit_type is None:
+            return Result(False, 'Cell is empty, a control point or it doesn\'t belong to the player')
+        # Check the piece in the hand matches the unit on the board
+        if SOLDIER_TYPES[unit_type] != action.piece:
+            return Result(False, 'The piece in hand is not the same type as the unit on the board')
+
+        targets: tuple = (action.end,) + tuple(action.extra_targets)
+        no_of_attacks: int = bits.tables.no_of_attacks[unit_type]
+        if len(targets) > no_of_attacks:
+            return Result(False, f'This unit can only attack {no_of_attacks} times')
+        # Every target has to be valid at the time it is attacked, so the same unit can't be attacked twice
+        for i, target in enumerate(targets):
+            if not self.in_bounds(target):
+                return Result(False, 'Invalid coordinate input')
+            if target in targets[:i]:
+                return Result(False, 'Can\'t attack own player unit, control units or empty units.')
+            error = self.attack_position_error(target, player)
+            if error:
+                return Result(False, error)
+            # Check the specific unit coin attack
+            if not bits.tables.attack[unit_type][start_square] & (1 << self.square(target)):
+                return Result(False, f'{action.piece} units can not attack that position')
+
+        self.discard_coin(coin, player)
+        for target in targets:
+            target_square: int = self.square(target)
+            target_type: int = bits.unit_type_at(1 - seat, target_square)
+            bits.remove(1 - seat, target_type, target_square)
+            self.record(bits.place, 1 - seat, target_type, target_square)
+            self.key ^= ZOBRIST.unit[1 - seat][target_type][target_square]
+            attacked_cell: Cell = self.grid[target[0]][target[1]]
+            self.set_cell(target, attacked_cell.previous_unit, attacked_cell.previous_unit)
+        return OK
+
+    def apply_control(self, player: Player, action: Action, coin: Unit) -> Result:
+        """
+        Having a unit on the board over a control zone (whether it being free or controlled by your opponent), discard a unit from 
+        your hand to the discard pile and put one of your control tokens below the unit in the zone.
+
+        Args:
+            player: The Player class object defining the current player.
+            action: The control Action, using its end coordinates.
+            coin: The unit coin in the player hand that is discarded.
+
+        Returns:
+            The Result of the action.
+        """
+        end = action.end
+        if not self.in_bounds(end):
+            return Result(False, 'Invalid coordinate input')
+
+        bits: BitBoard = self.bits
+        seat: int = self.seats[player]
+        square: int = self.square(end)
+        bit: int = 1 << square
+        # Check it is in fact a control unit with one of the player units over it
+        if not bits.zones & bits.occupied[seat] & bit:
+            return Result(False, 'The current coordinate does not contain a control unit')
+        # A zone that is already controlled by the player can't use up another control token
+        if bits.owned[seat] & bit:
+            return Result(False, 'The control zone already belongs to the player')
+        if player.control_tokens <= 0:
+            return Result(False, 'The player has no control tokens left')
+
+        self.discard_coin(coin, player)
+        self.set_attribute(bits, 'owned', bits.owned[:])
+        self.set_attribute(bits, 'reach', bits.reach[:])
+        # Take the zone from the opponent if it was controlling it
+        if bits.owned[1 - seat] & bit:
+            self.key ^= ZOBRIST.owned[1 - seat][square]
+        self.key ^= ZOBRIST.owned[seat][square]
+        bits.control(seat, square)
+        self.set_cell(end, self.grid[end[0]][end[1]].unit, self.controls[player])
+        self.set_attribute(player, 'control_tokens', player.control_tokens - 1)
+        return OK
+
+    def apply_initiative(self, player: Player, action: Action, coin: Unit) -> Result:
+        """
+        Discard any unit in your hand to gain the initiative for the next round. This means that you will be the first to play. The other 
+        player can take the initiative back in their turn if they perform this action.
+
+        Args:
+            player: The Player class object defining the current player.
+            action: The initiative Action.
+            coin: The unit coin in the player hand that is discarded.
+
+        Returns:
+            The Result of the action.
+        """
+        self.discard_coin(coin, player)
+        # Give player initiative
+        self.set_attribute(player, 'has_initiative', True)
+        return OK
+
+    def legal_actions(self, player: Player, actions: list = None) -> list:
+        """
+        Generates every Action that apply_action() would accept for the coins in the player hand, in one pass over the
+        board. Coins of the same type in the hand only generate their actions once, and the actions come from the shared
+        ActionTable so that they are not allocated again on every call.
+
+        Args:
+            player: The Player class object defining the current player.
+            actions: Optional list that is cleared and reused to store the actions, to avoid allocating a new one.
+
+        Returns:
+            The list of legal actions.
+        """
+        if actions is None:
+            actions = []
+        else:
+            actions.clear()
+        append = actions.append
+        table: ActionTable = self.action_table
+
+        # Distinct unit types in the hand
+        hand_types: list = player.hand.types()
+        if not hand_types:
+            return actions
+
+        # Actions that don't depend on the board
+        for piece in hand_types:
+            append(table.initiative[piece])
+            if piece == 'Royal':
+                for unit_type in player.assigned_units:
+                    append(table.recruit[(piece, unit_type)])
+            elif piece in player.assigned_units:
+                append(table.recruit[(piece, piece)])
+
+        bits: BitBoard = self.bits
+        tables: BitTables = bits.tables
+        seat: int = self.seats[player]
+        enemies: int = bits.occupied[1 - seat]
+        free: int = ~(bits.occupied[0] | bits.occupied[1])
+
+        # Control the zones the player units are standing on, discarding any coin, while it has control tokens left
+        mask: int = bits.control_mask(seat) if player.control_tokens > 0 else 0
+        while mask:
+            low: int = mask & -mask
+            mask ^= low
+            square: int = low.bit_length() - 1
+            for piece in hand_types:
+                append(table.control[piece][square])
+
+        # Place on the empty cells next to the player control points
+        placements: int = bits.placement_mask(seat)
+
+        for piece in hand_types:
+            if piece == 'Royal':
+                continue
+            unit_type: int = TYPE_INDEX[piece]
+            mask = placements
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                append(table.place[piece][low.bit_length() - 1])
+
+            # Move or attack with the units on the board of the same type as the coin
+            units: int = bits.units[seat][unit_type]
+            while units:
+                low = units & -units
+                units ^= low
+                start: int = low.bit_length() - 1
+
+                # Move to an empty cell or a control point without units
+                moves: dict = table.move[piece][start]
+                mask = tables.move[unit_type][start] & free
+                while mask:
+                    low = mask & -mask
+                    mask ^= low
+                    append(moves[low.bit_length() - 1])
+
+                # Attack any opponent unit within the unit attack range
+                attacks: dict = table.attack[piece][start]
+                targets: list = []
+                mask = tables.attack[unit_type][start] & enemies
+                while mask:
+                    low = mask & -mask
+                    mask ^= low
+                    action: Action = attacks[low.bit_length() - 1]
+                    append(action)
+                    targets.append(action)
+                # Units with two attacks can also attack a second, different unit (in any order the result is the same)
+                if tables.no_of_attacks[unit_type] > 1:
+                    for i, action in enumerate(targets):
+                        for second in targets[i + 1:]:
+                            append(Action(ATTACK, piece, action.start, action.end, extra_targets=(second.end,)))
+
+        return actions
+
+    def perform(self, player: Player, action: Action) -> Result:
+        """
+        Helper function used by the interactive actions, it applies the parsed Action and prints why it was rejected.
+
+        Args:
+            player: The Player class object defining the current player.
+            action: The parsed Action.
+
+        Returns:
+            The Result of the action.
+        """
+        result: Result = self.apply_action(player, action)
+        if not result:
+            self.events.emit(RULE_ERROR, message=result.message)
+        return result
+    
+    def move(self, player: Player) -> None:
+        """
+        Reads a move action from the user input and performs it, see apply_move().
+
+        Args:
+            player: The Player class object defining the current player.
+        """
+        # Check if the from_position is a valid position
+        from_position = str(input('Move from position (row, col): '))
+        if not self.valid_board_position(from_position):
+            return
+        
+        # Check the position isn't empty and belongs to the player (but is not a control point)
+        if not self.valid_start_position(self.get_unit(from_position), player):
+            return 
+        
+        piece = str(input('Select a piece of the same type in your hand: '))
         to_position = str(input('To position (row, col): '))
         # Check if the to_position is a valid position
         if not self.valid_board_position(to_position):
             return
         
-        # Get the translated coordinates
-        translated_start = self.translate_to_coordinate(from_position)
-        translated_end = self.translate_to_coordinate(to_position)
+        self.perform(player, Action(
+            MOVE, piece, self.translate_to_coordinate(from_position), self.translate_to_coordinate(to_position)
+        ))
+
+    def recruit(self, player: Player) -> None:
+        """
+        Reads a recruit action from the user input and performs it, see apply_recruit().
+
+        Args:
+            player: The Player class object defining the current player.
+        """
+        piece_to_discard = str(input('Piece to discard from hand to recruit the same kind: '))
+        piece_to_recruit = str(input(f'Used {piece_to_discard} coin, type the piece you want to recruit: '))
+        if self.perform(player, Action(RECRUIT, piece_to_discard, recruit=piece_to_recruit)):
+            self.events.emit(COIN_RECRUITED, piece=piece_to_recruit)
+
+    def place(self, player: Player) -> None:
+        """
+        Reads a place action from the user input and performs it, see apply_place().
 
-        # Check the to_position contains another player unit (can't attack empty units/control units/own player units)
-        if not self.valid_attack_position(translated_end, player):
+        Args:
+            player: The Player class object defining the current player.
+        """
+        piece_to_place = str(input('Piece to place from hand: '))
+        position_to_place = str(input('Position to place (row, col): '))
+        # Check if the position to place is a valid position
+        if not self.valid_board_position(position_to_place):
             return
         
-        # If it was an invalid move due to the speficic unit coin movement, end the function
-        if not unit.attack(translated_start, translated_end):
-            return
-
-        # Change the board status given that all of the above operations were valid
-        attacked_cell: Cell = self.grid[translated_end[0]][translated_end[1]]
-        attacked_cell.unit = attacked_cell.previous_unit
+        self.perform(player, Action(PLACE, piece_to_place, end=self.translate_to_coordinate(position_to_place)))
 
     def attack(self, player: Player) -> None:
         """
-        Having a unit in the board and one of the same type in your hand, discard the unit in your hand to attack one unit of 
-        the opponent. This attacked unit gets removed from the game.
+        Reads an attack action from the user input and performs it, see apply_attack(). Units with more than one attack
+        are asked whether they want to attack again.
 
         Args:
             player: The Player class object defining the current player.
@@ -514,60 +1236,45 @@ class Board:
         if not self.valid_start_position(unit, player):
             return 
         
-        # Check the piece to move is contained in the hand and the board
         piece = str(input('Select a piece of the same type in your hand: '))
-        if not (self.piece_in_hand(piece, player, remove=True, discard=True) and unit.unit_type == piece):
-            return
-        
         # Check if the current unit can attack more than once
+        targets: list = []
         for i in range(unit.no_of_attacks):
             if i == 1:
                 confirm_attack = str(input(f'This unit can attack {unit.no_of_attacks} times, would you like to attack again? (yes/no): '))
                 if confirm_attack.lower() == 'no':
                     break
-            self.can_attack(from_position, player, unit)
+            to_position = str(input('To position (row, col): '))
+            # Check if the to_position is a valid position
+            if not self.valid_board_position(to_position):
+                return
+            targets.append(self.translate_to_coordinate(to_position))
+
+        self.perform(player, Action(
+            ATTACK, piece, self.translate_to_coordinate(from_position), targets[0], extra_targets=tuple(targets[1:])
+        ))
 
     def control(self, player: Player) -> None:
         """
-        Having a unit on the board over a control zone (whether it being free or controlled by your opponent), discard a unit from 
-        your hand to the discard pile and put one of your control tokens below the unit in the zone.
+        Reads a control action from the user input and performs it, see apply_control().
 
         Args:
             player: The Player class object defining the current player.
         """
         piece_to_discard = str(input('Piece to discard from hand: '))
-        # Check the piece is in the hand
-        if not self.piece_in_hand(piece_to_discard, player, remove=True, discard=True):
-            return
-        
         position_to_control = str(input('Position to control (row, col): '))
         # Check if the position to control is a valid position
         if not self.valid_board_position(position_to_control):
             return
         
-        # Check it is in fact a control unit
-        translated_coordinate = self.translate_to_coordinate(position_to_control) 
-        row, col = translated_coordinate[0], translated_coordinate[1]
-        if self.grid[row][col].previous_unit.unit_type != 'Control':
-            print('The current coordinate does not contain a control unit')
-            return
-        
-        # Since none of the above error-check conditions were satisfied, control the coordianate
-        curr_cell = self.grid[row][col]
-        curr_cell.previous_unit = Unit(player, 'Control', 'C')
-        player.control_tokens -= 1
+        self.perform(player, Action(CONTROL, piece_to_discard, end=self.translate_to_coordinate(position_to_control)))
 
     def initiative(self, player: Player) -> None:
         """
-        Discard any unit in your hand to gain the initiative for the next round. This means that you will be the first to play. The other 
-        player can take the initiative back in their turn if they perform this action.
+        Reads an initiative action from the user input and performs it, see apply_initiative().
 
         Args:
             player: The Player class object defining the current player.
         """
         piece = str(input('Piece to discard from hand: '))
-        # Improvement: Allow for user input by changing it to lower case
-        if self.piece_in_hand(piece, player, remove=True, discard=True):
-            # Give player initiative
-            player.has_initiative = True
-            return
+        self.perform(player, Action(INITIATIVE, piece))
@@ -1,5 +1,90 @@
+import copy
+
+from events import EventSink, TERMINAL, RULE_ERROR
 from player import Player
 
+# Directions a unit can move or attack in, as (row, col) steps
+ORTHOGONAL: tuple = ((-1, 0), (0, 1), (1, 0), (0, -1))
+DIAGONAL: tuple = ((-1, -1), (-1, 1), (1, 1), (1, -1))
+ORTHOGONAL_OFFSETS: frozenset = frozenset(ORTHOGONAL)
+
+# UnitSpec class with its respective methods and properties
+class UnitSpec:
+    """
+    A class to represent a UnitSpec, the declarative description of how a unit type moves and attacks. Every lookup
+    table is derived from it, so adding a unit type only means adding its spec.
+
+    Attributes:
+        unit_symbol: The symbol belonging to a unit, e.g: A
+        no_of_attacks: The number of attacks a unit has assigned.
+        move_offsets: Set of the (row, col) offsets the unit can move to.
+        attack_offsets: Set of the (row, col) offsets the unit can attack.
+    """
+    def __init__(self, unit_symbol: str, move: tuple = ((), 0), attack: tuple = ((), 0), no_of_attacks: int = 1) -> None:
+        self.unit_symbol = unit_symbol
+        self.no_of_attacks = no_of_attacks
+        self.move_offsets = self.offsets(*move)
+        self.attack_offsets = self.offsets(*attack)
+
+    def offsets(self, directions: tuple, distance: int) -> frozenset:
+        """
+        Expands directions and a maximum distance into the set of (row, col) offsets they reach.
+
+        Args:
+            directions: Tuple of (row, col) steps.
+            distance: The maximum number of steps in each direction.
+
+        Returns:
+            Set of (row, col) offsets.
+        """
+        return frozenset((dx * step, dy * step) for dx, dy in directions for step in range(1, distance + 1))
+
+# How every unit coin moves and attacks
+UNIT_SPECS: dict = {
+    # Moves one orthogonal space, attacks up to two units away vertically, horizontally or diagonally
+    'Archer': UnitSpec('A', move=(ORTHOGONAL, 1), attack=(ORTHOGONAL + DIAGONAL, 2)),
+    # Move one orthogonal space, attack one adjacent unit vertically, horizontally or diagonally
+    'Knight': UnitSpec('K', move=(ORTHOGONAL, 1), attack=(ORTHOGONAL + DIAGONAL, 1)),
+    'Mercenary': UnitSpec('M', move=(ORTHOGONAL, 1), attack=(ORTHOGONAL + DIAGONAL, 1)),
+    'Berserker': UnitSpec('B', move=(ORTHOGONAL, 1), attack=(ORTHOGONAL + DIAGONAL, 1), no_of_attacks=2),
+}
+
+# Lookup tables already built for each board size
+_unit_tables: dict = {}
+
+def get_unit_tables(rows: int, cols: int) -> dict:
+    """
+    Returns the lookup tables of every unit type for a board size, building them the first time they are requested.
+    A square is the index row * cols + col of a coordinate.
+
+    Args:
+        rows: The number of rows in the board.
+        cols: The number of columns in the board.
+
+    Returns:
+        Dictionary following the structure {unit_type: (move squares, attack squares)}, where both are lists with a
+        tuple of the in-bounds squares reachable from each square.
+    """
+    tables: dict = _unit_tables.get((rows, cols))
+    if tables is None:
+        tables = {}
+        for unit_type, spec in UNIT_SPECS.items():
+            move: list = []
+            attack: list = []
+            for row in range(rows):
+                for col in range(cols):
+                    move.append(tuple(sorted(
+                        (row + dx) * cols + col + dy for dx, dy in spec.move_offsets
+                        if 0 <= row + dx < rows and 0 <= col + dy < cols
+                    )))
+                    attack.append(tuple(sorted(
+                        (row + dx) * cols + col + dy for dx, dy in spec.attack_offsets
+                        if 0 <= row + dx < rows and 0 <= col + dy < cols
+                    )))
+            tables[unit_type] = (move, attack)
+        _unit_tables[(rows, cols)] = tables
+    return tables
+
 # Unit class with its respective methods and properties
 class Unit:
     """
@@ -9,23 +94,61 @@ class Unit:
         player: The Player class object defining the current player.
         unit_type: The type belonging to a unit, e.g: Archer.
         unit_symbol: The symbol belonging to a unit, e.g: A
+        spec: The UnitSpec class object describing how the unit moves and attacks, shared by all units of its type.
+
+    Units only store their three attributes in slots, the unit type and symbol being references to shared strings.
     """
+    __slots__ = ('player', 'unit_type', 'unit_symbol')
+
+    # Empty and control units can't move nor attack
+    spec: UnitSpec = UnitSpec('·')
+
     def __init__(self, player: Player = None, unit_type: str = 'Empty', unit_symbol: str = '·') -> None:
         self.player = player
         self.unit_type = unit_type
         self.unit_symbol = unit_symbol
 
+    @property
+    def events(self) -> EventSink:
+        """
+        The EventSink class object the rule errors of the unit are reported to, the one of its player or the terminal
+        for units without a player.
+        """
+        return self.player.events if self.player is not None else TERMINAL
+
     def move(self):
         """
         Defines how a particular unit moves.
         """
         pass
 
-    def attack(self):
+    def attack(self, from_position: tuple, to_position: tuple) -> bool:
+        """
+        Defines how a particular unit attacks, by looking up the offset between both coordinates in the attack offsets
+        of its spec.
+
+        Args:
+            from_position: Tuple containing the start coordinates.
+            to_position: Tuple containing the end coordinates.
+
+        Returns:
+            True if it follows the unit attack rules, False if it doesn't.
         """
-        Defines how a particular unit attacks.
+        return (to_position[0] - from_position[0], to_position[1] - from_position[1]) in self.spec.attack_offsets
+
+    def can_move(self, from_position: tuple, to_position: tuple) -> bool:
         """
-        pass
+        Checks whether a unit can move between two coordinates, without printing the reason if it can't so that
+        it can be used by the headless Board.apply_action().
+
+        Args:
+            from_position: Tuple containing the start coordinates.
+            to_position: Tuple containing the end coordinates.
+
+        Returns:
+            True if the unit can move to the end coordinates, False if it can't.
+        """
+        return (to_position[0] - from_position[0], to_position[1] - from_position[1]) in self.spec.move_offsets
 
     def is_orthogonal(self, start: tuple, end: tuple) -> bool:
         """
@@ -38,11 +161,7 @@ class Unit:
         Returns:
             True if the coordinates are orthogonal, False if they are not.
         """
-        x1, y1 = start 
-        x2, y2 = end 
-        dx = abs(x2 - x1)
-        dy = abs(y2 - y1)
-        return (dx == 1 and dy == 0) or (dx == 0 and dy == 1) 
+        return (end[0] - start[0], end[1] - start[1]) in ORTHOGONAL_OFFSETS
 
 # Archer class with its respective methods and properties
 class Archer(Unit):
@@ -54,13 +173,15 @@ class Archer(Unit):
         unit_type: The type belonging to a unit, e.g: Archer.
         unit_symbol: The symbol belonging to a unit, e.g: A
         no_of_attacks: The number of attacks a unit has assigned.
+        spec: The UnitSpec class object describing how the unit moves and attacks.
     """
+    __slots__ = ()
+
+    spec: UnitSpec = UNIT_SPECS['Archer']
+    no_of_attacks: int = spec.no_of_attacks
+
     def __init__(self, player: Player = None) -> None:
-        super().__init__(self)
-        self.player = player
-        self.unit_type: str = 'Archer'
-        self.unit_symbol: str = 'A'
-        self.no_of_attacks = 1
+        super().__init__(player, 'Archer', self.spec.unit_symbol)
     
     def move(self, from_position, to_position) -> bool:
         """
@@ -74,32 +195,11 @@ class Archer(Unit):
             True if it follows the Archer move rules, False if it doesn't.
         """
         # Archer can only move one orthogonal space
-        if not self.is_orthogonal(from_position, to_position):
-            print('Archers can only move 1 unit at a time in an orthogonal way')
+        if not self.can_move(from_position, to_position):
+            self.events.emit(RULE_ERROR, message='Archers can only move 1 unit at a time in an orthogonal way')
             return False 
         return True
 
-    def attack(self, from_position, to_position) -> bool:
-        """
-        Defines how the Archer class attacks.
-
-        Args:
-            from_position: Tuple containing the start coordinates.
-            to_position: Tuple containing the end coordinates.
-
-        Returns:
-            True if it follows the Archer attack rules, False if it doesn't.
-        """
-        # Allows for attack up to two units: vertically, horizontally or diagonally
-        # Only allows for a distance of at most 2, and from_position & to_position can not be the same position 
-        dx, dy = abs(from_position[0] - to_position[0]), abs(from_position[1] - to_position[1])
-    
-        if dx <= 2 and dy <= 2:
-            if (dx == 0 or dy == 0 or dx == dy) and from_position != to_position:
-                return True
-
-        return False
-
 # Knight class with its respective methods and properties
 class Knight(Unit):
     """
@@ -110,13 +210,15 @@ class Knight(Unit):
         unit_type: The type belonging to a unit, e.g: Knight.
         unit_symbol: The symbol belonging to a unit, e.g: K
         no_of_attacks: The number of attacks a unit has assigned.
+        spec: The UnitSpec class object describing how the unit moves and attacks.
     """
+    __slots__ = ()
+
+    spec: UnitSpec = UNIT_SPECS['Knight']
+    no_of_attacks: int = spec.no_of_attacks
+
     def __init__(self, player: Player = None) -> None:
-        super().__init__(self)
-        self.player = player
-        self.unit_type: str = 'Knight'
-        self.unit_symbol: str = 'K'
-        self.no_of_attacks = 1
+        super().__init__(player, 'Knight', self.spec.unit_symbol)
     
     def move(self, from_position, to_position) -> bool:
         """
@@ -130,28 +232,11 @@ class Knight(Unit):
             True if it follows the Knight move rules, False if it doesn't.
         """
         # Knights can only move one orthogonal space
-        if not self.is_orthogonal(from_position, to_position):
-            print('Knights can only move 1 unit at a time in an orthogonal way')
+        if not self.can_move(from_position, to_position):
+            self.events.emit(RULE_ERROR, message='Knights can only move 1 unit at a time in an orthogonal way')
             return False 
         return True
 
-    def attack(self, from_position, to_position) -> bool:
-        """
-        Defines how the Knight class attacks.
-
-        Args:
-            from_position: Tuple containing the start coordinates.
-            to_position: Tuple containing the end coordinates.
-
-        Returns:
-            True if it follows the Knight attack rules, False if it doesn't.
-        """
-        # Allows for attacks in one adjacent unit: vertical, horitzontal or diagonal
-        # from_position & to_position can not be the same position
-        dx, dy = abs(from_position[0] - to_position[0]), abs(from_position[1] - to_position[1])
-        
-        return (dx == 1 and dy == 0) or (dx == 0 and dy == 1) or (dx == 1 and dy == 1)
-
 # Mercenary class with its respective methods and properties
 class Mercenary(Unit):
     """
@@ -162,13 +247,15 @@ class Mercenary(Unit):
         unit_type: The type belonging to a unit, e.g: Mercenary.
         unit_symbol: The symbol belonging to a unit, e.g: M
         no_of_attacks: The number of attacks a unit has assigned.
+        spec: The UnitSpec class object describing how the unit moves and attacks.
     """
+    __slots__ = ()
+
+    spec: UnitSpec = UNIT_SPECS['Mercenary']
+    no_of_attacks: int = spec.no_of_attacks
+
     def __init__(self, player: Player = None) -> None:
-        super().__init__(self)
-        self.player = player
-        self.unit_type: str = 'Mercenary'
-        self.unit_symbol: str = 'M'
-        self.no_of_attacks = 1
+        super().__init__(player, 'Mercenary', self.spec.unit_symbol)
     
     def move(self, from_position, to_position) -> bool:
         """
@@ -182,28 +269,11 @@ class Mercenary(Unit):
             True if it follows the Archer move rules, False if it doesn't.
         """
         # Mercenaries can only move one orthogonal space
-        if not self.is_orthogonal(from_position, to_position):
-            print('Mercenaries can only move 1 unit at a time in an orthogonal way')
+        if not self.can_move(from_position, to_position):
+            self.events.emit(RULE_ERROR, message='Mercenaries can only move 1 unit at a time in an orthogonal way')
             return False 
         return True
 
-    def attack(self, from_position, to_position) -> bool:
-        """
-        Defines how the Mercenary class attacks.
-
-        Args:
-            from_position: Tuple containing the start coordinates.
-            to_position: Tuple containing the end coordinates.
-
-        Returns:
-            True if it follows the Mercenary attack rules, False if it doesn't.
-        """
-        # Allows for attacks in one adjacent unit: vertical, horitzontal or diagonal
-        # from_position & to_position can not be the same position
-        dx, dy = abs(from_position[0] - to_position[0]), abs(from_position[1] - to_position[1])
-        
-        return (dx == 1 and dy == 0) or (dx == 0 and dy == 1) or (dx == 1 and dy == 1)
-
 # Berserker class with its respective methods and properties
 class Berserker(Unit):
     """
@@ -214,13 +284,15 @@ class Berserker(Unit):
         unit_type: The type belonging to a unit, e.g: Berserker.
         unit_symbol: The symbol belonging to a unit, e.g: B.
         no_of_attacks: The number of attacks a unit has assigned.
+        spec: The UnitSpec class object describing how the unit moves and attacks.
     """
+    __slots__ = ()
+
+    spec: UnitSpec = UNIT_SPECS['Berserker']
+    no_of_attacks: int = spec.no_of_attacks
+
     def __init__(self, player: Player = None) -> None:
-        super().__init__(self)
-        self.player = player
-        self.unit_type: str = 'Berserker'
-        self.unit_symbol: str = 'B'
-        self.no_of_attacks = 2
+        super().__init__(player, 'Berserker', self.spec.unit_symbol)
     
     def move(self, from_position, to_position) -> bool:
         """
@@ -234,28 +306,11 @@ class Berserker(Unit):
             True if it follows the Berserker move rules, False if it doesn't.
         """
         # Berserkers can only move one orthogonal space
-        if not self.is_orthogonal(from_position, to_position):
-            print('Berserkers can only move 1 unit at a time in an orthogonal way')
+        if not self.can_move(from_position, to_position):
+            self.events.emit(RULE_ERROR, message='Berserkers can only move 1 unit at a time in an orthogonal way')
             return False 
         return True
 
-    def attack(self, from_position, to_position) -> bool:
-        """
-        Defines how the Berserker class attacks.
-
-        Args:
-            from_position: Tuple containing the start coordinates.
-            to_position: Tuple containing the end coordinates.
-
-        Returns:
-            True if it follows the Berserker attack rules, False if it doesn't.
-        """
-        # Allows for attacks in one adjacent unit: vertical, horitzontal or diagonal
-        # from_position & to_position can not be the same position
-        dx, dy = abs(from_position[0] - to_position[0]), abs(from_position[1] - to_position[1])
-        
-        return (dx == 1 and dy == 0) or (dx == 0 and dy == 1) or (dx == 1 and dy == 1)
-
 # Royal class with its respective methods and properties
 class Royal(Unit):
     """
@@ -265,10 +320,51 @@ class Royal(Unit):
         unit_type: The type belonging to a unit, e.g: Royal.
         unit_symbol: The symbol belonging to a unit, e.g: R
     """
+    __slots__ = ()
+
     def __init__(self) -> None:
-        super().__init__(self)
-        self.unit_type: str = 'Royal'
-        self.unit_symbol: str = 'R'
+        super().__init__(None, 'Royal', 'R')
+
+# Classes of the coins by unit type
+COIN_CLASSES: dict = {'Archer': Archer, 'Knight': Knight, 'Mercenary': Mercenary, 'Berserker': Berserker, 'Royal': Royal}
+
+# Marker class with its respective methods and properties
+class Marker(Unit):
+    """
+    A class to represent a Marker, the immutable subclass of Unit used for the empty cells and the control points. As
+    markers can't change, a single one is shared by every cell it is in: EMPTY and FREE_CONTROL for the whole program,
+    and one control point per player in each Board class object.
+
+    Attributes:
+        player: The Player class object controlling the control point, None if it is empty or free.
+        unit_type: Either Empty or Control.
+        unit_symbol: The symbol of the marker, e.g: @
+    """
+    __slots__ = ()
+
+    def __init__(self, player: Player = None, unit_type: str = 'Empty', unit_symbol: str = '·') -> None:
+        object.__setattr__(self, 'player', player)
+        object.__setattr__(self, 'unit_type', unit_type)
+        object.__setattr__(self, 'unit_symbol', unit_symbol)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f'{self.unit_type} markers are shared, replace the unit of the cell instead')
+
+    def __reduce__(self) -> tuple:
+        return Marker, (self.player, self.unit_type, self.unit_symbol)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo: dict):
+        # Markers without a player are shared by every board, the others belong to the players being copied
+        if self.player is None:
+            return self
+        return Marker(copy.deepcopy(self.player, memo), self.unit_type, self.unit_symbol)
+
+# Markers shared by every board
+EMPTY: Marker = Marker()
+FREE_CONTROL: Marker = Marker(None, 'Control', '@')
 
 # Cell class with its respective methods and properties
 class Cell:
@@ -281,7 +377,9 @@ class Cell:
         unit: The Unit class object in that cell.
         previous_unit: The Unit class object it was previously.
     """
-    def __init__(self, row: int = 0, col: int = 0, unit: Unit = None, previous_unit: Unit = Unit()) -> None:
+    __slots__ = ('row', 'col', 'unit', 'previous_unit')
+
+    def __init__(self, row: int = 0, col: int = 0, unit: Unit = EMPTY, previous_unit: Unit = EMPTY) -> None:
         self.row = row
         self.col = col
         self.unit = unit
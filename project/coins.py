@@ -0,0 +1,153 @@
+import random
+
+from action import COIN_TYPES
+
+# CoinBag class with its respective methods and properties
+class CoinBag:
+    """
+    A class to represent a CoinBag, a multiset of unit coins grouped by unit type, used for the bag and the hand of a
+    player. Coins of the same type are interchangeable for the rules, so they are kept in a stack per type: checking
+    for, taking and drawing a coin only depend on the number of unit types, not on the number of coins. The coins
+    themselves are kept because the one that is placed becomes the unit on the board.
+
+    Attributes:
+        stacks: Dictionary following the structure {unit_type: [stack of Unit class objects]}, a type is never removed
+            once added so that the order of the coins only depends on the coins added and taken.
+        size: The total number of coins.
+    """
+    __slots__ = ('stacks', 'size')
+
+    def __init__(self, coins: list = ()) -> None:
+        self.stacks: dict = {}
+        self.size: int = 0
+        for coin in coins:
+            self.append(coin)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        for stack in self.stacks.values():
+            yield from stack
+
+    def __contains__(self, unit_type: str) -> bool:
+        stack: list = self.stacks.get(unit_type)
+        return bool(stack)
+
+    def __repr__(self) -> str:
+        return f'CoinBag({[coin.unit_type for coin in self]})'
+
+    def count(self, unit_type: str) -> int:
+        """
+        Returns the number of coins of a unit type.
+        """
+        stack: list = self.stacks.get(unit_type)
+        return len(stack) if stack else 0
+
+    def types(self) -> list:
+        """
+        Returns the unit types with at least one coin, in the order they were first added.
+        """
+        return [unit_type for unit_type, stack in self.stacks.items() if stack]
+
+    def append(self, coin) -> None:
+        """
+        Adds a coin on top of the stack of its type.
+
+        Args:
+            coin: The Unit class object to add.
+        """
+        stack: list = self.stacks.get(coin.unit_type)
+        if stack is None:
+            stack = self.stacks[coin.unit_type] = []
+        stack.append(coin)
+        self.size += 1
+
+    def insert(self, index: int, coin) -> None:
+        """
+        Adds a coin back at a position of the stack of its type, undoing remove().
+
+        Args:
+            index: The position in the stack returned by remove().
+            coin: The Unit class object to add.
+        """
+        self.stacks[coin.unit_type].insert(index, coin)
+        self.size += 1
+
+    def find(self, unit_type: str):
+        """
+        Returns the coin of a unit type that take() would take, or None if there are no coins of that type.
+        """
+        stack: list = self.stacks.get(unit_type)
+        return stack[-1] if stack else None
+
+    def take(self, unit_type: str):
+        """
+        Removes and returns the coin on top of the stack of a unit type, undoing append().
+
+        Args:
+            unit_type: The type of the coin, there has to be at least one.
+
+        Returns:
+            The Unit class object removed.
+        """
+        self.size -= 1
+        return self.stacks[unit_type].pop()
+
+    def remove(self, coin) -> int:
+        """
+        Removes a given coin, compared by identity since coins of the same type are different coins.
+
+        Args:
+            coin: The Unit class object to remove.
+
+        Returns:
+            The position it had in the stack of its type, to put it back with insert().
+        """
+        stack: list = self.stacks[coin.unit_type]
+        # The coin found by find() is on top
+        if stack[-1] is coin:
+            index: int = len(stack) - 1
+        else:
+            index = next(i for i, unit in enumerate(stack) if unit is coin)
+        del stack[index]
+        self.size -= 1
+        return index
+
+    def draw(self, rng: random.Random):
+        """
+        Removes and returns a random coin, every coin being equally likely, so each unit type is drawn with a
+        probability proportional to its number of coins.
+
+        Args:
+            rng: The random.Random generator (or the random module) that picks the coin.
+
+        Returns:
+            The Unit class object drawn.
+        """
+        index: int = rng.randrange(self.size)
+        for stack in self.stacks.values():
+            if index < len(stack):
+                self.size -= 1
+                return stack.pop()
+            index -= len(stack)
+
+    def clear(self) -> list:
+        """
+        Removes every coin.
+
+        Returns:
+            A list with the Unit class objects removed, in the order of iteration.
+        """
+        coins: list = list(self)
+        for stack in self.stacks.values():
+            stack.clear()
+        self.size = 0
+        return coins
+
+    def signature(self) -> tuple:
+        """
+        Returns the exact contents of the multiset as the number of coins of each type, following the order of
+        COIN_TYPES, so that equal contents always give the same hashable value without collisions.
+        """
+        return tuple(self.count(unit_type) for unit_type in COIN_TYPES)
@@ -0,0 +1,39 @@
+from typing import NamedTuple
+
+# BoardConfig class with its respective properties
+class BoardConfig(NamedTuple):
+    """
+    A class to represent a BoardConfig, the size of a board and the layout of its control zones.
+
+    Attributes:
+        rows: The number of rows in the board, at most 26 so that every row has a letter.
+        cols: The number of columns in the board.
+        crow_zone: Tuple containing the coordinates of the crow starting control zone.
+        wolf_zone: Tuple containing the coordinates of the wolf starting control zone.
+        free_zones: Tuple of the coordinates of the control zones that nobody controls at the start.
+    """
+    rows: int
+    cols: int
+    crow_zone: tuple
+    wolf_zone: tuple
+    free_zones: tuple
+
+# Simplified board the game was first implemented with
+SMALL_BOARD: BoardConfig = BoardConfig(5, 5, (0, 2), (4, 2), ((2, 0), (2, 2), (2, 3), (2, 4)))
+
+# Full size board, with the zones placed symmetrically between both players
+FULL_BOARD: BoardConfig = BoardConfig(
+    9, 9, (0, 4), (8, 4), ((2, 2), (2, 6), (4, 1), (4, 4), (4, 7), (6, 2), (6, 6))
+)
+
+# Boards by the name used to select them
+BOARDS: dict = {'5x5': SMALL_BOARD, '9x9': FULL_BOARD}
+
+def board_config(rows: int, cols: int) -> BoardConfig:
+    """
+    Returns the BoardConfig of BOARDS with the given size.
+    """
+    for config in BOARDS.values():
+        if (config.rows, config.cols) == (rows, cols):
+            return config
+    raise ValueError(f'No board of {rows}x{cols} in BOARDS')
@@ -0,0 +1,105 @@
+import itertools
+import math
+import random
+from functools import lru_cache
+
+from action import COIN_TYPES
+from player import Player
+
+# Number of coins in a hand
+HAND_SIZE: int = 3
+
+# Number of bag compositions whose distribution is kept, the least recently used ones are dropped first
+DRAW_CACHE_SIZE: int = 4096
+
+def refill(bag: tuple, discarded: tuple) -> tuple:
+    """
+    Applies the refill of Player.get_hand() to coin counts: while the bag has less than three coins, the first coin of
+    the discard pile goes back to the bag.
+
+    Args:
+        bag: Tuple with the number of coins of each type in the bag, following the order of COIN_TYPES.
+        discarded: Tuple with the unit types of the discard pile, from the first discarded to the last.
+
+    Returns:
+        Tuple with the number of coins of each type in the bag after the refill, or None if there aren't enough coins
+        for a hand.
+    """
+    missing: int = HAND_SIZE - sum(bag)
+    if missing <= 0:
+        return bag
+    if missing > len(discarded):
+        return None
+    counts: list = list(bag)
+    for unit_type in discarded[:missing]:
+        counts[COIN_TYPES.index(unit_type)] += 1
+    return tuple(counts)
+
+@lru_cache(maxsize=DRAW_CACHE_SIZE)
+def bag_distribution(bag: tuple) -> tuple:
+    """
+    Returns the exact distribution of the hands drawn from a bag of at least three coins. Drawing three coins without
+    replacement, each one equally likely, gives every hand the multivariate hypergeometric probability of the product
+    of C(coins of the type, coins of the type in the hand) over C(coins in the bag, 3).
+
+    Args:
+        bag: Tuple with the number of coins of each type in the bag, following the order of COIN_TYPES.
+
+    Returns:
+        Tuple of (hand, probability) pairs, where a hand is a tuple with the number of coins of each type, following
+        the order of COIN_TYPES. The hands come in a fixed order and their probabilities add up to 1.
+    """
+    total: int = math.comb(sum(bag), HAND_SIZE)
+    hands: list = []
+    for hand in itertools.product(*(range(min(count, HAND_SIZE) + 1) for count in bag)):
+        if sum(hand) != HAND_SIZE:
+            continue
+        ways: int = math.prod(math.comb(count, drawn) for count, drawn in zip(bag, hand))
+        hands.append((hand, ways / total))
+    return tuple(hands)
+
+def hand_distribution(bag: tuple, discarded: tuple = ()) -> tuple:
+    """
+    Returns the exact distribution of the next hand, refilling the bag from the discard pile first. Only the coins of
+    the bag after the refill decide the distribution, so it is cached by that composition.
+
+    Args:
+        bag: Tuple with the number of coins of each type in the bag, following the order of COIN_TYPES.
+        discarded: Tuple with the unit types of the discard pile, from the first discarded to the last.
+
+    Returns:
+        Tuple of (hand, probability) pairs as returned by bag_distribution(), empty if no hand can be made.
+    """
+    refilled: tuple = refill(bag, discarded)
+    if refilled is None:
+        return ()
+    return bag_distribution(refilled)
+
+def player_distribution(player: Player) -> tuple:
+    """
+    Returns the exact distribution of the next hand of a player, see hand_distribution().
+    """
+    return hand_distribution(player.bag.signature(), tuple(coin.unit_type for coin in player.discarded))
+
+def sample_hand(bag: tuple, discarded: tuple = (), rng: random.Random = random) -> tuple:
+    """
+    Draws the next hand from its exact distribution with a single random number.
+
+    Args:
+        bag: Tuple with the number of coins of each type in the bag, following the order of COIN_TYPES.
+        discarded: Tuple with the unit types of the discard pile, from the first discarded to the last.
+        rng: The random.Random generator (or the random module) that picks the hand.
+
+    Returns:
+        Tuple with the number of coins of each type in the hand, or None if no hand can be made.
+    """
+    distribution: tuple = hand_distribution(bag, discarded)
+    if not distribution:
+        return None
+    number: float = rng.random()
+    for hand, probability in distribution:
+        number -= probability
+        if number < 0:
+            return hand
+    # Rounding can leave a tiny remainder after the last hand
+    return distribution[-1][0]
@@ -0,0 +1,118 @@
+from typing import NamedTuple
+
+# Event codes emitted by the rules, with the names of their payload
+INVALID_ACTION: str = 'invalid_action'
+PIECE_NOT_IN_HAND: str = 'piece_not_in_hand'
+INVALID_COORDINATE: str = 'invalid_coordinate'
+# message: why the action or position was rejected
+RULE_ERROR: str = 'rule_error'
+NO_UNITS_LEFT: str = 'no_units_left'
+# piece: the unit type of the coin added to the bag
+COIN_RECRUITED: str = 'coin_recruited'
+# unit_type: the unit type of the coin moved from the discard pile to the bag
+BAG_REFILLED: str = 'bag_refilled'
+# coins: tuple of the unit types drawn
+HAND_DRAWN: str = 'hand_drawn'
+# units: tuple of (unit type, no. of coins left) that can still be recruited
+RECRUITMENT_UNITS: str = 'recruitment_units'
+
+# How the terminal shows each event, sequences in the payload are shown as 'item, ' for each item
+MESSAGES: dict = {
+    INVALID_ACTION: 'That is not a valid action, please try again.',
+    PIECE_NOT_IN_HAND: 'Invalid input, piece is not in hand',
+    INVALID_COORDINATE: 'Invalid coordinate input',
+    RULE_ERROR: '{message}',
+    NO_UNITS_LEFT: 'There are no more units of that type',
+    COIN_RECRUITED: 'Added the {piece} coin to the bag',
+    BAG_REFILLED: 'Removed {unit_type} from the discarded pile and added it to the bag since there were less than 3 unit coins in the bag',
+    HAND_DRAWN: 'Hand: {coins}',
+    RECRUITMENT_UNITS: 'Recruitment pieces: {units}',
+}
+
+# Event class with its respective properties
+class Event(NamedTuple):
+    """
+    A class to represent an Event, something the rules report to the player.
+
+    Attributes:
+        code: One of the event codes, e.g: 'coin_recruited'.
+        payload: Dictionary with the values of the event, e.g: {'piece': 'Knight'}
+    """
+    code: str
+    payload: dict
+
+# EventSink class with its respective methods
+class EventSink:
+    """
+    A class to represent an EventSink, where the Board and Player class objects send their events. The base class
+    drops them without building anything, which is what headless games use.
+    """
+    def emit(self, code: str, **payload) -> None:
+        """
+        Reports an event.
+
+        Args:
+            code: One of the event codes.
+            payload: The values of the event.
+        """
+        pass
+
+    def __deepcopy__(self, memo: dict):
+        """
+        Copies of a game report to the same place as the original.
+        """
+        return self
+
+# Shared sink of the headless games
+NULL_SINK: EventSink = EventSink()
+
+# EventBus class with its respective methods and properties
+class EventBus(EventSink):
+    """
+    A class to represent an EventBus, an EventSink that hands every event to its subscribers.
+
+    Attributes:
+        subscribers: List of the functions called with every Event.
+    """
+    def __init__(self, subscribers: list = ()) -> None:
+        self.subscribers: list = list(subscribers)
+
+    def subscribe(self, subscriber) -> None:
+        """
+        Adds a function to call with every Event.
+        """
+        self.subscribers.append(subscriber)
+
+    def emit(self, code: str, **payload) -> None:
+        event: Event = Event(code, payload)
+        for subscriber in self.subscribers:
+            subscriber(event)
+
+def describe(event: Event) -> str:
+    """
+    Returns the text the terminal shows for an event.
+
+    Args:
+        event: The Event to describe.
+
+    Returns:
+        The message of the event.
+    """
+    values: dict = {}
+    for name, value in event.payload.items():
+        if isinstance(value, (tuple, list)):
+            # Pairs are shown as 'name = value'
+            value = ''.join(
+                f'{item[0]} = {item[1]}, ' if isinstance(item, tuple) else f'{item}, ' for item in value
+            )
+        values[name] = value
+    return MESSAGES[event.code].format(**values)
+
+def print_event(event: Event) -> None:
+    """
+    Terminal subscriber, prints the message of every event.
+    """
+    print(describe(event))
+
+# Sink of the games played at the terminal
+TERMINAL: EventBus = EventBus([print_event])
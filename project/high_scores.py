@@ -1,47 +1,693 @@
+import atexit
+import queue
 import sqlite3
-from sqlite3 import Cursor, Connection
+import threading
+import time
+from sqlite3 import Connection
+from typing import NamedTuple
 
-def high_scores() -> list:
+# Database file of the high scores, relative to the working directory
+DATABASE: str = 'high_scores.db'
+
+# Most games committed in a single transaction
+BATCH_SIZE: int = 512
+
+# Seconds the writer waits for more games before committing the ones it has
+FLUSH_INTERVAL: float = 0.05
+
+# Number of rows of a page of the leaderboard queries, and of the high scores shown before a game
+PAGE_SIZE: int = 20
+HIGH_SCORES_SHOWN: int = 10
+
+# Format of the dates stored in the database
+DATE_FORMAT: str = '%Y-%m-%d %H:%M:%S'
+
+# Schema changes, the statements of migration n take a database from version n to version n + 1. The version is kept
+# in the user_version of the database, so every migration runs once per database file.
+MIGRATIONS: tuple = (
+    (
+        '''CREATE TABLE IF NOT EXISTS high_scores
+           (player_name text, victories integer, date text)''',
+        # Fill the table with some data, unless an older version of the game already did
+        '''INSERT INTO high_scores
+           SELECT * FROM (VALUES ('Antonio', 10, '2022-05-20 12:03:15'), ('Laura', 5, '2023-02-19 11:51:03'),
+                                 ('Ramiro', 6, '2023-02-19 10:12:06'))
+           WHERE NOT EXISTS (SELECT 1 FROM high_scores)''',
+    ),
+    (
+        # One row per game, the unit types of each player are joined by commas in assignment order
+        '''CREATE TABLE players
+           (id integer PRIMARY KEY, name text NOT NULL UNIQUE)''',
+        '''CREATE TABLE games
+           (id integer PRIMARY KEY, date text NOT NULL, crow integer NOT NULL REFERENCES players (id),
+            wolf integer NOT NULL REFERENCES players (id), winner integer REFERENCES players (id), crow_units text,
+            wolf_units text, turns integer NOT NULL, seconds real)''',
+        # Every index ends with the rowid, so (date, id) is the key of the recent games pages
+        'CREATE INDEX games_date ON games (date)',
+        'CREATE INDEX games_crow ON games (crow, date)',
+        'CREATE INDEX games_wolf ON games (wolf, date)',
+        # Totals of every player, kept up to date by the trigger so that no query has to scan the games
+        '''CREATE TABLE player_stats
+           (player integer PRIMARY KEY REFERENCES players (id), games integer NOT NULL, victories integer NOT NULL,
+            turns integer NOT NULL, last_game text, last_victory text)''',
+        'CREATE INDEX player_stats_victories ON player_stats (victories, player)',
+        'CREATE INDEX player_stats_last_victory ON player_stats (last_victory)',
+        '''CREATE TRIGGER games_player_stats AFTER INSERT ON games BEGIN
+               INSERT INTO player_stats
+               SELECT player, 1, NEW.winner IS player, NEW.turns, NEW.date,
+                      CASE WHEN NEW.winner IS player THEN NEW.date END
+               FROM (SELECT NEW.crow AS player UNION SELECT NEW.wolf)
+               WHERE true
+               ON CONFLICT (player) DO UPDATE SET
+                   games = games + 1, victories = victories + excluded.victories, turns = turns + excluded.turns,
+                   last_game = max(last_game, excluded.last_game),
+                   last_victory = coalesce(
+                       max(last_victory, excluded.last_victory), last_victory, excluded.last_victory
+                   );
+           END''',
+        # The victories of the old table become players without any recorded game details
+        'INSERT INTO players (name) SELECT DISTINCT player_name FROM high_scores',
+        '''INSERT INTO player_stats
+           SELECT players.id, sum(victories), sum(victories), 0, max(date), max(date)
+           FROM high_scores JOIN players ON players.name = high_scores.player_name
+           GROUP BY players.id''',
+        'DROP TABLE high_scores',
+        # Kept for the readers of the old table
+        '''CREATE VIEW high_scores AS
+           SELECT name AS player_name, victories, last_victory AS date
+           FROM player_stats JOIN players ON players.id = player_stats.player''',
+    ),
+)
+
+# Version of the schema this code works with
+SCHEMA_VERSION: int = len(MIGRATIONS)
+
+# Connections of each thread, following the structure {path: Connection} in the connections attribute, opened in the
+# generation of the generation attribute
+_local: threading.local = threading.local()
+
+# Number of calls to close_connections(), the connections a thread opened in an earlier generation are closed
+_generation: int = 0
+
+# Every Connection opened by get_connection(), to close them all at once
+_connections: list = []
+
+# Database files already migrated by this process
+_migrated: set = set()
+
+# Guards the module-level caches, which are shared by every thread
+_lock: threading.Lock = threading.Lock()
+
+def migrate(conn: Connection) -> int:
+    """
+    Brings the schema of a database up to SCHEMA_VERSION, running each missing migration in its own transaction.
+
+    Args:
+        conn: The Connection to the database.
+
+    Returns:
+        The number of migrations run.
+    """
+    applied: int = 0
+    while True:
+        # Checked again inside the transaction, another process may have migrated the database in the meantime
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            version: int = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                conn.rollback()
+                return applied
+            for statement in MIGRATIONS[version]:
+                conn.execute(statement)
+            # PRAGMA doesn't take parameters, the version is always an int
+            conn.execute(f'PRAGMA user_version = {version + 1}')
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        applied += 1
+
+def open_connection(path: str = DATABASE) -> Connection:
+    """
+    Opens a Connection to a high scores database in WAL mode, migrating its schema the first time this process opens
+    the file.
+
+    Args:
+        path: The database file.
+
+    Returns:
+        The new Connection.
+    """
+    # Only the thread that opened it uses it, but close_connections() can close it from any thread
+    conn: Connection = sqlite3.connect(path, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    # In WAL mode a commit is only lost on a power failure, not on a crash of the program
+    conn.execute('PRAGMA synchronous=NORMAL')
+    if path not in _migrated:
+        with _lock:
+            if path not in _migrated:
+                migrate(conn)
+                _migrated.add(path)
+    return conn
+
+def get_connection(path: str = DATABASE) -> Connection:
+    """
+    Returns the Connection of the current thread to a high scores database, opening it the first time it is requested
+    so that every later query skips the connection and schema setup.
+
+    Args:
+        path: The database file.
+
+    Returns:
+        The shared Connection class object of the thread.
+    """
+    connections: dict = getattr(_local, 'connections', None)
+    # Forget the connections close_connections() closed since the thread opened them
+    if connections is None or _local.generation != _generation:
+        connections = _local.connections = {}
+        _local.generation = _generation
+    conn: Connection = connections.get(path)
+    if conn is None:
+        conn = connections[path] = open_connection(path)
+        with _lock:
+            _connections.append(conn)
+    return conn
+
+def close_connections() -> None:
+    """
+    Closes every Connection opened by get_connection(), e.g: before the database file is deleted. Every thread, the
+    ScoreWriter and Leaderboard ones included, opens a new one the next time it needs it.
+    """
+    global _generation
+    with _lock:
+        for conn in _connections:
+            conn.close()
+        _connections.clear()
+        _migrated.clear()
+        _generation += 1
+
+# FinishedGame class with its respective properties
+class FinishedGame(NamedTuple):
+    """
+    A class to represent a FinishedGame, the result of a game as it is stored in the database.
+
+    Attributes:
+        date: The date the game finished, following DATE_FORMAT.
+        crow: The name of the CROW player.
+        wolf: The name of the WOLF player.
+        winner: The name of the winner, or None if the game was stopped without one.
+        crow_units: Tuple of the unit types assigned to CROW, e.g: ('Archer', 'Knight').
+        wolf_units: Tuple of the unit types assigned to WOLF.
+        turns: The number of turns played.
+        seconds: The seconds the game lasted, None if not measured.
+    """
+    date: str
+    crow: str
+    wolf: str
+    winner: str
+    crow_units: tuple
+    wolf_units: tuple
+    turns: int
+    seconds: float = None
+
+# GameRow class with its respective properties
+class GameRow(NamedTuple):
+    """
+    A class to represent a GameRow, a game read back from the database.
+
+    Attributes:
+        id: The id of the game, increasing in the order the games were written.
+        date: The date the game finished.
+        crow: The name of the CROW player.
+        wolf: The name of the WOLF player.
+        winner: The name of the winner, or None.
+        crow_units: The unit types assigned to CROW, joined by commas.
+        wolf_units: The unit types assigned to WOLF, joined by commas.
+        turns: The number of turns played.
+        seconds: The seconds the game lasted, or None.
+    """
+    id: int
+    date: str
+    crow: str
+    wolf: str
+    winner: str
+    crow_units: str
+    wolf_units: str
+    turns: int
+    seconds: float
+
+# PlayerRow class with its respective properties
+class PlayerRow(NamedTuple):
+    """
+    A class to represent a PlayerRow, the totals of a player.
+
+    Attributes:
+        name: The name of the player.
+        games: The number of games played.
+        victories: The number of games won.
+        turns: The number of turns played over all the games.
+        last_game: The date of the last game played.
+        last_victory: The date of the last game won, or None.
+    """
+    name: str
+    games: int
+    victories: int
+    turns: int
+    last_game: str
+    last_victory: str
+
+# Page class with its respective properties
+class Page(NamedTuple):
+    """
+    A class to represent a Page of the results of a leaderboard query.
+
+    Attributes:
+        rows: List of the rows of the page.
+        next: The key to pass to the query to get the following page, None if this is the last one.
+    """
+    rows: list
+    next: tuple
+
+# Columns of a GameRow, from the games table g and the players tables c, w and v of the crow, wolf and winner
+GAME_COLUMNS: str = (
+    'SELECT g.id, g.date, c.name, w.name, v.name, g.crow_units, g.wolf_units, g.turns, g.seconds FROM games g '
+    'JOIN players c ON c.id = g.crow JOIN players w ON w.id = g.wolf LEFT JOIN players v ON v.id = g.winner'
+)
+
+# Columns of a PlayerRow, from the player_stats table s
+PLAYER_COLUMNS: str = (
+    'SELECT p.name, s.games, s.victories, s.turns, s.last_game, s.last_victory, s.player '
+    'FROM player_stats s JOIN players p ON p.id = s.player'
+)
+
+# Select the high scores ordered by most recent victories
+HIGH_SCORES_QUERY: str = (
+    'SELECT p.name, s.victories, s.last_victory FROM player_stats s JOIN players p ON p.id = s.player '
+    'WHERE s.last_victory IS NOT NULL ORDER BY s.last_victory DESC LIMIT ?'
+)
+
+def high_scores(path: str = DATABASE, limit: int = HIGH_SCORES_SHOWN) -> list:
     """
     Returns the high scores obtained from the database, ordered by the most recent first.
+
+    Args:
+        path: The database file.
+        limit: The number of players returned.
+
+    Returns:
+        List of (player_name, victories, date of the last victory) tuples.
     """
-    # Connect to the database
-    conn: Connection = sqlite3.connect('high_scores.db')
+    return get_connection(path).execute(HIGH_SCORES_QUERY, (limit,)).fetchall()
 
-    # Cursor to execute SQL commands
-    cursor: Cursor = conn.cursor()
+def recent_games(path: str = DATABASE, limit: int = PAGE_SIZE, before: tuple = None) -> Page:
+    """
+    Returns a page of the games, the most recent first. The pages are found by key instead of by offset, so every page
+    is read straight from the date index however deep it is.
 
-    # Create high_scores table if it doesn't exist yet
-    cursor.execute('''CREATE TABLE IF NOT EXISTS high_scores
-                    (player_name text, victories integer, date text)''')
+    Args:
+        path: The database file.
+        limit: The number of games of the page.
+        before: The next key of the previous page, None for the first page.
 
-    # Check if the table is empty
-    cursor.execute("SELECT COUNT(*) FROM high_scores")
-    table_count = cursor.fetchone()[0]
+    Returns:
+        The Page of GameRow class objects.
+    """
+    if before is None:
+        rows: list = get_connection(path).execute(
+            f'{GAME_COLUMNS} ORDER BY g.date DESC, g.id DESC LIMIT ?', (limit,)
+        ).fetchall()
+    else:
+        rows = get_connection(path).execute(
+            f'{GAME_COLUMNS} WHERE (g.date, g.id) < (?, ?) ORDER BY g.date DESC, g.id DESC LIMIT ?', (*before, limit)
+        ).fetchall()
+    games: list = [GameRow(*row) for row in rows]
+    return Page(games, (games[-1].date, games[-1].id) if len(games) == limit else None)
 
-    if table_count == 0:
-        # Fill the table with some data
-        cursor.execute("INSERT INTO high_scores VALUES ('Antonio', 10, '2022-05-20 12:03:15')")
-        cursor.execute("INSERT INTO high_scores VALUES ('Laura', 5, '2023-02-19 11:51:03')")
-        cursor.execute("INSERT INTO high_scores VALUES ('Ramiro', 6, '2023-02-19 10:12:06')")
+def player_games(name: str, path: str = DATABASE, limit: int = PAGE_SIZE, before: tuple = None) -> Page:
+    """
+    Returns a page of the games of a player, the most recent first, see recent_games(). The games as CROW and as WOLF
+    are each read from their own index and merged.
 
-        # Commit the changes to the database
-        conn.commit()
+    Args:
+        name: The name of the player.
+        path: The database file.
+        limit: The number of games of the page.
+        before: The next key of the previous page, None for the first page.
 
-    # Select the high scores ordered by most recent victories
-    cursor.execute("SELECT player_name, victories, date FROM high_scores ORDER BY date DESC")
+    Returns:
+        The Page of GameRow class objects.
+    """
+    conn: Connection = get_connection(path)
+    player: tuple = conn.execute('SELECT id FROM players WHERE name = ?', (name,)).fetchone()
+    if player is None:
+        return Page([], None)
+    # A key after every game, so that the first page is read by the same query
+    date, game = before if before is not None else ('~', 1 << 62)
+    side: str = (
+        'SELECT * FROM (SELECT id FROM games WHERE {seat} = :player AND (date, id) < (:date, :game) '
+        'ORDER BY date DESC, id DESC LIMIT :limit)'
+    )
+    rows: list = conn.execute(
+        f'{GAME_COLUMNS} WHERE g.id IN ({side.format(seat="crow")} UNION ALL {side.format(seat="wolf")}) '
+        'ORDER BY g.date DESC, g.id DESC LIMIT :limit',
+        {'player': player[0], 'date': date, 'game': game, 'limit': limit}
+    ).fetchall()
+    games: list = [GameRow(*row) for row in rows]
+    return Page(games, (games[-1].date, games[-1].id) if len(games) == limit else None)
+
+def top_players(path: str = DATABASE, limit: int = PAGE_SIZE, after: tuple = None) -> Page:
+    """
+    Returns a page of the players with the most victories, read by key from the index of the per-player totals.
+
+    Args:
+        path: The database file.
+        limit: The number of players of the page.
+        after: The next key of the previous page, None for the first page.
+
+    Returns:
+        The Page of PlayerRow class objects, ties ordered by the most recent player first.
+    """
+    if after is None:
+        rows: list = get_connection(path).execute(
+            f'{PLAYER_COLUMNS} ORDER BY s.victories DESC, s.player DESC LIMIT ?', (limit,)
+        ).fetchall()
+    else:
+        rows = get_connection(path).execute(
+            f'{PLAYER_COLUMNS} WHERE (s.victories, s.player) < (?, ?) ORDER BY s.victories DESC, s.player DESC '
+            'LIMIT ?', (*after, limit)
+        ).fetchall()
+    players: list = [PlayerRow(*row[:-1]) for row in rows]
+    return Page(players, (rows[-1][2], rows[-1][-1]) if len(rows) == limit else None)
+
+def player_stats(name: str, path: str = DATABASE) -> PlayerRow:
+    """
+    Returns the totals of a player.
+
+    Args:
+        name: The name of the player.
+        path: The database file.
 
-    # Fetch all the results
-    results: list = cursor.fetchall()
+    Returns:
+        The PlayerRow of the player, None if the player has no games.
+    """
+    row: tuple = get_connection(path).execute(f'{PLAYER_COLUMNS} WHERE p.name = ?', (name,)).fetchone()
+    return PlayerRow(*row[:-1]) if row is not None else None
 
-    # Close the database connection
-    conn.close()
+# ScoreWriter class with its respective methods and properties
+class ScoreWriter:
+    """
+    A class to represent a ScoreWriter, it records finished games without the caller ever waiting for the disk.
+    submit() only puts the game in a queue, and a background thread with its own long-lived connection commits the
+    queued games in batches: it waits for a first game, then takes every game that arrives within the flush interval (up
+    to the batch size) and writes them in a single transaction.
+
+    The database is put in WAL mode, so the readers of the leaderboard aren't blocked while a batch is written. The
+    games of a batch are inserted with one parameterized statement through executemany(), which sqlite3 prepares once
+    and reuses for every row, and the totals of the players are kept up to date by the trigger of the games table.
+
+    Attributes:
+        path: The database file.
+        batch_size: The most games committed in a single transaction.
+        flush_interval: The seconds the writer waits for more games before committing.
+        queue: The queue.Queue of FinishedGame class objects waiting to be written.
+        written: The number of games committed.
+        batches: The number of transactions committed.
+        error: The last sqlite3.Error raised while writing, the games of that batch are dropped.
+        player_ids: Dictionary following the structure {player name: id in the players table}.
+        conn: The Connection the player ids were read through, None until the first batch.
+        thread: The background threading.Thread that writes the games.
+    """
+    def __init__(
+        self, path: str = DATABASE, batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL
+    ) -> None:
+        self.path: str = path
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.queue: queue.Queue = queue.Queue()
+        self.written: int = 0
+        self.batches: int = 0
+        self.error: sqlite3.Error = None
+        self.player_ids: dict = {}
+        self.conn: Connection = None
+        self.thread: threading.Thread = threading.Thread(target=self.run, name='ScoreWriter', daemon=True)
+        self.thread.start()
+
+    def submit(self, game: FinishedGame) -> None:
+        """
+        Queues a finished game to be written, it never waits for the database.
+
+        Args:
+            game: The FinishedGame, its date can be None for the current time.
+        """
+        if game.date is None:
+            game = game._replace(date=time.strftime(DATE_FORMAT))
+        self.queue.put(game)
+
+    def flush(self) -> None:
+        """
+        Waits until every game submitted so far has been committed.
+        """
+        self.queue.join()
+
+    def close(self) -> None:
+        """
+        Commits the games still queued and stops the background thread.
+        """
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+    def run(self) -> None:
+        """
+        Body of the background thread, commits the queued games in batches until close() is called.
+        """
+        stopping: bool = False
+        while not stopping:
+            batch: list = []
+            game: FinishedGame = self.queue.get()
+            deadline: float = time.perf_counter() + self.flush_interval
+            while True:
+                # None tells the thread to stop after writing the games before it
+                if game is None:
+                    stopping = True
+                    break
+                batch.append(game)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    game = self.queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+            if batch:
+                self.write(batch)
+            for _ in range(len(batch) + stopping):
+                self.queue.task_done()
+
+    def ids(self, conn: Connection, names) -> dict:
+        """
+        Returns the ids of the given players, adding the ones not in the players table yet. Must be called inside the
+        transaction of the batch.
+
+        Args:
+            conn: The Connection of the background thread.
+            names: Iterable of player names.
+
+        Returns:
+            Dictionary following the structure {player name: id}.
+        """
+        missing: list = [name for name in names if name not in self.player_ids]
+        if missing:
+            conn.executemany('INSERT OR IGNORE INTO players (name) VALUES (?)', [(name,) for name in missing])
+            for name in missing:
+                self.player_ids[name] = conn.execute('SELECT id FROM players WHERE name = ?', (name,)).fetchone()[0]
+        return self.player_ids
+
+    def write(self, batch: list) -> None:
+        """
+        Commits a batch of games in a single transaction, through the connection of the background thread.
+
+        Args:
+            batch: List of FinishedGame class objects.
+        """
+        try:
+            conn: Connection = get_connection(self.path)
+            # A new connection may be to a new database file, e.g: after close_connections()
+            if conn is not self.conn:
+                self.conn = conn
+                self.player_ids.clear()
+            with conn:
+                # New players get their ids in the order they first appear
+                names: dict = dict.fromkeys(name for game in batch for name in (game.crow, game.wolf) if name)
+                ids: dict = self.ids(conn, names)
+                conn.executemany(
+                    'INSERT INTO games (date, crow, wolf, winner, crow_units, wolf_units, turns, seconds) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    [
+                        (
+                            game.date, ids[game.crow], ids[game.wolf], ids.get(game.winner), ','.join(game.crow_units),
+                            ','.join(game.wolf_units), game.turns, game.seconds
+                        )
+                        for game in batch
+                    ]
+                )
+        except sqlite3.Error as error:
+            # The ids of a rolled back batch may not exist, the games are dropped so that flush() and close() don't
+            # wait forever
+            self.player_ids.clear()
+            self.error = error
+            return
+        self.written += len(batch)
+        self.batches += 1
+        invalidate_leaderboard(self.path)
+
+# Writers already started for each database file
+_score_writers: dict = {}
+
+def get_score_writer(path: str = DATABASE) -> ScoreWriter:
+    """
+    Returns the ScoreWriter of a database file, starting it the first time it is requested. It is closed when the
+    program exits, so the games still queued are committed.
 
-    return results
+    Args:
+        path: The database file.
+
+    Returns:
+        The shared ScoreWriter class object.
+    """
+    with _lock:
+        writer: ScoreWriter = _score_writers.get(path)
+        if writer is None:
+            writer = _score_writers[path] = ScoreWriter(path)
+            atexit.register(writer.close)
+    return writer
+
+def record_game(game: FinishedGame, path: str = DATABASE) -> None:
+    """
+    Queues a finished game in the results, see ScoreWriter.submit().
+
+    Args:
+        game: The FinishedGame to record.
+        path: The database file.
+    """
+    get_score_writer(path).submit(game)
+
+# Leaderboard class with its respective methods and properties
+class Leaderboard:
+    """
+    A class to represent a Leaderboard, the high scores of a database kept in memory so that showing them never waits
+    for the database. A background thread with its own connection loads them as soon as the Leaderboard is created,
+    and loads them again only when the ScoreWriter commits new games, see invalidate_leaderboard().
+
+    Attributes:
+        path: The database file.
+        limit: The number of players kept.
+        rows: List of (player_name, victories, date) tuples as returned by high_scores(), None until the first load.
+        version: The number of loads finished.
+        error: The last sqlite3.Error raised while loading, the previous rows are kept.
+        changed: The threading.Condition notified after every load.
+        requested: The threading.Event set when the rows have to be loaded again.
+        stopping: Whether close() was called.
+        thread: The background threading.Thread that loads the rows.
+    """
+    def __init__(self, path: str = DATABASE, limit: int = HIGH_SCORES_SHOWN) -> None:
+        self.path: str = path
+        self.limit: int = limit
+        self.rows: list = None
+        self.version: int = 0
+        self.error: sqlite3.Error = None
+        self.changed: threading.Condition = threading.Condition()
+        self.requested: threading.Event = threading.Event()
+        self.stopping: bool = False
+        # The first load starts right away
+        self.requested.set()
+        self.thread: threading.Thread = threading.Thread(target=self.run, name='Leaderboard', daemon=True)
+        self.thread.start()
+
+    def get(self, timeout: float = 0.0) -> list:
+        """
+        Returns the latest rows loaded.
+
+        Args:
+            timeout: The seconds to wait for the first load, 0 to return right away.
+
+        Returns:
+            List of (player_name, victories, date) tuples, None if they haven't been loaded yet.
+        """
+        with self.changed:
+            self.changed.wait_for(lambda: self.version, timeout)
+            return self.rows
+
+    def invalidate(self) -> None:
+        """
+        Asks the background thread to load the rows again, the requests made while it loads are served by one load.
+        """
+        self.requested.set()
+
+    def close(self) -> None:
+        """
+        Stops the background thread.
+        """
+        self.stopping = True
+        self.requested.set()
+        self.thread.join()
+
+    def run(self) -> None:
+        """
+        Body of the background thread, loads the rows every time they are invalidated until close() is called.
+        """
+        while True:
+            self.requested.wait()
+            self.requested.clear()
+            if self.stopping:
+                break
+            rows: list = None
+            try:
+                rows = get_connection(self.path).execute(HIGH_SCORES_QUERY, (self.limit,)).fetchall()
+            except sqlite3.Error as error:
+                self.error = error
+            with self.changed:
+                if rows is not None:
+                    self.rows = rows
+                # Also counted when it fails, so get() doesn't wait for a database that can't be read
+                self.version += 1
+                self.changed.notify_all()
+
+# Leaderboards already started for each database file
+_leaderboards: dict = {}
+
+def get_leaderboard(path: str = DATABASE) -> Leaderboard:
+    """
+    Returns the Leaderboard of a database file, starting to load it the first time it is requested, e.g: when the
+    program starts.
+
+    Args:
+        path: The database file.
+
+    Returns:
+        The shared Leaderboard class object.
+    """
+    with _lock:
+        leaderboard: Leaderboard = _leaderboards.get(path)
+        if leaderboard is None:
+            leaderboard = _leaderboards[path] = Leaderboard(path)
+            atexit.register(leaderboard.close)
+    return leaderboard
+
+def invalidate_leaderboard(path: str = DATABASE) -> None:
+    """
+    Loads the Leaderboard of a database file again after new games were committed to it. Nothing is loaded if no
+    Leaderboard was requested for the file, e.g: in a simulation.
+
+    Args:
+        path: The database file.
+    """
+    leaderboard: Leaderboard = _leaderboards.get(path)
+    if leaderboard is not None:
+        leaderboard.invalidate()
 
 if __name__ == "__main__":
     """
     Standard python boilerplate.
     """
     # This is executed when run from the command line:
-    high_scores()
\ No newline at end of file
+    high_scores()
@@ -1,14 +1,23 @@
+import os
 import random 
+import time
 
+from action import Action, Result, ACTION_KINDS, ATTACK, INITIATIVE, MOVE, RECRUIT
+from agent import Agent, AlphaBetaAgent, ExpectimaxAgent
+from mcts import MCTSAgent
 from board import Board
-from player import Player
+from config import BOARDS, BoardConfig
+from player import Player, assign_unit
 from cell import Archer, Knight, Mercenary, Berserker, Unit, Royal
-from high_scores import high_scores
+from events import INVALID_ACTION, INVALID_COORDINATE
+from high_scores import FinishedGame, get_leaderboard, record_game
 
 def main():
     """
     Main entry point of the app, gives the user the option to start the game.
     """
+    # Load the high scores in the background while the user answers
+    get_leaderboard()
     start_game = str(input('Start game? (y/n): '))
     if start_game == 'y':
         # Start the game
@@ -37,35 +46,27 @@ def generate_unit_coin(unit: str, player: Player) -> Player:
         case 'Berserker':
             return Berserker(player)
 
-def initialize_player(player: Player, units: list[Unit]) -> Player:
+def initialize_player(player: Player, units: list[Unit], rng: random.Random = None) -> Player:
     """
     Initializes a Player class object along with its relevant attributes: bag, assigned units etc.
 
     Args:
         player: The player class object defining the current player.
         units: A list of Unit class objects containing the units which are used to assign a certain number to the player.
+        rng: Optional random.Random generator used to assign the units, the global one of the random module by default.
 
     Returns:
         The Player class object with its initialized properties. 
     """
+    if rng is None:
+        rng = random
     # Repeat until we have assigned two units to the player
     for _ in range(2):
         # Generate the random number
-        random_no: int = random.randint(0, len(units) - 1)
+        random_no: int = rng.randint(0, len(units) - 1)
         # Get the unit and no_of_units assigned to it
         unit, no_of_units = units[random_no][0], units[random_no][1]
-        # Create two unit coins
-        unit_coin_one, unit_coin_two = generate_unit_coin(unit, player), generate_unit_coin(unit, player)
-
-        # The assigned units dictionary follows the structure '{ unit_type: [stack of class Units] }'
-        player.assigned_units[unit] = []
-        # Create the stack of unit coins (remembering to remove two units we inserted in the player bag)
-        for _ in range(no_of_units - 2):
-            player.assigned_units[unit].append(generate_unit_coin(unit, player))
-
-        # Place the two units in the bag
-        player.bag.append(unit_coin_one)
-        player.bag.append(unit_coin_two)
+        assign_unit(player, unit, no_of_units)
         # Remove them from the pool of available units
         del units[random_no]
     
@@ -94,17 +95,29 @@ def show_player_information(player: Player) -> bool:
     
     return True
 
-def prompt_player_actions(board: Board, player: Player) -> bool:
+def prompt_player_actions(board: Board, player: Player, agent: Agent = None) -> bool:
     """
     Defines the logic of how the game is played, involving the relevant actions until the player hand is empty.
 
     Args:
         board: The Board class object, containing the grid with the unit coins.
         player: The Player class object defining the current player.
+        agent: Optional Agent class object that picks the actions instead of the user.
 
     Returns:
         True if the user has forfeited, False if it is not the case and so the game can go on.
     """
+    if agent is not None:
+        # The agent always plays out its whole hand
+        while player.hand:
+            action = agent.choose_action(board, player)
+            result: Result = board.apply_action(player, action)
+            # The hand would never empty, the agent has to pick one of the legal actions
+            if not result:
+                raise RuntimeError(f'{type(agent).__name__} chose a rejected action {action}: {result.message}')
+            print(f'{player.name} plays {describe_action(board, action)}, {agent.report()}')
+        return False
+
     # Prompt the user to choose three actions
     for _ in range(3):
         forfeit = board.choose_action(player)
@@ -112,7 +125,101 @@ def prompt_player_actions(board: Board, player: Player) -> bool:
             return True
         
     return False
-        
+
+def describe_action(board: Board, action) -> str:
+    """
+    Returns an Action written the way the user would type it, e.g: 'move Knight a,1 -> b,1'.
+
+    Args:
+        board: The Board class object, containing the grid with the unit coins.
+        action: The Action to describe.
+
+    Returns:
+        The description of the action.
+    """
+    # Translate the rows back to the letters the user types
+    num_to_letter: dict = {num: letter for letter, num in board.letter_to_num.items()}
+    description: str = f'{action.kind} {action.piece}'
+    if action.recruit is not None:
+        description += f' -> {action.recruit}'
+    if action.start is not None:
+        description += f' {num_to_letter[action.start[0]]},{action.start[1]} ->'
+    for coordinate in (action.end,) + action.extra_targets:
+        if coordinate is not None:
+            description += f' {num_to_letter[coordinate[0]]},{coordinate[1]}'
+    return description
+
+def parse_action(board: Board, text: str) -> Action:
+    """
+    Reads an Action written the way describe_action() writes it, e.g: 'move Knight a,1 -> b,1' or
+    'recruit Knight -> Archer'. Like the interactive actions, the text is only checked to be well formed and within the
+    board, the rules are checked when the action is applied.
+
+    Args:
+        board: The Board class object the action is played on.
+        text: The action typed by the user.
+
+    Returns:
+        The Action, or None if the text isn't one (the reason is reported to the events of the board).
+    """
+    words: list = text.replace('->', ' -> ').split()
+    if len(words) < 2 or words[0].lower() not in ACTION_KINDS:
+        board.events.emit(INVALID_ACTION)
+        return None
+    kind, piece, rest = words[0].lower(), words[1], words[2:]
+    if kind == RECRUIT:
+        if len(rest) != 2 or rest[0] != '->':
+            board.events.emit(INVALID_ACTION)
+            return None
+        return Action(RECRUIT, piece, recruit=rest[1])
+
+    # Moves and attacks start from a unit, the other actions only name squares
+    has_start: bool = kind in (MOVE, ATTACK)
+    if has_start and (len(rest) < 3 or rest[1] != '->'):
+        board.events.emit(INVALID_ACTION)
+        return None
+    positions: list = [rest[0]] + rest[2:] if has_start else rest
+    # Moves take one target, attacks up to the attacks of any unit, place and control one square and initiative none
+    targets: int = len(positions) - has_start
+    if kind == INITIATIVE and targets or kind != INITIATIVE and not 1 <= targets <= (2 if kind == ATTACK else 1):
+        board.events.emit(INVALID_ACTION)
+        return None
+    for position in positions:
+        # valid_board_position() expects a single comma
+        if position.count(',') != 1:
+            board.events.emit(INVALID_COORDINATE)
+            return None
+        if not board.valid_board_position(position):
+            return None
+    coordinates: list = [board.translate_to_coordinate(position) for position in positions]
+    start: tuple = coordinates.pop(0) if has_start else None
+    return Action(
+        kind, piece, start, coordinates[0] if coordinates else None, extra_targets=tuple(coordinates[1:])
+    )
+
+def choose_agent(player: Player):
+    """
+    Asks who controls a player, the user at the keyboard or the computer.
+
+    Args:
+        player: The Player class object to ask about.
+
+    Returns:
+        An AlphaBetaAgent class object if the computer plays (an ExpectimaxAgent if it also weighs every hand the
+        players can draw, or an MCTSAgent searching a tree on every core), None if the user does.
+    """
+    while True:
+        controller: str = str(input(f'Who plays {player.name}? (human/ai/expectimax/mcts): '))
+        if controller == 'human':
+            return None
+        if controller == 'ai':
+            return AlphaBetaAgent()
+        if controller == 'expectimax':
+            return ExpectimaxAgent()
+        if controller == 'mcts':
+            return MCTSAgent(workers=os.cpu_count())
+        print('Please type human, ai, expectimax or mcts')
+
 def swap_turns(curr_player: Player, player1: Player, player2: Player) -> Player:
     """
     Returns the current player by swapping turns based on the previous current player.
@@ -137,60 +244,109 @@ def swap_turns(curr_player: Player, player1: Player, player2: Player) -> Player:
     
     return curr_player
 
-def get_high_scores() -> None:
+def get_high_scores(timeout: float = 0.0) -> bool:
     """
-    Prints the high scores obtained from the database, ordered by the most recent first.
+    Prints the latest high scores, ordered by the most recent first, if the background thread has loaded them.
+
+    Args:
+        timeout: The seconds to wait for them, 0 to never wait for the database.
+
+    Returns:
+        True if they were printed, False if they aren't loaded yet.
     """
-    results: list = high_scores()
+    results: list = get_leaderboard().get(timeout)
+    if results is None:
+        return False
     
     # Print the results
     print("High scores:")
     for row in results:
         print(f"{row[0]} - {row[1]} victories on {row[2]}")
+    return True
+
+
+def choose_board() -> BoardConfig:
+    """
+    Asks which of the boards to play on.
 
+    Returns:
+        The BoardConfig class object of the chosen board.
+    """
+    while True:
+        size: str = str(input(f'Board size? ({"/".join(BOARDS)}): '))
+        if size in BOARDS:
+            return BOARDS[size]
+        print(f'Please type one of {", ".join(BOARDS)}')
 
-def play_game() -> None:
+def play_game(rng: random.Random = None, config: BoardConfig = None) -> None:
     """
     Contains the logic which initializes the units, players, board and allows the players to keep playing until there
     is a winner.
+
+    Args:
+        rng: Optional random.Random generator used for the unit assignment, the draws and the starting player, the
+            global one of the random module by default.
+        config: Optional BoardConfig class object of the board, the user chooses it if it is None.
     """
-    # Show high scores
-    get_high_scores()
+    # Show high scores now if they are loaded already, or else before the first board render after they are
+    scores_shown: bool = get_high_scores()
 
     # Initialize the list of units where the tuple represents (type of unit, the no. of units corresponding to it)
     units: list[tuple]= [('Archer', 4), ('Knight', 5), ('Mercenary', 5), ('Berserker', 4)]
     # Initialize players
-    crow: Player = initialize_player(Player('CROW', 's'), units)
-    wolf: Player = initialize_player(Player('WOLF', 'v'), units)
+    crow: Player = initialize_player(Player('CROW', 's', rng), units, rng)
+    wolf: Player = initialize_player(Player('WOLF', 'v', rng), units, rng)
+    # Unit types of each player, in assignment order
+    crow_units: tuple = tuple(crow.assigned_units)
+    wolf_units: tuple = tuple(wolf.assigned_units)
     # Initialize board
-    board: Board = Board(crow, wolf)
+    board: Board = Board(crow, wolf, config if config is not None else choose_board())
+    # Each player is controlled by the user or by an agent
+    agents: dict = {crow: choose_agent(crow), wolf: choose_agent(wolf)}
     # Set random starting player
-    curr_player: Player = crow if random.randint(0, 1) == 0 else wolf
+    curr_player: Player = crow if (rng if rng is not None else random).randint(0, 1) == 0 else wolf
 
     # Stop the game when there is a winning condition
     game_ended: bool = False
+    turns: int = 0
+    start: float = time.perf_counter()
     
-    while not game_ended:
-        # Show board
-        board.print_board()
-
-        # Decide player turn
-        curr_player = swap_turns(curr_player, crow, wolf)
+    try:
+        while not game_ended:
+            if not scores_shown:
+                scores_shown = get_high_scores()
+            # Show board
+            board.print_board()
 
-        # Show player information (hand, recruitment pieces, discard pile & control tokens)
-        # If the method returns False that means the curr_player couldn't create a hand
-        # or the player forfeited, therefore ending the game
-        if not show_player_information(curr_player) or prompt_player_actions(board, curr_player):
-            # Swap the curr_player to the previous player since that is the winner
-            curr_player = wolf if curr_player == crow else crow
-            break
+            # Decide player turn
+            curr_player = swap_turns(curr_player, crow, wolf)
+            turns += 1
 
-        # If the player control tokens have reached 0, we have a winner
-        if curr_player.control_tokens == 0:
-            game_ended = True
+            # Show player information (hand, recruitment pieces, discard pile & control tokens)
+            # If the method returns False that means the curr_player couldn't create a hand
+            # or the player forfeited, therefore ending the game
+            if (
+                not show_player_information(curr_player)
+                or prompt_player_actions(board, curr_player, agents[curr_player])
+            ):
+                # Swap the curr_player to the previous player since that is the winner
+                curr_player = wolf if curr_player == crow else crow
+                break
 
+            # If the player control tokens have reached 0, we have a winner
+            if curr_player.control_tokens == 0:
+                game_ended = True
+    finally:
+        # The MCTS agents keep their worker processes until they are closed
+        for agent in agents.values():
+            if agent is not None:
+                agent.close()
 
     print(f'\nThe winner of the game is {curr_player.name}!\n')
+    # Written by a background thread, the game doesn't wait for the database
+    record_game(FinishedGame(
+        None, crow.name, wolf.name, curr_player.name, crow_units, wolf_units, turns, time.perf_counter() - start
+    ))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,306 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from action import Action
+from agent import Agent, TurnClock
+from board import Board
+from events import NULL_SINK
+from player import Player
+from snapshot import from_bytes, to_bytes
+
+# Weight of the exploration term of UCT
+EXPLORATION: float = 1.4
+
+# Node class with its respective properties
+class Node:
+    """
+    A class to represent a Node of the search tree of an MCTSAgent, reached by playing an action. Its children are
+    kept by action, whatever coins were drawn on the way, so every determinization of the draws shares the same tree.
+
+    Attributes:
+        seat: The seat of the player that played the action leading to the node.
+        visits: The number of playouts through the node.
+        wins: The sum of the results of those playouts for that player, 1 for a win and 0.5 for an unfinished game.
+        children: Dictionary following the structure {Action: Node}
+    """
+    __slots__ = ('seat', 'visits', 'wins', 'children')
+
+    def __init__(self, seat: int) -> None:
+        self.seat: int = seat
+        self.visits: int = 0
+        self.wins: float = 0.0
+        self.children: dict = {}
+
+# Tree class with its respective methods and properties
+class Tree:
+    """
+    A class to represent a Tree, a single UCT search from one position. Every playout determinizes the coins drawn at
+    the start of each turn with its own random draws, selects actions by UCT among the ones legal in that
+    determinization, expands one new action and plays random actions until the game ends.
+
+    The board is changed with push() and restored with pop() after every playout, so a playout only allocates the new
+    node and the undo records; the random playout reuses a single list for the legal actions.
+
+    Attributes:
+        board: The Board class object searched, left as it was after every playout.
+        player: The Player class object of the player that has to act.
+        rng: The random.Random generator of the draws and the random actions.
+        rollout_turns: The number of turns a random playout can last before it counts as unfinished.
+        root: The Node class object of the current position.
+        playouts: The number of playouts done.
+    """
+    def __init__(self, board: Board, player: Player, seed: int = None, rollout_turns: int = 60) -> None:
+        self.board: Board = board
+        self.player: Player = player
+        self.rng: random.Random = random.Random(seed)
+        self.rollout_turns: int = rollout_turns
+        self.root: Node = Node(1 - board.seats[player])
+        self.playouts: int = 0
+        self._actions: list = []
+
+    def run(self, seconds: float = math.inf, playouts: int = None) -> dict:
+        """
+        Runs playouts until the time or the number of playouts runs out.
+
+        Args:
+            seconds: The wall-clock seconds the search can take.
+            playouts: Optional number of playouts, which unlike the time gives the same tree on every machine.
+
+        Returns:
+            Dictionary following the structure {Action: visits} of the actions of the position.
+        """
+        deadline: float = time.perf_counter() + seconds
+        limit: float = playouts if playouts is not None else math.inf
+        while self.playouts < limit and (self.playouts == 0 or time.perf_counter() < deadline):
+            self.playout()
+        return {action: child.visits for action, child in self.root.children.items()}
+
+    def playout(self) -> None:
+        """
+        Runs a single playout from the root and adds its result to the nodes it went through.
+        """
+        board: Board = self.board
+        root: int = len(board.history)
+        seats: dict = board.seats
+        player: Player = self.player
+        node: Node = self.root
+        path: list = [node]
+
+        winner: Player = None
+        expanded: bool = False
+        while winner is None and not expanded:
+            if not player.hand:
+                player, winner = self.next_turn(player)
+                continue
+            actions: list = board.legal_actions(player)
+            unexplored: list = [action for action in actions if action not in node.children]
+            if unexplored:
+                action: Action = self.rng.choice(unexplored)
+                child: Node = Node(seats[player])
+                node.children[action] = child
+                expanded = True
+            else:
+                action, child = self.select(node, actions)
+            board.push(player, action)
+            node = child
+            path.append(node)
+            if player.control_tokens == 0:
+                winner = player
+
+        if winner is None:
+            winner = self.rollout(player)
+        for node in path:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif seats[winner] == node.seat:
+                node.wins += 1
+        while len(board.history) > root:
+            board.pop()
+        self.playouts += 1
+
+    def select(self, node: Node, actions: list) -> tuple:
+        """
+        Picks the child with the highest UCT value among the legal actions, which have all been explored.
+
+        Args:
+            node: The Node class object to select from.
+            actions: The legal actions of the position.
+
+        Returns:
+            Tuple containing the (Action, Node) selected.
+        """
+        log_visits: float = math.log(node.visits)
+        best: tuple = None
+        best_value: float = -math.inf
+        for action in actions:
+            child: Node = node.children[action]
+            value: float = child.wins / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best, best_value = (action, child), value
+        return best
+
+    def next_turn(self, player: Player) -> tuple:
+        """
+        Passes the turn once the hand of the player is empty and draws random coins for the next player.
+
+        Args:
+            player: The Player class object defining the player whose hand is empty.
+
+        Returns:
+            Tuple containing the (Player that acts next, winner or None if the game goes on).
+        """
+        board: Board = self.board
+        next_player: Player = board.push_end_turn(player)
+        if not board.push_draw(next_player, self.rng):
+            # A player that can't make a hand loses
+            return next_player, board.opponent(next_player)
+        return next_player, None
+
+    def rollout(self, player: Player) -> Player:
+        """
+        Plays uniformly random legal actions from the current position until the game ends.
+
+        Args:
+            player: The Player class object of the player that has to act.
+
+        Returns:
+            The Player class object of the winner, or None if the game didn't end within the rollout turns.
+        """
+        board: Board = self.board
+        actions: list = self._actions
+        choice = self.rng.choice
+        for _ in range(self.rollout_turns):
+            while player.hand:
+                board.push(player, choice(board.legal_actions(player, actions)))
+                if player.control_tokens == 0:
+                    return player
+            player, winner = self.next_turn(player)
+            if winner is not None:
+                return winner
+        return None
+
+def search_tree(board: Board, player: Player, seconds: float, playouts: int, seed: int, rollout_turns: int) -> tuple:
+    """
+    Searches a position with a Tree, the unit of work sent to each worker process.
+
+    Args:
+        board: The Board class object to search.
+        player: The Player class object of the player that has to act.
+        seconds: The wall-clock seconds the search can take.
+        playouts: Optional number of playouts.
+        seed: The seed of the Tree.
+        rollout_turns: The number of turns a random playout can last.
+
+    Returns:
+        Tuple containing the (dictionary following the structure {Action: visits}, number of playouts).
+    """
+    tree: Tree = Tree(board, player, seed, rollout_turns)
+    visits: dict = tree.run(seconds, playouts)
+    return visits, tree.playouts
+
+def search_state(state: bytes, seconds: float, playouts: int, seed: int, rollout_turns: int) -> tuple:
+    """
+    Searches a position sent to a worker process with snapshot.to_bytes(), which is much smaller and quicker to send
+    than the pickled Board class object. See search_tree().
+    """
+    board, player = from_bytes(state, NULL_SINK)
+    return search_tree(board, player, seconds, playouts, seed, rollout_turns)
+
+# MCTSAgent class with its respective methods and properties
+class MCTSAgent(Agent):
+    """
+    A class to represent an MCTSAgent, it searches the position with UCT and plays the most visited action. With more
+    than one worker it uses root parallelism: every worker process grows its own Tree from a different seed for the
+    whole budget, and the visits of the root actions of all the trees are added up at the end.
+
+    Attributes:
+        budget: The wall-clock seconds the agent can spend on a turn, split between the actions left in the hand.
+        workers: The number of trees searched at once, each in its own process when there is more than one.
+        max_playouts: Optional number of playouts of each tree per action, which unlike the time budget gives the same
+            action on every machine.
+        rollout_turns: The number of turns a random playout can last before it counts as unfinished.
+        rng: The random.Random generator of the seeds of the trees.
+        visits: Dictionary following the structure {Action: visits} of the last search, added up over the trees.
+        playouts: The number of playouts of the last search, added up over the trees.
+        elapsed: The seconds taken by the last search.
+        clock: The TurnClock class object sharing the budget of the turn between its actions.
+    """
+    def __init__(
+        self, budget: float = 3.0, workers: int = 1, max_playouts: int = None, rollout_turns: int = 60,
+        seed: int = None
+    ) -> None:
+        self.budget: float = budget
+        self.workers: int = workers or os.cpu_count()
+        self.max_playouts: int = max_playouts
+        self.rollout_turns: int = rollout_turns
+        self.rng: random.Random = random.Random(seed)
+        self.visits: dict = {}
+        self.playouts: int = 0
+        self.elapsed: float = 0.0
+        self.executor: ProcessPoolExecutor = None
+        self.clock: TurnClock = TurnClock()
+
+    @property
+    def playouts_per_second(self) -> float:
+        """
+        The playouts per second of the last search, over all the trees.
+        """
+        return self.playouts / self.elapsed if self.elapsed else 0.0
+
+    def report(self) -> str:
+        return (
+            f'{self.playouts:,} playouts in {self.elapsed:.2f}s ({self.playouts_per_second:,.0f} playouts/s) '
+            f'over {self.workers} tree(s)'
+        )
+
+    def choose_action(self, board: Board, player: Player) -> Action:
+        # Every action of the turn gets the same share of the time left
+        return self.search(board, player, self.clock.share(player, self.budget))
+
+    def search(self, board: Board, player: Player, seconds: float) -> Action:
+        """
+        Searches the position with every tree and merges their root visits.
+
+        Args:
+            board: The Board class object, containing the grid with the unit coins.
+            player: The Player class object defining the current player.
+            seconds: The wall-clock seconds the search can take.
+
+        Returns:
+            The most visited Action, ties going to the first one generated.
+        """
+        start: float = time.perf_counter()
+        seeds: list = [self.rng.getrandbits(64) for _ in range(self.workers)]
+        if self.workers == 1:
+            results: list = [search_tree(board, player, seconds, self.max_playouts, seeds[0], self.rollout_turns)]
+        else:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            state: bytes = to_bytes(board, player)
+            futures: list = [
+                self.executor.submit(search_state, state, seconds, self.max_playouts, seed, self.rollout_turns)
+                for seed in seeds
+            ]
+            results = [future.result() for future in futures]
+
+        self.visits = {}
+        self.playouts = 0
+        for visits, playouts in results:
+            self.playouts += playouts
+            for action, count in visits.items():
+                self.visits[action] = self.visits.get(action, 0) + count
+        self.elapsed = time.perf_counter() - start
+        actions: list = board.legal_actions(player)
+        return max(actions, key=lambda action: self.visits.get(action, 0))
+
+    def close(self) -> None:
+        """
+        Shuts down the worker processes, if any were started.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
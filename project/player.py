@@ -1,4 +1,12 @@
 import random
+from collections import deque
+
+from coins import CoinBag
+from events import EventSink, TERMINAL, BAG_REFILLED, HAND_DRAWN, RECRUITMENT_UNITS
+from zobrist import ZOBRIST, COIN_INDEX, HAND, BAG, DISCARD, RECRUITMENT, MASK
+
+# Longest name in UTF-8 bytes, the size of the name field of the binary snapshots the MCTS workers are sent
+MAX_NAME_SIZE: int = 8
 
 # Player class with its respective methods and properties
 class Player:
@@ -6,17 +14,26 @@ class Player:
     A class to represent a Player.
 
     Attributes:
-        name: The player name
-        symbol: The player symbol
+        name: The player name, of up to MAX_NAME_SIZE bytes in UTF-8
+        symbol: The player symbol, of one byte in UTF-8
         has_initiative: Allows the player to play 2 rounds in a row
         initiative_count: Limits the number of rounds played to 2 at most.
         assigned_units: Dictionary following the structure {unit_type: [stack of Unit class objects]}
-        bag: List following the structure: [list of Unit class objects]
-        hand: List following the structure: [list of Unit class objects]
-        discarded: List following the structure: [list of Unit class objects]
+        bag: CoinBag class object with the unit coins in the bag
+        hand: CoinBag class object with the unit coins in the hand
+        discarded: Deque following the structure: [Unit class objects, from the first discarded to the last]
         control_tokens: The number of remaining control tokens the player has.
+        seat: The index of the player in the board, set by the Board class object.
+        key: The Zobrist key of the coins in the hand, bag, discard pile and assigned units, updated whenever a coin
+            moves between them. It has to be recomputed with rehash() after changing the coin lists directly.
+        rng: Optional random.Random generator used to draw hands, the global one of the random module if it is None.
+        events: The EventSink class object the draws and recruitment status are reported to
     """
-    def __init__(self, name, symbol) -> None:
+    def __init__(self, name, symbol, rng: random.Random = None, events: EventSink = TERMINAL) -> None:
+        if len(name.encode()) > MAX_NAME_SIZE or len(symbol.encode()) != 1:
+            raise ValueError(
+                f'Player names can have up to {MAX_NAME_SIZE} bytes and symbols one byte, got {name!r} and {symbol!r}'
+            )
         # Player information
         self.name: str = name
         self.symbol: str = symbol
@@ -24,10 +41,47 @@ class Player:
         self.initiative_count: int = 0
         # Player unit coins
         self.assigned_units: dict = {}
-        self.bag: list = []
-        self.hand: list = []
-        self.discarded: list = []
+        self.bag: CoinBag = CoinBag()
+        self.hand: CoinBag = CoinBag()
+        # The discard pile goes back to the bag in the order the coins were discarded
+        self.discarded: deque = deque()
         self.control_tokens: int = 3
+        self.seat: int = 0
+        self.key: int = 0
+        self.rng: random.Random = rng
+        self.events: EventSink = events
+
+    def rehash(self) -> None:
+        """
+        Recomputes the Zobrist key of the player coins from scratch.
+        """
+        keys: list = ZOBRIST.coins[self.seat]
+        key: int = 0
+        for zone, coins in ((HAND, self.hand), (BAG, self.bag), (DISCARD, self.discarded)):
+            for coin in coins:
+                key += keys[zone][COIN_INDEX[coin.unit_type]]
+        for unit_type, stack in self.assigned_units.items():
+            key += keys[RECRUITMENT][COIN_INDEX[unit_type]] * len(stack)
+        self.key = key & MASK
+
+    def hidden_state(self) -> tuple:
+        """
+        Returns the exact contents of the coin zones the opponent can't see, as the number of coins of each type in the
+        bag and in the hand (following the order of COIN_TYPES), along with the order of the discard pile that decides
+        which coins go back to the bag. Unlike the Zobrist key it can't collide, so it can be used as a dictionary key.
+        """
+        return self.bag.signature(), self.hand.signature(), tuple(coin.unit_type for coin in self.discarded)
+
+    def count_coin(self, zone: int, unit_type: str, change: int) -> None:
+        """
+        Updates the Zobrist key of the player coins after coins are added to or removed from a zone.
+
+        Args:
+            zone: HAND, BAG, DISCARD or RECRUITMENT.
+            unit_type: The unit type of the coins.
+            change: The number of coins added (or removed if negative).
+        """
+        self.key = (self.key + change * ZOBRIST.coins[self.seat][zone][COIN_INDEX[unit_type]]) & MASK
 
     # Print the number of available recruitment pieces
     def get_recruitment_units(self) -> bool:
@@ -42,13 +96,10 @@ class Player:
         if len(self.assigned_units) == 0 and len(self.discarded) == 0:
             return False 
         
-        print('Recruitment pieces: ', end='')
-        for unit_type, units in self.assigned_units.items():
-            # Skip the royal card since it can't be recruited
-            if unit_type == 'Royal':
-                continue
-            print(f'{unit_type} = {len(units)}, ', end='')
-        print()
+        # Skip the royal card since it can't be recruited
+        self.events.emit(RECRUITMENT_UNITS, units=tuple(
+            (unit_type, len(units)) for unit_type, units in self.assigned_units.items() if unit_type != 'Royal'
+        ))
 
     def print_hand(self) -> None:
         """
@@ -74,30 +125,30 @@ class Player:
             if len(self.discarded) == 0:
                 return False
             
-            retrieved_coins = 0
-            # Get the unit coin and add it to the bag
-            unit_coin = self.discarded[retrieved_coins]
+            # Remove the first unit coin from the discarded pile and add it to the bag
+            unit_coin = self.discarded.popleft()
             self.bag.append(unit_coin)
-
-            # Remove it from the discarded pile
-            print(f'Removed {unit_coin.unit_type} from the discarded pile and added it to the bag since there were less than 3 unit coins in the bag')
-            del self.discarded[retrieved_coins]
-            retrieved_coins += 1
+            self.count_coin(DISCARD, unit_coin.unit_type, -1)
+            self.count_coin(BAG, unit_coin.unit_type, 1)
+            self.events.emit(BAG_REFILLED, unit_type=unit_coin.unit_type)
         
         # Reset the hand in case it hasn't been emptied due to a user input error
-        self.hand = []
+        for unit in self.hand.clear():
+            self.count_coin(HAND, unit.unit_type, -1)
 
-        print('Hand: ', end='')
+        # Use the global generator of the random module unless the player has its own
+        rng = self.rng if self.rng is not None else random
+        drawn: list = []
         # Get three coins from the bag to place inside the hand
         for _ in range(3):
-            unit_no: int = random.randint(0, len(self.bag) - 1)
-            unit = self.bag[unit_no]
-            print(f'{unit.unit_type}, ', end='')
+            # Remove a random coin from the bag
+            unit = self.bag.draw(rng)
+            drawn.append(unit.unit_type)
             # Add to our hand
             self.hand.append(unit)
-            # Remove from the bag
-            del self.bag[unit_no]
-        print()
+            self.count_coin(BAG, unit.unit_type, -1)
+            self.count_coin(HAND, unit.unit_type, 1)
+        self.events.emit(HAND_DRAWN, coins=tuple(drawn))
         return True
 
     # Print the discarded pile for the current player
@@ -116,3 +167,27 @@ class Player:
         """
         print(f'\nControl tokens: {self.control_tokens}\n\n')
 
+def assign_unit(player: Player, unit: str, no_of_units: int) -> None:
+    """
+    Assigns a unit type to a player: two of its coins go to the bag and the rest to the recruitment stack.
+
+    Args:
+        player: The player class object defining the current player.
+        unit: The unit type, e.g: 'Knight'.
+        no_of_units: The total number of coins of the unit type.
+    """
+    # The cell module needs the Player class, so it can only be imported once both are loaded
+    from cell import COIN_CLASSES
+    coin_class: type = COIN_CLASSES[unit]
+    # Create two unit coins
+    unit_coin_one, unit_coin_two = coin_class(player), coin_class(player)
+
+    # The assigned units dictionary follows the structure '{ unit_type: [stack of class Units] }'
+    player.assigned_units[unit] = []
+    # Create the stack of unit coins (remembering to remove two units we inserted in the player bag)
+    for _ in range(no_of_units - 2):
+        player.assigned_units[unit].append(coin_class(player))
+
+    # Place the two units in the bag
+    player.bag.append(unit_coin_one)
+    player.bag.append(unit_coin_two)
@@ -0,0 +1,327 @@
+import struct
+from typing import NamedTuple
+
+from action import Action, ACTION_KINDS, COIN_TYPES, RECRUIT
+from board import Board
+from cell import Royal
+from config import BoardConfig, board_config
+from events import NULL_SINK
+from player import Player, assign_unit
+
+# Tags of the entries of a game record, each one followed by a fixed number of bytes
+GAME: int = ord('G')
+DRAW: int = ord('D')
+ACTION: int = ord('A')
+END: int = ord('E')
+
+# Byte of a missing square, unit type or seat
+NONE: int = 0xFF
+
+# Layouts of the entries, little-endian and without padding:
+# GAME: tag, rows, cols, simulation seed, game index, seat of the starting player, then the (unit type, no. of coins)
+#   of the two units of CROW followed by the two units of WOLF
+# DRAW: tag, seat, hand, where the hand packs the three unit types drawn as a number in base 5
+# ACTION: tag, kind * 16 + piece, start square, end square, recruited unit type or extra attack square
+# END: tag, seat of the winner, turns played
+GAME_ENTRY: struct.Struct = struct.Struct('<BBBQIB8B')
+DRAW_ENTRY: struct.Struct = struct.Struct('<BBB')
+ACTION_ENTRY: struct.Struct = struct.Struct('<BBBBB')
+END_ENTRY: struct.Struct = struct.Struct('<BBH')
+ENTRY_SIZES: dict = {GAME: GAME_ENTRY.size, DRAW: DRAW_ENTRY.size, ACTION: ACTION_ENTRY.size, END: END_ENTRY.size}
+
+# Number of bytes the reader asks the file for at once
+READ_SIZE: int = 1 << 16
+
+def _hand_codes() -> dict:
+    """
+    Numbers every hand of three coins, as a tuple with the number of coins of each type following the order of
+    COIN_TYPES, by the unit types it holds sorted and written as a number in base 5.
+    """
+    codes: dict = {}
+    for first in range(len(COIN_TYPES)):
+        for second in range(first, len(COIN_TYPES)):
+            for third in range(second, len(COIN_TYPES)):
+                hand: list = [0] * len(COIN_TYPES)
+                for index in (first, second, third):
+                    hand[index] += 1
+                codes[tuple(hand)] = (first * 5 + second) * 5 + third
+    return codes
+
+# Dictionaries following the structure {hand: code} and {code: hand}
+HAND_CODES: dict = _hand_codes()
+HANDS: dict = {code: hand for hand, code in HAND_CODES.items()}
+
+# Actions already decoded, following the structure {entry bytes: Action}, games repeat the same ones over and over
+_decoded_actions: dict = {}
+
+# Draw class with its respective properties
+class Draw(NamedTuple):
+    """
+    A class to represent a Draw entry of a game record: the turn passes with Board.end_turn() and the player drawing
+    gets the given hand.
+
+    Attributes:
+        seat: The seat of the player that draws, 0 for CROW and 1 for WOLF.
+        hand: Tuple with the number of coins of each type drawn, following the order of COIN_TYPES.
+    """
+    seat: int
+    hand: tuple
+
+# GameRecord class with its respective properties
+class GameRecord(NamedTuple):
+    """
+    A class to represent a GameRecord, everything needed to play a game again without its random generator.
+
+    Attributes:
+        config: The BoardConfig class object of the board.
+        seed: The seed of the simulation the game was played in.
+        game: The index of the game in the simulation.
+        start: The seat of the player whose turn ends before the first draw, as in play_headless().
+        units: Tuple following the structure (((unit_type, no. of coins), ...) of CROW, (...) of WOLF), in
+            assignment order.
+        entries: Tuple of the Draw and Action class objects of the game, in the order they were played.
+        winner: The seat of the winner, or None if there was no winner or the game is unfinished.
+        turns: The number of turns played, or None if the record ends before the game does.
+    """
+    config: BoardConfig
+    seed: int
+    game: int
+    start: int
+    units: tuple
+    entries: tuple
+    winner: int
+    turns: int
+
+def encode_action(action: Action, cols: int) -> bytes:
+    """
+    Packs an Action into the four bytes following the tag of an ACTION entry.
+
+    Args:
+        action: The Action to pack.
+        cols: The number of columns of the board, to turn coordinates into squares.
+
+    Returns:
+        The packed bytes.
+    """
+    if len(action.extra_targets) > 1:
+        raise ValueError(f'Only one extra attack can be recorded, got {action.extra_targets}')
+    start: int = NONE if action.start is None else action.start[0] * cols + action.start[1]
+    end: int = NONE if action.end is None else action.end[0] * cols + action.end[1]
+    if action.kind == RECRUIT:
+        extra: int = COIN_TYPES.index(action.recruit)
+    elif action.extra_targets:
+        extra = action.extra_targets[0][0] * cols + action.extra_targets[0][1]
+    else:
+        extra = NONE
+    return bytes((ACTION_KINDS.index(action.kind) << 4 | COIN_TYPES.index(action.piece), start, end, extra))
+
+def decode_action(data: bytes, cols: int) -> Action:
+    """
+    Unpacks the four bytes following the tag of an ACTION entry, see encode_action().
+    """
+    key: tuple = (data, cols)
+    action: Action = _decoded_actions.get(key)
+    if action is not None:
+        return action
+    code, start, end, extra = data
+    kind: str = ACTION_KINDS[code >> 4]
+    recruit: str = None
+    extra_targets: tuple = ()
+    if kind == RECRUIT:
+        recruit = COIN_TYPES[extra]
+    elif extra != NONE:
+        extra_targets = (divmod(extra, cols),)
+    action = Action(
+        kind, COIN_TYPES[code & 0xF], None if start == NONE else divmod(start, cols),
+        None if end == NONE else divmod(end, cols), recruit, extra_targets
+    )
+    _decoded_actions[key] = action
+    return action
+
+# GameRecorder class with its respective methods and properties
+class GameRecorder:
+    """
+    A class to represent a GameRecorder, it appends the entries of a game to a binary file as the game is played, so
+    a record can be read back while more games are being written after it.
+
+    Attributes:
+        file: The binary file-like object the entries are written to.
+        cols: The number of columns of the board of the current game.
+    """
+    def __init__(self, file) -> None:
+        self.file = file
+        self.cols: int = 0
+
+    def start(self, config: BoardConfig, seed: int, game: int, start: int, units: tuple) -> None:
+        """
+        Writes the GAME entry that opens the record of a game.
+
+        Args:
+            config: The BoardConfig class object of the board.
+            seed: The seed of the simulation, from 0 to 2**64 - 1.
+            game: The index of the game in the simulation.
+            start: The seat of the player whose turn ends before the first draw.
+            units: Tuple following the structure (((unit_type, no. of coins), ...) of CROW, (...) of WOLF), with two
+                units for each player.
+        """
+        if config.rows * config.cols > NONE:
+            raise ValueError(f'Boards of more than {NONE} squares can not be recorded')
+        self.cols = config.cols
+        assigned: list = [
+            value for player_units in units for unit_type, count in player_units
+            for value in (COIN_TYPES.index(unit_type), count)
+        ]
+        self.file.write(GAME_ENTRY.pack(GAME, config.rows, config.cols, seed, game, start, *assigned))
+
+    def draw(self, seat: int, hand: tuple) -> None:
+        """
+        Writes a DRAW entry.
+
+        Args:
+            seat: The seat of the player that draws.
+            hand: Tuple with the number of coins of each type drawn, following the order of COIN_TYPES.
+        """
+        self.file.write(DRAW_ENTRY.pack(DRAW, seat, HAND_CODES[hand]))
+
+    def action(self, action: Action) -> None:
+        """
+        Writes an ACTION entry for an action performed by the player that drew last.
+        """
+        self.file.write(bytes((ACTION,)) + encode_action(action, self.cols))
+
+    def end(self, winner: int, turns: int) -> None:
+        """
+        Writes the END entry that closes the record of a game.
+
+        Args:
+            winner: The seat of the winner, or None if there was no winner.
+            turns: The number of turns played.
+        """
+        self.file.write(END_ENTRY.pack(END, NONE if winner is None else winner, turns))
+
+def read_games(file, read_size: int = READ_SIZE):
+    """
+    Reads the records of the games of a binary file one at a time, asking the file for a block of bytes at a time
+    instead of loading it whole. A game the file ends in the middle of, e.g: one still being played, is yielded
+    without a winner or number of turns, and an entry only partly written is left out.
+
+    Args:
+        file: The binary file-like object to read from.
+        read_size: The number of bytes read from the file at once.
+
+    Yields:
+        The GameRecord of each game, in the order they were written.
+    """
+    buffer: bytes = b''
+    position: int = 0
+    header: tuple = None
+    entries: list = []
+    while True:
+        if position < len(buffer):
+            tag: int = buffer[position]
+            size: int = ENTRY_SIZES.get(tag, 0)
+            if not size:
+                raise ValueError(f'Unknown entry tag {tag} at byte {position} of the block')
+        else:
+            size = 1
+        if len(buffer) - position < size:
+            # Keep the bytes not read yet and add the next block after them
+            block: bytes = file.read(read_size)
+            if not block:
+                break
+            buffer, position = buffer[position:] + block, 0
+            continue
+
+        if tag in (ACTION, DRAW) and header is None:
+            raise ValueError('action entry before game header' if tag == ACTION else 'draw entry before game header')
+        if tag == ACTION:
+            entries.append(decode_action(buffer[position + 1:position + size], header[2]))
+        elif tag == DRAW:
+            _, seat, code = DRAW_ENTRY.unpack_from(buffer, position)
+            entries.append(Draw(seat, HANDS[code]))
+        elif tag == GAME:
+            if header is not None:
+                raise ValueError(f'Game {header[4]} has no END entry')
+            header = GAME_ENTRY.unpack_from(buffer, position)
+        else:
+            if header is None:
+                raise ValueError('END entry without a GAME entry')
+            _, winner, turns = END_ENTRY.unpack_from(buffer, position)
+            yield make_record(header, entries, None if winner == NONE else winner, turns)
+            header, entries = None, []
+        position += size
+
+    if header is not None:
+        yield make_record(header, entries, None, None)
+
+def make_record(header: tuple, entries: list, winner: int, turns: int) -> GameRecord:
+    """
+    Builds a GameRecord from the unpacked GAME entry and the entries after it.
+    """
+    _, rows, cols, seed, game, start, *assigned = header
+    units: tuple = tuple(
+        tuple((COIN_TYPES[assigned[index]], assigned[index + 1]) for index in range(offset, offset + 4, 2))
+        for offset in (0, 4)
+    )
+    return GameRecord(board_config(rows, cols), seed, game, start, units, tuple(entries), winner, turns)
+
+def new_game(record: GameRecord) -> tuple:
+    """
+    Sets up the players and the board of a recorded game as initialize_player() and play_headless() did.
+
+    Args:
+        record: The GameRecord of the game.
+
+    Returns:
+        Tuple containing the (Board, CROW Player, WOLF Player).
+    """
+    players: list = [Player('CROW', 's', events=NULL_SINK), Player('WOLF', 'v', events=NULL_SINK)]
+    for player, units in zip(players, record.units):
+        for unit_type, no_of_units in units:
+            assign_unit(player, unit_type, no_of_units)
+        player.bag.append(Royal())
+    crow, wolf = players
+    return Board(crow, wolf, record.config, NULL_SINK), crow, wolf
+
+def positions(record: GameRecord, stop: int = None):
+    """
+    Plays a recorded game again, yielding the position after each entry. The same Board is changed in place between
+    positions, so it has to be copied to be kept.
+
+    Args:
+        record: The GameRecord of the game.
+        stop: Optional number of entries to play, all of them by default.
+
+    Yields:
+        Tuple containing the (number of entries played, Board, Player that acts next) of each position, starting with
+        the position before the first entry.
+    """
+    board, crow, wolf = new_game(record)
+    seats: tuple = (crow, wolf)
+    player: Player = seats[record.start]
+    yield 0, board, player
+    for index, entry in enumerate(record.entries[:stop], 1):
+        if type(entry) is Draw:
+            player = board.end_turn(player)
+            if board.seats[player] != entry.seat or not board.draw(player, None, entry.hand):
+                raise ValueError(f'Entry {index} draws {entry} for the wrong player or an impossible hand')
+        else:
+            result = board.apply_action(player, entry)
+            if not result:
+                raise ValueError(f'Entry {index} is not a valid action, {entry}: {result.message}')
+        yield index, board, player
+
+def replay(record: GameRecord, stop: int = None) -> tuple:
+    """
+    Rebuilds the position of a recorded game after a number of entries.
+
+    Args:
+        record: The GameRecord of the game.
+        stop: Optional number of entries to play, all of them by default.
+
+    Returns:
+        Tuple containing the (Board, Player that acts next).
+    """
+    for _, board, player in positions(record, stop):
+        pass
+    return board, player
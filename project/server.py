@@ -0,0 +1,506 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from action import Result, RECRUIT
+from agent import Agent
+from board import Board
+from config import BOARDS
+from events import COIN_RECRUITED, EventBus, describe
+from high_scores import DATABASE, FinishedGame, record_game
+from player import Player
+from main import describe_action, initialize_player, parse_action, show_player_information, swap_turns
+from simulate import AGENT_NAMES, UNITS, make_agent
+
+# Address the server listens on by default
+HOST: str = '127.0.0.1'
+PORT: int = 8765
+
+# Start of the lines that wait for an answer, every other line the server sends is only shown
+PROMPT: str = '? '
+
+# Question asked for each of the three actions of a turn, 'actions' lists the legal ones without using an action
+ACTION_PROMPT: str = 'Make an action (move/recruit/place/attack/control/initiative/forfeit/actions): '
+
+# Opponents a client can ask for, another client or one of the agents of the simulations
+OPPONENTS: tuple = ('human',) + AGENT_NAMES
+
+# Connection class with its respective methods and properties
+class Connection:
+    """
+    A class to represent a Connection, a player connected to the server. Everything the session has to show is written
+    to it as lines of text, and the lines it sends back answer the prompts.
+
+    Attributes:
+        reader: The asyncio.StreamReader of the socket.
+        writer: The asyncio.StreamWriter of the socket.
+        timeout: The seconds the player has to answer a prompt, None to wait forever.
+        closed: Whether the player disconnected or was disconnected.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, timeout: float = None) -> None:
+        self.reader: asyncio.StreamReader = reader
+        self.writer: asyncio.StreamWriter = writer
+        self.timeout: float = timeout
+        self.closed: bool = False
+
+    async def send(self, text: str) -> None:
+        """
+        Writes text to the player and waits until the socket can take more.
+        """
+        if self.closed or not text:
+            return
+        try:
+            self.writer.write(text.encode())
+            await self.writer.drain()
+        except ConnectionError:
+            self.closed = True
+
+    async def ask(self, prompt: str) -> str:
+        """
+        Sends a prompt and waits for the answer.
+
+        Args:
+            prompt: The question, sent after PROMPT on a line of its own.
+
+        Returns:
+            The line answered without its line break, or None if the player disconnected or took too long.
+        """
+        await self.send(f'{PROMPT}{prompt}\n')
+        if self.closed:
+            return None
+        try:
+            line: bytes = await asyncio.wait_for(self.reader.readline(), self.timeout)
+        except (asyncio.TimeoutError, ConnectionError):
+            line = b''
+        if not line:
+            self.closed = True
+            return None
+        return line.decode(errors='replace').strip()
+
+    async def watch(self) -> None:
+        """
+        Reads while the player isn't asked anything, dropping the lines it sends, until it disconnects. It has to be
+        cancelled before the player is asked something.
+        """
+        try:
+            while await self.reader.readline():
+                pass
+        except ConnectionError:
+            pass
+        self.closed = True
+
+    async def close(self) -> None:
+        """
+        Closes the socket.
+        """
+        self.closed = True
+        self.writer.close()
+        with contextlib.suppress(ConnectionError):
+            await self.writer.wait_closed()
+
+# Session class with its respective methods and properties
+class Session:
+    """
+    A class to represent a Session, one game hosted by the server. It follows the turns of play_game(), with each
+    player answering through its Connection or played by an Agent, and every coroutine of the server shares the same
+    thread. The turn logic prints to the terminal, so each synchronous step runs with the standard output sent to the
+    buffer of the session, which is then written to both players: no step awaits while it is redirected, so the output
+    of two sessions never mixes. The searches of the agents would stop every other session, so they run in the
+    executor of the server instead: they don't print, and the session waits for them without touching its board.
+    Agents that don't search, see Agent.searches, choose right away on the event loop.
+
+    Attributes:
+        id: The number of the session in the server.
+        board: The Board class object of the game.
+        crow: The Player class object of CROW.
+        wolf: The Player class object of WOLF.
+        controllers: Dictionary following the structure {Player: Connection or Agent}.
+        buffer: The io.StringIO holding the output not sent yet.
+        rng: The random.Random generator of the unit assignment, the draws and the starting player, shared with the
+            other sessions of the server.
+        turns: The number of turns played.
+        winner: The Player class object of the winner, None while the game goes on.
+        scores: The high scores database the finished game is recorded in, None to not record it.
+        searches: The ThreadPoolExecutor the agents choose their actions in, None for the default executor of the event
+            loop.
+    """
+    def __init__(
+        self, id: int, size: str, controllers: tuple, rng: random.Random, scores: str = None,
+        searches: ThreadPoolExecutor = None
+    ) -> None:
+        self.id: int = id
+        self.buffer: io.StringIO = io.StringIO()
+        self.rng: random.Random = rng
+        events: EventBus = EventBus([lambda event: print(describe(event), file=self.buffer)])
+        pool: list = list(UNITS)
+        self.crow: Player = initialize_player(Player('CROW', 's', rng, events), pool, rng)
+        self.wolf: Player = initialize_player(Player('WOLF', 'v', rng, events), pool, rng)
+        self.board: Board = Board(self.crow, self.wolf, BOARDS[size], events)
+        self.controllers: dict = dict(zip((self.crow, self.wolf), controllers))
+        self.turns: int = 0
+        self.winner: Player = None
+        self.scores: str = scores
+        self.searches: ThreadPoolExecutor = searches
+
+    def output(self):
+        """
+        Returns the context manager that sends what the turn logic prints to the buffer of the session.
+        """
+        return contextlib.redirect_stdout(self.buffer)
+
+    async def flush(self) -> None:
+        """
+        Writes the buffered output to every connected player.
+        """
+        text: str = self.buffer.getvalue()
+        if not text:
+            return
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        for controller in self.controllers.values():
+            if isinstance(controller, Connection):
+                await controller.send(text)
+
+    async def play(self) -> Player:
+        """
+        Plays the game until there is a winner, see play_game(), then tells the players and closes their connections.
+
+        Returns:
+            The Player class object of the winner.
+        """
+        crow_units: tuple = tuple(self.crow.assigned_units)
+        wolf_units: tuple = tuple(self.wolf.assigned_units)
+        start: float = time.perf_counter()
+        curr_player: Player = self.crow if self.rng.randint(0, 1) == 0 else self.wolf
+        try:
+            while True:
+                with self.output():
+                    self.board.print_board()
+                    curr_player = swap_turns(curr_player, self.crow, self.wolf)
+                    self.turns += 1
+                    can_play: bool = show_player_information(curr_player)
+                if not can_play or await self.prompt_player_actions(curr_player):
+                    # The other player wins if the current one can't make a hand, forfeits or leaves
+                    curr_player = self.board.opponent(curr_player)
+                    break
+                if curr_player.control_tokens == 0:
+                    break
+            self.winner = curr_player
+            print(f'\nThe winner of the game is {curr_player.name}!\n', file=self.buffer)
+            await self.flush()
+        finally:
+            for controller in self.controllers.values():
+                if isinstance(controller, Connection):
+                    await controller.close()
+        if self.scores is not None:
+            # Written by a background thread, the event loop doesn't wait for the database
+            record_game(FinishedGame(
+                None, self.crow.name, self.wolf.name, self.winner.name, crow_units, wolf_units, self.turns,
+                time.perf_counter() - start
+            ), self.scores)
+        return self.winner
+
+    async def prompt_player_actions(self, player: Player) -> bool:
+        """
+        Asks the player for the three actions of its turn, see main.prompt_player_actions(). Agents play their whole
+        hand, each action being chosen in the searches executor if the agent searches and then applied on the event
+        loop.
+
+        Args:
+            player: The Player class object defining the current player.
+
+        Returns:
+            True if the player has forfeited or disconnected, False if the game can go on.
+        """
+        controller = self.controllers[player]
+        if isinstance(controller, Agent):
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            while player.hand:
+                if controller.searches:
+                    action = await loop.run_in_executor(self.searches, controller.choose_action, self.board, player)
+                else:
+                    action = controller.choose_action(self.board, player)
+                with self.output():
+                    result: Result = self.board.apply_action(player, action)
+                    # The hand would never empty, the agent has to pick one of the legal actions
+                    if not result:
+                        raise RuntimeError(
+                            f'{type(controller).__name__} chose a rejected action {action}: {result.message}'
+                        )
+                    print(f'{player.name} plays {describe_action(self.board, action)}, {controller.report()}')
+            return False
+
+        for _ in range(3):
+            await self.flush()
+            answer: str = await controller.ask(ACTION_PROMPT)
+            while answer is not None and answer.lower() == 'actions':
+                # The legal actions, written the way they are typed
+                listing: str = ''.join(
+                    f'  {describe_action(self.board, action)}\n' for action in self.board.legal_actions(player)
+                )
+                await controller.send(f'Legal actions:\n{listing}')
+                answer = await controller.ask(ACTION_PROMPT)
+            if answer is None or answer.lower() == 'forfeit':
+                return True
+            with self.output():
+                action = parse_action(self.board, answer)
+                if action is not None and self.board.perform(player, action) and action.kind == RECRUIT:
+                    self.board.events.emit(COIN_RECRUITED, piece=action.recruit)
+        return False
+
+# GameServer class with its respective methods and properties
+class GameServer:
+    """
+    A class to represent a GameServer, it hosts any number of games on a single asyncio event loop. A client connects,
+    sends 'play [size] [opponent]' and is either paired with the next client asking for a human opponent on the same
+    board or given an agent to play against, then the game is played over the same connection, see Session.
+
+    Attributes:
+        host: The address to listen on.
+        port: The port to listen on, 0 to let the system pick one.
+        timeout: The seconds a player has to answer a prompt, None to wait forever.
+        max_nodes: The number of nodes an AlphaBetaAgent or ExpectimaxAgent can visit per action.
+        scores: The high scores database the finished games are recorded in, None to not record them.
+        rng: The random.Random generator of the sessions and the seeds of their agents.
+        sessions: Dictionary following the structure {session id: Session} of the games being played.
+        waiting: Dictionary following the structure {board size: (Connection, asyncio.Future, asyncio.Task)} of the
+            clients waiting for a human opponent, the future is resolved when their game ends and the task watches for
+            them leaving until they are paired, see Connection.watch().
+        played: The number of games finished.
+        clients: Dictionary following the structure {Connection: asyncio.Task serving it} of the connected clients.
+        searches: The ThreadPoolExecutor the agents of every session choose their actions in. A single thread, since
+            the searches hold the GIL: more threads wouldn't search any faster and would leave the event loop less time.
+        server: The asyncio.Server, None until start() is called.
+    """
+    def __init__(
+        self, host: str = HOST, port: int = PORT, timeout: float = None, max_nodes: int = 2000,
+        scores: str = None, seed: int = None
+    ) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.timeout: float = timeout
+        self.max_nodes: int = max_nodes
+        self.scores: str = scores
+        self.rng: random.Random = random.Random(seed)
+        self.sessions: dict = {}
+        self.waiting: dict = {}
+        self.played: int = 0
+        self.clients: dict = {}
+        self.searches: ThreadPoolExecutor = ThreadPoolExecutor(1, 'search')
+        self.server: asyncio.Server = None
+        self._ids = itertools.count(1)
+
+    async def start(self) -> int:
+        """
+        Starts listening for clients.
+
+        Returns:
+            The port the server listens on.
+        """
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def close(self) -> None:
+        """
+        Stops listening and ends every game still being played.
+        """
+        self.server.close()
+        for _, paired, _ in self.waiting.values():
+            paired.cancel()
+        self.waiting.clear()
+        # The players still waiting for an answer find their connection closed and forfeit
+        for connection in self.clients:
+            connection.writer.close()
+        await asyncio.gather(*self.clients.values(), return_exceptions=True)
+        self.searches.shutdown()
+        await self.server.wait_closed()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves a client, from its 'play' request until its game ends.
+        """
+        connection: Connection = Connection(reader, writer, self.timeout)
+        self.clients[connection] = asyncio.current_task()
+        try:
+            await self.serve(connection)
+        finally:
+            del self.clients[connection]
+
+    async def serve(self, connection: Connection) -> None:
+        """
+        Body of handle(), see GameServer.
+        """
+        answer: str = await connection.ask(f'play [{"/".join(BOARDS)}] [{"/".join(OPPONENTS)}]')
+        words: list = (answer or '').split()
+        size: str = words[1] if len(words) > 1 else '5x5'
+        opponent: str = words[2] if len(words) > 2 else 'human'
+        if not words or words[0] != 'play' or size not in BOARDS or opponent not in OPPONENTS:
+            await connection.send(f'Expected play [{"/".join(BOARDS)}] [{"/".join(OPPONENTS)}]\n')
+            await connection.close()
+            return
+
+        if opponent != 'human':
+            await self.run_session(size, (connection, make_agent(opponent, self.rng, self.max_nodes)))
+            return
+        while size in self.waiting:
+            first, paired, watch = self.waiting.pop(size)
+            # Only the session reads from the waiting client from now on
+            watch.cancel()
+            await asyncio.wait((watch,))
+            if first.closed:
+                # It left while it waited, this client is paired with the next one or waits itself
+                continue
+            try:
+                await self.run_session(size, (first, connection))
+            finally:
+                if not paired.done():
+                    paired.set_result(None)
+            return
+
+        # Stays open until the client that joins it finishes the game
+        paired: asyncio.Future = asyncio.get_running_loop().create_future()
+        watch: asyncio.Task = asyncio.create_task(connection.watch())
+        self.waiting[size] = (connection, paired, watch)
+        await connection.send('Waiting for an opponent\n')
+        await asyncio.wait((paired, watch), return_when=asyncio.FIRST_COMPLETED)
+        if watch.cancelled():
+            # Paired with the client that joined it
+            try:
+                await paired
+            except asyncio.CancelledError:
+                await connection.close()
+            return
+        if not watch.done():
+            # The server is closing
+            watch.cancel()
+        elif self.waiting.get(size, (None,))[0] is connection:
+            # It left before an opponent joined
+            del self.waiting[size]
+        await connection.close()
+
+    async def run_session(self, size: str, controllers: tuple) -> None:
+        """
+        Plays a game between the given (CROW, WOLF) controllers and forgets it once it ends. The sessions share the
+        generator of the server, a random.Random holds about 2.5 KB of state.
+        """
+        session: Session = Session(next(self._ids), size, controllers, self.rng, self.scores, self.searches)
+        self.sessions[session.id] = session
+        try:
+            await session.play()
+            self.played += 1
+        finally:
+            del self.sessions[session.id]
+
+    async def serve_forever(self) -> None:
+        """
+        Starts the server if needed and serves clients until the task is cancelled.
+        """
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+# GameClient class with its respective methods and properties
+class GameClient:
+    """
+    A class to represent a GameClient, a program playing on a GameServer, e.g: in the tests or the load test.
+
+    Attributes:
+        reader: The asyncio.StreamReader of the socket.
+        writer: The asyncio.StreamWriter of the socket.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader: asyncio.StreamReader = reader
+        self.writer: asyncio.StreamWriter = writer
+
+    @classmethod
+    async def connect(cls, host: str = HOST, port: int = PORT, size: str = '5x5', opponent: str = 'human'):
+        """
+        Connects to a server and asks for a game.
+
+        Args:
+            host: The address of the server.
+            port: The port of the server.
+            size: The name of the board in BOARDS.
+            opponent: One of OPPONENTS.
+
+        Returns:
+            The connected GameClient class object.
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        client: GameClient = cls(reader, writer)
+        await client.read()
+        await client.send(f'play {size} {opponent}')
+        return client
+
+    async def read(self) -> tuple:
+        """
+        Reads the lines the server sends until it asks something.
+
+        Returns:
+            Tuple containing the (list of lines shown, prompt), the prompt is None if the server closed the connection.
+        """
+        lines: list = []
+        while True:
+            line: bytes = await self.reader.readline()
+            if not line:
+                return lines, None
+            text: str = line.decode().rstrip('\n')
+            if text.startswith(PROMPT):
+                return lines, text[len(PROMPT):]
+            lines.append(text)
+
+    async def send(self, text: str) -> None:
+        """
+        Answers the last prompt.
+        """
+        self.writer.write(f'{text}\n'.encode())
+        await self.writer.drain()
+
+    async def legal_actions(self) -> list:
+        """
+        Asks the server for the legal actions of the player, it has to be waiting for an action.
+
+        Returns:
+            List of the actions written the way they are typed.
+        """
+        await self.send('actions')
+        lines, _ = await self.read()
+        return [line.strip() for line in lines[lines.index('Legal actions:') + 1:]]
+
+    async def close(self) -> None:
+        """
+        Closes the connection.
+        """
+        self.writer.close()
+        with contextlib.suppress(ConnectionError):
+            await self.writer.wait_closed()
+
+def main():
+    """
+    Runs the server from the command line until it is interrupted.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Host Warchest games over TCP')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--timeout', type=float, default=None, help='seconds a player has to answer')
+    parser.add_argument('--max-nodes', type=int, default=2000)
+    parser.add_argument('--scores', default=DATABASE, help='high scores database the games are recorded in')
+    args: argparse.Namespace = parser.parse_args()
+    server: GameServer = GameServer(args.host, args.port, args.timeout, args.max_nodes, args.scores)
+    print(f'Serving games on {args.host}:{args.port}')
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.serve_forever())
+
+if __name__ == "__main__":
+    """
+    Standard python boilerplate.
+    """
+    # This is executed when run from the command line
+    main()
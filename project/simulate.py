@@ -0,0 +1,307 @@
+import argparse
+import io
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple
+
+from action import Action
+from agent import Agent, AlphaBetaAgent, ExpectimaxAgent, RandomAgent
+from board import Board
+from config import BOARDS
+from events import NULL_SINK
+from high_scores import FinishedGame, ScoreWriter, get_score_writer
+from player import Player
+from main import initialize_player
+from records import GameRecorder
+
+# Units of play_game(), as (type of unit, the no. of units corresponding to it)
+UNITS: tuple = (('Archer', 4), ('Knight', 5), ('Mercenary', 5), ('Berserker', 4))
+
+# Agents that can play a simulated game, by the name used to select them
+AGENT_NAMES: tuple = ('random', 'alphabeta', 'expectimax')
+
+# GameResult class with its respective properties
+class GameResult(NamedTuple):
+    """
+    A class to represent a GameResult, the outcome of one simulated game.
+
+    Attributes:
+        game: The index of the game in the simulation.
+        winner: The name of the winning player, or None if the game reached the turn limit.
+        turns: The number of turns played.
+        units: Tuple following the structure ((unit types of CROW), (unit types of WOLF)), in assignment order.
+        record: The binary record of the game written by a GameRecorder, empty unless it was asked for.
+    """
+    game: int
+    winner: str
+    turns: int
+    units: tuple
+    record: bytes = b''
+
+def make_agent(name: str, rng: random.Random, max_nodes: int) -> Agent:
+    """
+    Creates the agent that plays one side of a simulated game.
+
+    Args:
+        name: One of AGENT_NAMES.
+        rng: The random.Random generator of the game, used to seed the agent.
+        max_nodes: The number of nodes an AlphaBetaAgent or ExpectimaxAgent can visit per action.
+
+    Returns:
+        The Agent class object.
+    """
+    match name:
+        case 'random':
+            return RandomAgent(rng.getrandbits(64))
+        case 'alphabeta':
+            # Only the node limit stops the search, so the game doesn't depend on the speed of the machine
+            return AlphaBetaAgent(budget=math.inf, max_nodes=max_nodes)
+        case 'expectimax':
+            return ExpectimaxAgent(budget=math.inf, max_nodes=max_nodes)
+    raise ValueError(f'Unknown agent {name}, expected one of {AGENT_NAMES}')
+
+def play_headless(
+    game: int, seed: int, agents: tuple = ('random', 'random'), units: tuple = UNITS, max_turns: int = 200,
+    max_nodes: int = 2000, size: str = '5x5', record: bool = False
+) -> GameResult:
+    """
+    Plays a whole game between two agents without printing anything, following the turn order of play_game().
+
+    Every game gets its own random.Random generator, seeded from the simulation seed and the game index, for the unit
+    assignment, the starting player, the draws and the random agents, so a game is the same whichever process plays it.
+
+    Args:
+        game: The index of the game in the simulation.
+        seed: The seed of the simulation.
+        agents: Tuple containing the names of the (CROW, WOLF) agents.
+        units: Tuple of (type of unit, the no. of units corresponding to it) to assign from.
+        max_turns: The number of turns after which the game is stopped without a winner.
+        max_nodes: The number of nodes an AlphaBetaAgent can visit per action.
+        size: The name of the board in BOARDS, e.g: '9x9'.
+        record: Record the game with a GameRecorder, see records.py.
+
+    Returns:
+        The GameResult of the game.
+    """
+    rng: random.Random = random.Random(f'{seed}:{game}')
+    pool: list = list(units)
+    crow: Player = initialize_player(Player('CROW', 's', rng, NULL_SINK), pool, rng)
+    wolf: Player = initialize_player(Player('WOLF', 'v', rng, NULL_SINK), pool, rng)
+    board: Board = Board(crow, wolf, BOARDS[size], NULL_SINK)
+    players: dict = {crow: make_agent(agents[0], rng, max_nodes), wolf: make_agent(agents[1], rng, max_nodes)}
+    assigned: tuple = (tuple(crow.assigned_units), tuple(wolf.assigned_units))
+
+    player: Player = crow if rng.randint(0, 1) == 0 else wolf
+    recorder: GameRecorder = None
+    if record:
+        recorder = GameRecorder(io.BytesIO())
+        # Two coins of every unit went to the bag, the rest are in the recruitment stack
+        units_left: tuple = tuple(
+            tuple((unit_type, len(coins) + 2) for unit_type, coins in side.assigned_units.items())
+            for side in (crow, wolf)
+        )
+        recorder.start(board.config, seed, game, board.seats[player], units_left)
+
+    winner: Player = None
+    turns: int = max_turns
+    for turn in range(1, max_turns + 1):
+        player = board.end_turn(player)
+        # The other player wins if the current player can't make a hand
+        if not board.draw(player, rng):
+            winner, turns = board.opponent(player), turn
+            break
+        if recorder is not None:
+            recorder.draw(board.seats[player], player.hand.signature())
+        agent: Agent = players[player]
+        while player.hand:
+            action: Action = agent.choose_action(board, player)
+            board.apply_action(player, action)
+            if recorder is not None:
+                recorder.action(action)
+        if player.control_tokens == 0:
+            winner, turns = player, turn
+            break
+
+    if recorder is None:
+        return GameResult(game, winner and winner.name, turns, assigned)
+    recorder.end(board.seats.get(winner), turns)
+    return GameResult(game, winner and winner.name, turns, assigned, recorder.file.getvalue())
+
+def play_games(start: int, stop: int, seed: int, options: dict) -> list:
+    """
+    Plays a range of games of a simulation, the unit of work sent to each worker process.
+
+    Args:
+        start: The index of the first game.
+        stop: The index after the last game.
+        seed: The seed of the simulation.
+        options: Dictionary with the keyword arguments of play_headless().
+
+    Returns:
+        A list with the GameResult of each game.
+    """
+    return [play_headless(game, seed, **options) for game in range(start, stop)]
+
+def simulate(games: int, seed: int = 0, workers: int = None, chunk: int = 16, **options):
+    """
+    Plays games across a pool of processes, yielding the results of each chunk of games as soon as it finishes, so
+    they arrive in no particular order.
+
+    Args:
+        games: The number of games to play.
+        seed: The seed of the simulation.
+        workers: The number of worker processes, all the cores by default.
+        chunk: The number of games sent to a worker at once.
+        options: Keyword arguments of play_headless().
+
+    Yields:
+        The GameResult of each game.
+    """
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures: list = [
+            executor.submit(play_games, start, min(start + chunk, games), seed, options)
+            for start in range(0, games, chunk)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+# Summary class with its respective methods and properties
+class Summary:
+    """
+    A class to represent a Summary, the aggregate results of a simulation. It only keeps counts, so the results can
+    be added in any order.
+
+    Attributes:
+        games: The number of games added.
+        turns: The total number of turns played.
+        wins: Dictionary following the structure {player name or None: games won}
+        unit_games: Dictionary following the structure {unit_type: games the unit was assigned in}
+        unit_wins: Dictionary following the structure {unit_type: games won by the player it was assigned to}
+    """
+    def __init__(self) -> None:
+        self.games: int = 0
+        self.turns: int = 0
+        self.wins: dict = {}
+        self.unit_games: dict = {}
+        self.unit_wins: dict = {}
+
+    def add(self, result: GameResult) -> None:
+        """
+        Adds the result of a game to the counts.
+
+        Args:
+            result: The GameResult to add.
+        """
+        self.games += 1
+        self.turns += result.turns
+        self.wins[result.winner] = self.wins.get(result.winner, 0) + 1
+        for name, units in zip(('CROW', 'WOLF'), result.units):
+            for unit_type in units:
+                self.unit_games[unit_type] = self.unit_games.get(unit_type, 0) + 1
+                if result.winner == name:
+                    self.unit_wins[unit_type] = self.unit_wins.get(unit_type, 0) + 1
+
+    def win_rate(self, name: str) -> float:
+        """
+        Returns the fraction of games won by a player, or stopped without a winner if the name is None.
+        """
+        return self.wins.get(name, 0) / self.games if self.games else 0.0
+
+    def unit_win_rates(self) -> dict:
+        """
+        Returns a dictionary following the structure {unit_type: fraction of its games won by its player}, sorted by
+        unit type.
+        """
+        return {
+            unit_type: self.unit_wins.get(unit_type, 0) / count
+            for unit_type, count in sorted(self.unit_games.items())
+        }
+
+    def totals(self) -> tuple:
+        """
+        Returns every count of the summary, to compare simulations.
+        """
+        return (
+            self.games, self.turns, sorted(self.wins.items(), key=str), sorted(self.unit_games.items()),
+            sorted(self.unit_wins.items())
+        )
+
+def run(
+    games: int, seed: int = 0, workers: int = None, progress: int = 0, record: str = None, scores: str = None,
+    **options
+) -> tuple:
+    """
+    Runs a simulation and aggregates its results, printing the progress every so many games.
+
+    Args:
+        games: The number of games to play.
+        seed: The seed of the simulation.
+        workers: The number of worker processes, all the cores by default.
+        progress: Print the win rates every time this many more games have finished, 0 to stay silent.
+        record: Optional path of a file the records of the games are appended to, in the order they finish.
+        scores: Optional path of a high scores database the games are added to, by a background ScoreWriter.
+        options: Keyword arguments of simulate() and play_headless().
+
+    Returns:
+        Tuple containing the (Summary, games per second).
+    """
+    summary: Summary = Summary()
+    start: float = time.perf_counter()
+    # The workers send the records back with the results and only this process writes to the file
+    file = open(record, 'ab') if record else None
+    writer: ScoreWriter = get_score_writer(scores) if scores else None
+    try:
+        for result in simulate(games, seed, workers, record=file is not None, **options):
+            summary.add(result)
+            if file is not None:
+                file.write(result.record)
+            if writer is not None:
+                # Simulated games aren't timed, they share the cores with the other games
+                writer.submit(FinishedGame(None, 'CROW', 'WOLF', result.winner, *result.units, result.turns))
+            if progress and summary.games % progress == 0:
+                print(f'{summary.games}/{games} games, CROW {summary.win_rate("CROW"):.1%}, WOLF {summary.win_rate("WOLF"):.1%}')
+    finally:
+        if file is not None:
+            file.close()
+        if writer is not None:
+            # Only the games of the last batches are still being written
+            writer.flush()
+    return summary, summary.games / (time.perf_counter() - start)
+
+def main():
+    """
+    Parses the command line and prints the results of a simulation.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Play Warchest games between agents.')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--crow', choices=AGENT_NAMES, default='random')
+    parser.add_argument('--wolf', choices=AGENT_NAMES, default='random')
+    parser.add_argument('--max-turns', type=int, default=200)
+    parser.add_argument('--max-nodes', type=int, default=2000)
+    parser.add_argument('--size', choices=list(BOARDS), default='5x5')
+    parser.add_argument('--record', default=None, help='file to append the binary records of the games to')
+    parser.add_argument('--scores', default=None, help='high scores database to add the games to')
+    args: argparse.Namespace = parser.parse_args()
+
+    summary, games_per_second = run(
+        args.games, args.seed, args.workers, progress=max(1, args.games // 10), agents=(args.crow, args.wolf),
+        max_turns=args.max_turns, max_nodes=args.max_nodes, size=args.size, record=args.record,
+        scores=args.scores
+    )
+    print(f'\n{summary.games} games at {games_per_second:,.1f} games/s, {summary.turns / summary.games:.1f} turns per game')
+    for name in ('CROW', 'WOLF', None):
+        print(f'{name or "No winner"}: {summary.win_rate(name):.1%}')
+    for unit_type, rate in summary.unit_win_rates().items():
+        print(f'{unit_type}: won {rate:.1%} of its games')
+
+if __name__ == "__main__":
+    """
+    Standard python boilerplate.
+    """
+    # This is executed when run from the command line
+    main()
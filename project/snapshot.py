@@ -0,0 +1,350 @@
+import struct
+
+from action import COIN_TYPES, SOLDIER_TYPES
+from bitboard import BitBoard, TYPE_INDEX
+from board import Board
+from cell import Cell, Unit, Royal, EMPTY, FREE_CONTROL, COIN_CLASSES
+from config import BoardConfig, board_config
+from events import EventSink, TERMINAL
+from player import Player, MAX_NAME_SIZE
+
+# Byte of a missing seat or unit type
+NONE: int = 0xFF
+
+# Number of (unit type, no. of coins) slots of the bag, the hand and the assigned units, and coins of the discard pile
+STACK_SLOTS: int = len(COIN_TYPES)
+ASSIGNED_SLOTS: int = len(SOLDIER_TYPES)
+DISCARD_SLOTS: int = 16
+
+# Bytes of the name of a player, the longest name Player accepts
+NAME_SIZE: int = MAX_NAME_SIZE
+
+# Layout of a player: name, symbol, control tokens, has initiative, initiative count, the (unit type, no. of coins)
+# stacks of the bag and of the hand in the order of their CoinBag, the unit types of the discard pile from the first
+# discarded, and the (unit type, no. of coins) stacks of the assigned units in assignment order. Empty slots are NONE.
+PLAYER_FORMAT: str = f'{NAME_SIZE}s1sBBB{2 * STACK_SLOTS}B{2 * STACK_SLOTS}B{DISCARD_SLOTS}B{2 * ASSIGNED_SLOTS}B'
+PLAYER_FIELDS: int = 5 + 4 * STACK_SLOTS + DISCARD_SLOTS + 2 * ASSIGNED_SLOTS
+
+# Layout of the start of every state: rows, cols, seat of the player that has to act
+HEADER: struct.Struct = struct.Struct('<BBB')
+
+# Codes of the contents of a cell, the unit in the low 4 bits and the previous unit in the high 4 bits:
+# empty, free control zone, control zone of each seat, then the soldiers of seat 0 and of seat 1 by TYPE_INDEX
+EMPTY_CODE: int = 0
+FREE_CODE: int = 1
+CONTROL_CODE: int = 2
+SOLDIER_CODE: int = 4
+
+# Letters of the one-line notation
+COIN_LETTERS: dict = {'Archer': 'A', 'Knight': 'K', 'Mercenary': 'M', 'Berserker': 'B', 'Royal': 'R'}
+LETTER_COINS: dict = {letter: unit_type for unit_type, letter in COIN_LETTERS.items()}
+ZONE_LETTERS: str = '.@Zz'
+
+# Layouts already built for each board size
+_layouts: dict = {}
+
+def get_layout(rows: int, cols: int) -> struct.Struct:
+    """
+    Returns the fixed layout of the states of a board size, building it the first time it is requested: the header,
+    both players and one byte per square.
+
+    Args:
+        rows: The number of rows in the board.
+        cols: The number of columns in the board.
+
+    Returns:
+        The shared struct.Struct class object.
+    """
+    layout: struct.Struct = _layouts.get((rows, cols))
+    if layout is None:
+        layout = _layouts[(rows, cols)] = struct.Struct(f'<BBB{PLAYER_FORMAT}{PLAYER_FORMAT}{rows * cols}s')
+    return layout
+
+def state_size(config: BoardConfig) -> int:
+    """
+    Returns the number of bytes of a state on a board, the same for every position.
+    """
+    return get_layout(config.rows, config.cols).size
+
+def cell_code(board: Board, unit: Unit) -> int:
+    """
+    Returns the code of a Unit class object of a cell, see SOLDIER_CODE.
+    """
+    if unit is EMPTY:
+        return EMPTY_CODE
+    if unit is FREE_CONTROL:
+        return FREE_CODE
+    seat: int = board.seats[unit.player]
+    if unit.unit_type == 'Control':
+        return CONTROL_CODE + seat
+    return SOLDIER_CODE + seat * len(SOLDIER_TYPES) + TYPE_INDEX[unit.unit_type]
+
+def make_coin(unit_type: str, player: Player) -> Unit:
+    """
+    Creates the Unit class object of a coin of the player.
+    """
+    return Royal() if unit_type == 'Royal' else COIN_CLASSES[unit_type](player)
+
+def stack_fields(stacks: list, slots: int) -> list:
+    """
+    Flattens (unit type, no. of coins) pairs into the bytes of their slots.
+    """
+    if len(stacks) > slots:
+        raise ValueError(f'At most {slots} unit types can be stored, got {stacks}')
+    fields: list = []
+    for unit_type, count in stacks:
+        fields += (COIN_TYPES.index(unit_type), count)
+    return fields + [NONE] * (2 * (slots - len(stacks)))
+
+def player_fields(player: Player) -> list:
+    """
+    Returns the values of the layout of a player, see PLAYER_FORMAT.
+    """
+    name: bytes = player.name.encode()
+    if len(name) > NAME_SIZE or len(player.symbol.encode()) != 1:
+        raise ValueError(f'Names of up to {NAME_SIZE} bytes and symbols of one byte can be stored')
+    if len(player.discarded) > DISCARD_SLOTS:
+        raise ValueError(f'At most {DISCARD_SLOTS} discarded coins can be stored')
+    discarded: list = [COIN_TYPES.index(coin.unit_type) for coin in player.discarded]
+    return [
+        name, player.symbol.encode(), player.control_tokens, player.has_initiative, player.initiative_count,
+        *stack_fields([(unit_type, len(stack)) for unit_type, stack in player.bag.stacks.items()], STACK_SLOTS),
+        *stack_fields([(unit_type, len(stack)) for unit_type, stack in player.hand.stacks.items()], STACK_SLOTS),
+        *discarded, *[NONE] * (DISCARD_SLOTS - len(discarded)),
+        *stack_fields([(unit_type, len(stack)) for unit_type, stack in player.assigned_units.items()], ASSIGNED_SLOTS),
+    ]
+
+def pack_into(buffer, offset: int, board: Board, turn: Player = None) -> int:
+    """
+    Writes the whole game state into a writable buffer, e.g: a bytearray or the memoryview of a shared memory block,
+    so that another process can read it with unpack_from() without any object being pickled.
+
+    Args:
+        buffer: The writable buffer.
+        offset: The index of the first byte to write.
+        board: The Board class object, along with its players.
+        turn: Optional Player class object of the player that has to act.
+
+    Returns:
+        The index after the last byte written.
+    """
+    rows, cols = board.config.rows, board.config.cols
+    crow, wolf = board.seats
+    grid: bytes = bytes(
+        cell_code(board, cell.unit) | cell_code(board, cell.previous_unit) << 4 for row in board.grid for cell in row
+    )
+    layout: struct.Struct = get_layout(rows, cols)
+    layout.pack_into(
+        buffer, offset, rows, cols, NONE if turn is None else board.seats[turn], *player_fields(crow),
+        *player_fields(wolf), grid
+    )
+    return offset + layout.size
+
+def to_bytes(board: Board, turn: Player = None) -> bytes:
+    """
+    Returns the whole game state in the fixed layout of its board size, see pack_into().
+    """
+    buffer: bytearray = bytearray(state_size(board.config))
+    pack_into(buffer, 0, board, turn)
+    return bytes(buffer)
+
+def read_stacks(fields: tuple, player: Player) -> list:
+    """
+    Creates the coins of (unit type, no. of coins) slots.
+
+    Returns:
+        List of (unit_type, [Unit class objects]) pairs, in slot order.
+    """
+    return [
+        (COIN_TYPES[fields[index]], [make_coin(COIN_TYPES[fields[index]], player) for _ in range(fields[index + 1])])
+        for index in range(0, len(fields), 2) if fields[index] != NONE
+    ]
+
+def read_player(player: Player, fields: tuple) -> None:
+    """
+    Sets the coins, control tokens and initiative of a player from the values of its layout, see PLAYER_FORMAT.
+    """
+    _, _, player.control_tokens, has_initiative, player.initiative_count = fields[:5]
+    player.has_initiative = bool(has_initiative)
+    start: int = 5
+    for bag in (player.bag, player.hand):
+        for unit_type, coins in read_stacks(fields[start:start + 2 * STACK_SLOTS], player):
+            # Empty stacks are kept too, the order of the stacks decides which coin a random number draws
+            bag.stacks.setdefault(unit_type, [])
+            for coin in coins:
+                bag.append(coin)
+        start += 2 * STACK_SLOTS
+    player.discarded.extend(
+        make_coin(COIN_TYPES[index], player) for index in fields[start:start + DISCARD_SLOTS] if index != NONE
+    )
+    start += DISCARD_SLOTS
+    player.assigned_units.update(read_stacks(fields[start:start + 2 * ASSIGNED_SLOTS], player))
+
+def unpack_from(buffer, offset: int = 0, events: EventSink = TERMINAL) -> tuple:
+    """
+    Rebuilds a game state written by pack_into() or to_bytes(), e.g: from a bytes object or a memoryview.
+
+    Args:
+        buffer: The buffer to read from.
+        offset: The index of the first byte of the state.
+        events: The EventSink class object of the new board and players.
+
+    Returns:
+        Tuple containing the (Board, Player that has to act or None). The players are the keys of Board.seats.
+    """
+    rows, cols, _ = HEADER.unpack_from(buffer, offset)
+    values: tuple = get_layout(rows, cols).unpack_from(buffer, offset)
+    players: list = []
+    for seat in (0, 1):
+        fields: tuple = values[3 + seat * PLAYER_FIELDS:3 + (seat + 1) * PLAYER_FIELDS]
+        player: Player = Player(fields[0].rstrip(b'\0').decode(), fields[1].decode(), events=events)
+        read_player(player, fields)
+        players.append(player)
+    board: Board = Board(*players, board_config(rows, cols), events)
+    load_grid(board, values[-1])
+    turn: int = values[2]
+    return board, None if turn == NONE else players[turn]
+
+def from_bytes(data: bytes, events: EventSink = TERMINAL) -> tuple:
+    """
+    Rebuilds a game state returned by to_bytes(), see unpack_from().
+    """
+    return unpack_from(data, 0, events)
+
+def load_grid(board: Board, codes) -> None:
+    """
+    Replaces the units and control zones of a new board with the ones of the cell codes, one per square, and rebuilds
+    its BitBoard and Zobrist keys.
+    """
+    players: tuple = tuple(board.seats)
+    markers: list = [EMPTY, FREE_CONTROL, board.controls[players[0]], board.controls[players[1]]]
+    # The masks are built directly and the reach computed once at the end, instead of after every zone and unit
+    bits: BitBoard = BitBoard(board.config.rows, board.config.cols)
+    for square, code in enumerate(codes):
+        cell: Cell = board.grid[square // board.cols][square % board.cols]
+        if not code:
+            cell.unit = cell.previous_unit = EMPTY
+            continue
+        unit_code, zone = code & 0xF, code >> 4
+        bit: int = 1 << square
+        cell.previous_unit = markers[zone]
+        if unit_code < SOLDIER_CODE:
+            cell.unit = markers[unit_code]
+            zone = unit_code
+        else:
+            seat, unit_type = divmod(unit_code - SOLDIER_CODE, len(SOLDIER_TYPES))
+            cell.unit = COIN_CLASSES[SOLDIER_TYPES[unit_type]](players[seat])
+            bits.units[seat][unit_type] |= bit
+            bits.occupied[seat] |= bit
+        if zone != EMPTY_CODE:
+            bits.zones |= bit
+            if zone != FREE_CODE:
+                bits.owned[zone - CONTROL_CODE] |= bit
+    bits.update_reach(0)
+    bits.update_reach(1)
+    board.bits = bits
+    board.rehash()
+
+def notation(board: Board, turn: Player = None) -> str:
+    """
+    Returns the one-line notation of a game state, meant to be read and written by hand for test fixtures:
+    '<rows>x<cols> <grid> <CROW> <WOLF> <seat of the player that has to act or ->'.
+
+    The grid has the rows separated by '/', with two characters per square: the unit ('.', uppercase letters for
+    seat 0 and lowercase for seat 1) and the control zone ('.', '@' free, 'Z' of seat 0, 'z' of seat 1). Each player
+    is 'name:symbol:control tokens:has initiative:initiative count:bag:hand:discard pile:assigned units', where the
+    coins are letters of COIN_LETTERS and the assigned units are letters followed by the number of coins left, e.g:
+    'CROW:s:3:0:0:AAKR:KAR:-:A2K3'. Empty coin zones are written '-'.
+
+    Args:
+        board: The Board class object, along with its players.
+        turn: Optional Player class object of the player that has to act.
+
+    Returns:
+        The notation of the state.
+    """
+    rows: list = []
+    for row in board.grid:
+        squares: str = ''
+        for cell in row:
+            zone: Unit = cell.previous_unit if cell.unit.unit_type in COIN_LETTERS else cell.unit
+            squares += unit_letter(board, cell.unit) + ZONE_LETTERS[cell_code(board, zone)]
+        rows.append(squares)
+    players: list = [player_notation(player) for player in board.seats]
+    seat: str = '-' if turn is None else str(board.seats[turn])
+    return f'{board.config.rows}x{board.config.cols} {"/".join(rows)} {players[0]} {players[1]} {seat}'
+
+def unit_letter(board: Board, unit: Unit) -> str:
+    """
+    Returns the character of the unit of a square, see notation().
+    """
+    letter: str = COIN_LETTERS.get(unit.unit_type)
+    if letter is None:
+        return '.'
+    return letter if board.seats[unit.player] == 0 else letter.lower()
+
+def player_notation(player: Player) -> str:
+    """
+    Returns the notation of a player, see notation().
+    """
+    if ':' in player.name or ' ' in player.name:
+        raise ValueError(f'Player names with spaces or colons can not be written, got {player.name}')
+    zones: list = [
+        ''.join(COIN_LETTERS[coin.unit_type] for coin in coins) or '-'
+        for coins in (player.bag, player.hand, player.discarded)
+    ]
+    assigned: str = ''.join(
+        f'{COIN_LETTERS[unit_type]}{len(stack)}' for unit_type, stack in player.assigned_units.items()
+    ) or '-'
+    return ':'.join((
+        player.name, player.symbol, str(player.control_tokens), str(int(player.has_initiative)),
+        str(player.initiative_count), *zones, assigned
+    ))
+
+def from_notation(text: str, events: EventSink = TERMINAL) -> tuple:
+    """
+    Rebuilds a game state written by notation().
+
+    Args:
+        text: The notation of the state.
+        events: The EventSink class object of the new board and players.
+
+    Returns:
+        Tuple containing the (Board, Player that has to act or None). The players are the keys of Board.seats.
+    """
+    size, grid, *sides, seat = text.split()
+    rows, cols = map(int, size.split('x'))
+    players: list = []
+    for side in sides:
+        name, symbol, tokens, has_initiative, initiative_count, bag, hand, discarded, assigned = side.split(':')
+        player: Player = Player(name, symbol, events=events)
+        player.control_tokens, player.initiative_count = int(tokens), int(initiative_count)
+        player.has_initiative = has_initiative == '1'
+        for zone, letters in ((player.bag, bag), (player.hand, hand), (player.discarded, discarded)):
+            for letter in letters.strip('-'):
+                zone.append(make_coin(LETTER_COINS[letter], player))
+        assigned = assigned.strip('-')
+        for index in range(0, len(assigned), 2):
+            unit_type: str = LETTER_COINS[assigned[index]]
+            player.assigned_units[unit_type] = [make_coin(unit_type, player) for _ in range(int(assigned[index + 1]))]
+        players.append(player)
+
+    board: Board = Board(*players, board_config(rows, cols), events)
+    codes: list = []
+    for squares in grid.split('/'):
+        if len(squares) != 2 * cols:
+            raise ValueError(f'Expected {cols} squares in the row {squares}')
+        for index in range(0, len(squares), 2):
+            letter, zone = squares[index], ZONE_LETTERS.index(squares[index + 1])
+            if letter == '.':
+                codes.append(zone)
+            else:
+                unit_code: int = (
+                    SOLDIER_CODE + (len(SOLDIER_TYPES) if letter.islower() else 0)
+                    + TYPE_INDEX[LETTER_COINS[letter.upper()]]
+                )
+                codes.append(unit_code | zone << 4)
+    if len(codes) != rows * cols:
+        raise ValueError(f'Expected {rows} rows in the grid {grid}')
+    load_grid(board, codes)
+    return board, None if seat == '-' else players[int(seat)]
@@ -0,0 +1,133 @@
+import math
+import random
+import time
+import unittest
+from player import Player
+from action import CONTROL
+from agent import AlphaBetaAgent, ExpectimaxAgent, RandomAgent
+from main import swap_turns
+from test_board import new_game, random_turns, fingerprint
+
+class TestAgent(unittest.TestCase):
+    def test_chooses_legal_action_and_restores_board(self):
+        board, crow, wolf = new_game(3)
+        agent: AlphaBetaAgent = AlphaBetaAgent(budget=0.05)
+        for i, player in enumerate(random_turns(board, crow, wolf, 8)):
+            if i % 4:
+                continue
+            before: tuple = fingerprint(board, (crow, wolf))
+            key: int = board.position_key(player)
+            action = agent.choose_action(board, player)
+            self.assertIn(action, board.legal_actions(player))
+            self.assertEqual(fingerprint(board, (crow, wolf)), before)
+            self.assertEqual(board.position_key(player), key)
+            self.assertEqual(board.history, [])
+            self.assertGreater(agent.nodes, 0)
+
+    def test_takes_winning_control(self):
+        board, crow, wolf = new_game(5)
+        agent: AlphaBetaAgent = AlphaBetaAgent(budget=0.5)
+        for player in random_turns(board, crow, wolf, 30):
+            winning: list = [action for action in board.legal_actions(player) if action.kind == CONTROL]
+            if not winning:
+                continue
+            player.control_tokens = 1
+            action = agent.choose_action(board, player)
+            self.assertEqual(action.kind, CONTROL)
+            self.assertGreater(agent.value, 0)
+            return
+        self.fail('No position with a control action was reached')
+
+    def test_time_budget(self):
+        board, crow, wolf = new_game(7)
+        agent: AlphaBetaAgent = AlphaBetaAgent(budget=0.1)
+        crow.get_hand()
+        agent.choose_action(board, crow)
+        # The search checks the clock every few hundred nodes
+        self.assertLess(agent.elapsed, 0.1 / 3 + 0.1)
+        self.assertGreater(agent.depth, 0)
+
+    def test_turn_within_budget(self):
+        board, crow, wolf = new_game(7)
+        agent: AlphaBetaAgent = AlphaBetaAgent(budget=0.3)
+        crow.get_hand()
+        start: float = time.perf_counter()
+        while crow.hand:
+            self.assertTrue(board.apply_action(crow, agent.choose_action(board, crow)))
+        # The last action only gets what the first two left, plus the few hundred nodes between clock checks
+        self.assertLess(time.perf_counter() - start, 0.3 + 0.05)
+
+    def test_end_turn_matches_swap_turns(self):
+        for has_initiative in (False, True):
+            for initiative_count in (0, 1):
+                board, crow, wolf = new_game(1)
+                crow.has_initiative, crow.initiative_count = has_initiative, initiative_count
+                state: tuple = (crow.has_initiative, crow.initiative_count)
+                next_player: Player = board.push_end_turn(crow)
+                after: tuple = (crow.has_initiative, crow.initiative_count)
+                board.pop()
+                self.assertEqual((crow.has_initiative, crow.initiative_count), state)
+                self.assertIs(swap_turns(crow, crow, wolf), next_player)
+                self.assertEqual((crow.has_initiative, crow.initiative_count), after)
+
+    def test_push_draw(self):
+        board, crow, wolf = new_game(2)
+        before: tuple = fingerprint(board, (crow, wolf))
+        key: int = board.position_key()
+        self.assertTrue(board.push_draw(crow, random.Random(0)))
+        self.assertEqual(len(crow.hand), 3)
+        scratch: int = crow.key
+        crow.rehash()
+        self.assertEqual(crow.key, scratch)
+        board.pop()
+        self.assertEqual(fingerprint(board, (crow, wolf)), before)
+        self.assertEqual(board.position_key(), key)
+
+    def test_alpha_beta_beats_random(self):
+        board, crow, wolf = new_game(11)
+        agents: dict = {crow: AlphaBetaAgent(budget=0.05), wolf: RandomAgent(11)}
+        player: Player = crow
+        for _ in range(40):
+            if not player.get_hand():
+                break
+            while player.hand:
+                self.assertTrue(board.apply_action(player, agents[player].choose_action(board, player)))
+            if player.control_tokens == 0:
+                break
+            player = board.end_turn(player)
+        self.assertEqual(crow.control_tokens, 0)
+
+    def test_expectimax_restores_board(self):
+        board, crow, wolf = new_game(4)
+        agent: ExpectimaxAgent = ExpectimaxAgent(budget=0.05)
+        for i, player in enumerate(random_turns(board, crow, wolf, 8)):
+            if i % 3:
+                continue
+            before: tuple = fingerprint(board, (crow, wolf))
+            key: int = board.position_key(player)
+            action = agent.choose_action(board, player)
+            self.assertIn(action, board.legal_actions(player))
+            self.assertEqual(fingerprint(board, (crow, wolf)), before)
+            self.assertEqual(board.position_key(player), key)
+            self.assertEqual(board.history, [])
+
+    def test_star1_matches_full_expectimax(self):
+        board, crow, wolf = new_game(6)
+        searched: int = 0
+        for player in random_turns(board, crow, wolf, 12):
+            if len(player.hand) != 1:
+                continue
+            agents: list = [ExpectimaxAgent(max_depth=3, pruning=pruning) for pruning in (True, False)]
+            for agent in agents:
+                agent.search(board, player, math.inf)
+            pruned, full = agents
+            # Pruning never changes the value, it only skips nodes
+            self.assertEqual(pruned.value, full.value)
+            self.assertLessEqual(pruned.nodes, full.nodes)
+            self.assertGreater(full.chance_nodes, 0)
+            self.assertEqual(full.chance_cutoffs, 0)
+            searched += 1
+        self.assertGreater(searched, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import random
+import unittest
+from action import Action, COIN_TYPES, CONTROL, MOVE, PLACE
+from cell import Archer, Knight
+from coins import CoinBag
+from player import Player
+from test_board import new_game
+from config import BoardConfig, SMALL_BOARD, FULL_BOARD
+
+try:
+    import numpy as np
+    from batch import BatchEngine, COINS, PLAYING, STOPPED
+except ImportError:
+    np = None
+
+def hand_counts(player: Player) -> list:
+    """
+    Counts the coins of each type in the player hand.
+    """
+    return [sum(coin.unit_type == unit_type for coin in player.hand) for unit_type in COIN_TYPES]
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestBatchEngine(unittest.TestCase):
+    def test_matches_scalar_engine(self):
+        self.check_matches_scalar_engine(SMALL_BOARD, 24)
+
+    def test_matches_scalar_engine_on_full_board(self):
+        self.check_matches_scalar_engine(FULL_BOARD, 8)
+
+    def check_matches_scalar_engine(self, config: BoardConfig, count: int):
+        """
+        Plays random games with the scalar engine and follows them with a BatchEngine, comparing the legal actions
+        and the whole state after every action.
+        """
+        games: list = [new_game(seed, config) for seed in range(count)]
+        rng: random.Random = random.Random(0)
+        players: list = [crow if rng.random() < 0.5 else wolf for _, crow, wolf in games]
+        engine: BatchEngine = BatchEngine.from_boards([(board, player) for (board, _, _), player in zip(games, players)])
+        hands: np.ndarray = np.zeros((len(games), COINS), dtype=np.int8)
+        winners: list = [PLAYING] * len(games)
+        for game, ((board, _, _), player) in enumerate(zip(games, players)):
+            board.draw(player, rng)
+            hands[game] = hand_counts(player)
+        engine.draw(np.arange(len(games)), hands)
+
+        for _ in range(400):
+            if all(winner != PLAYING for winner in winners):
+                break
+            mask: np.ndarray = engine.legal_mask()
+            actions: np.ndarray = np.full(len(games), -1)
+            for game, (board, _, _) in enumerate(games):
+                if winners[game] != PLAYING:
+                    self.assertFalse(mask[:, game].any())
+                    continue
+                player: Player = players[game]
+                legal: list = board.legal_actions(player)
+                self.assertEqual({engine.catalog.actions[i] for i in np.flatnonzero(mask[:, game])}, set(legal))
+                action = rng.choice(legal)
+                actions[game] = engine.catalog.index[action]
+                self.assertTrue(board.apply_action(player, action))
+                if player.hand:
+                    continue
+                # Same turn order as play_game()
+                if player.control_tokens == 0:
+                    winners[game] = board.seats[player]
+                    continue
+                player = players[game] = board.end_turn(player)
+                if not board.draw(player, rng):
+                    winners[game] = 1 - board.seats[player]
+                hands[game] = hand_counts(player)
+            engine.step(actions, hands)
+
+            expected: BatchEngine = BatchEngine.from_boards([(board, player) for (board, _, _), player in zip(games, players)])
+            for game in range(len(games)):
+                self.assertEqual(engine.state(game)[:-1], expected.state(game)[:-1])
+            self.assertEqual(engine.winner.tolist(), winners)
+        self.assertNotIn(PLAYING, winners)
+
+    def test_control_needs_tokens(self):
+        board, crow, _ = new_game(0)
+        crow.hand = CoinBag([Knight(crow), Knight(crow), Archer(crow)])
+        # A knight over the free control point (2, 2)
+        self.assertTrue(board.apply_action(crow, Action(PLACE, 'Knight', end=(1, 2))))
+        self.assertTrue(board.apply_action(crow, Action(MOVE, 'Knight', (1, 2), (2, 2))))
+        for tokens in (1, 0):
+            crow.control_tokens = tokens
+            engine: BatchEngine = BatchEngine.from_boards([(board, crow)])
+            legal: set = {engine.catalog.actions[index] for index in np.flatnonzero(engine.legal_mask()[:, 0])}
+            self.assertEqual(legal, set(board.legal_actions(crow)))
+            self.assertEqual(Action(CONTROL, 'Archer', end=(2, 2)) in legal, tokens > 0)
+
+    def test_random_rollout(self):
+        engine: BatchEngine = BatchEngine(200, seed=1)
+        winners: np.ndarray = engine.rollout(max_turns=300)
+        self.assertTrue(np.isin(winners, (0, 1, STOPPED)).all())
+        # Coins are never created or lost, only placed on the board or removed by an attack
+        coins: np.ndarray = engine.hand.sum(axis=2) + engine.bag.sum(axis=2) + engine.discarded + engine.recruitment.sum(axis=2)
+        self.assertTrue((coins <= 11).all())
+        self.assertTrue(((engine.tokens >= 0) & (engine.tokens <= 3)).all())
+        self.assertTrue((engine.tokens[np.arange(200)[winners < 2], winners[winners < 2]] == 0).any())
+
+    def test_same_seed_same_games(self):
+        first: np.ndarray = BatchEngine(50, seed=3).rollout()
+        self.assertEqual(first.tolist(), BatchEngine(50, seed=3).rollout().tolist())
+
+    def test_setup(self):
+        engine: BatchEngine = BatchEngine(100, seed=2)
+        self.assertTrue((engine.hand.sum(axis=2)[np.arange(100), engine.turn] == 3).all())
+        self.assertTrue((engine.assigned.sum(axis=2) == 2).all())
+        # The players never share a unit type
+        self.assertFalse((engine.assigned[:, 0] & engine.assigned[:, 1]).any())
+
+if __name__ == '__main__':
+    unittest.main()
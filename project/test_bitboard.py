@@ -0,0 +1,77 @@
+import random
+import unittest
+
+from bitboard import BitBoard, TYPE_INDEX, get_bit_tables, squares_of
+from test_board import new_game, random_turns
+
+def grid_masks(board) -> tuple:
+    """
+    Builds the occupied and owned masks of a board by scanning its grid.
+    """
+    occupied, owned = [0, 0], [0, 0]
+    for row in board.grid:
+        for cell in row:
+            bit: int = 1 << board.square((cell.row, cell.col))
+            unit, previous = cell.unit, cell.previous_unit
+            if unit.unit_type not in ('Empty', 'Control'):
+                occupied[board.seats[unit.player]] |= bit
+            control = unit if unit.unit_type == 'Control' else previous
+            if control.unit_type == 'Control' and control.player is not None:
+                owned[board.seats[control.player]] |= bit
+    return occupied, owned
+
+class TestBitBoard(unittest.TestCase):
+    def setUp(self):
+        self.bits = BitBoard(5, 5)
+        self.bits.add_zone(2, 0)
+        self.bits.add_zone(22, 1)
+        self.bits.add_zone(12)
+
+    def test_orthogonal_does_not_wrap(self):
+        tables = get_bit_tables(5, 5)
+        # (0, 4) is next to (0, 3) and (1, 4), but not to (1, 0)
+        self.assertEqual(squares_of(tables.orthogonal(1 << 4)), [3, 9])
+        self.assertEqual(squares_of(tables.orthogonal(1 << 12)), [7, 11, 13, 17])
+
+    def test_placement_mask(self):
+        self.assertEqual(squares_of(self.bits.placement_mask(0)), [1, 3, 7])
+        # A zone with an opponent unit over it can't be used to place units
+        self.bits.place(1, TYPE_INDEX['Knight'], 2)
+        self.assertEqual(self.bits.placement_mask(0), 0)
+
+    def test_control_and_copy(self):
+        copy: BitBoard = self.bits.copy()
+        self.bits.place(0, TYPE_INDEX['Archer'], 12)
+        self.assertEqual(squares_of(self.bits.control_mask(0)), [12])
+        self.bits.control(0, 12)
+        self.assertEqual(self.bits.control_mask(0), 0)
+        self.assertEqual(squares_of(self.bits.covered), [12])
+
+        # The copy is independent
+        self.assertEqual(copy.occupied, [0, 0])
+        self.assertEqual(squares_of(copy.owned[0]), [2])
+
+    def test_masks_follow_grid(self):
+        board, crow, wolf = new_game(11)
+        for _ in random_turns(board, crow, wolf, 30):
+            occupied, owned = grid_masks(board)
+            self.assertEqual(board.bits.occupied, occupied)
+            self.assertEqual(board.bits.owned, owned)
+
+    def test_reach_is_incremental(self):
+        board, crow, wolf = new_game(12)
+        bits: BitBoard = board.bits
+        for player in random_turns(board, crow, wolf, 40):
+            # Also after undoing every legal action
+            for action in board.legal_actions(player)[::3]:
+                board.push(player, action)
+                board.pop()
+            for seat in (0, 1):
+                self.assertEqual(bits.reach[seat], bits.tables.orthogonal(bits.placement_sources(seat)))
+            board.push(player, random.choice(board.legal_actions(player)))
+            for seat in (0, 1):
+                self.assertEqual(bits.reach[seat], bits.tables.orthogonal(bits.placement_sources(seat)))
+            board.pop()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,90 @@
+import copy
+import random
 import unittest
 from unittest.mock import patch
 from player import Player
 from board import Board
 from cell import Cell, Unit, Knight, Archer, Mercenary, Berserker
+from coins import CoinBag
+from action import Action, MOVE, RECRUIT, PLACE, ATTACK, CONTROL, INITIATIVE
+from main import initialize_player
+from config import BoardConfig, SMALL_BOARD, FULL_BOARD
+
+def new_game(seed: int, config: BoardConfig = SMALL_BOARD) -> tuple:
+    """
+    Creates a board with two randomly initialized players.
+    """
+    random.seed(seed)
+    units: list[tuple] = [('Archer', 4), ('Knight', 5), ('Mercenary', 5), ('Berserker', 4)]
+    crow: Player = initialize_player(Player('Crow', 's'), units)
+    wolf: Player = initialize_player(Player('Wolf', 'v'), units)
+    return Board(crow, wolf, config), crow, wolf
+
+def random_turns(board: Board, crow: Player, wolf: Player, turns: int):
+    """
+    Plays random legal actions, yielding the current player before every action.
+    """
+    for turn in range(turns):
+        player: Player = crow if turn % 2 == 0 else wolf
+        if not player.get_hand():
+            return
+        while player.hand:
+            yield player
+            board.apply_action(player, random.choice(board.legal_actions(player)))
+
+def brute_force_actions(board: Board, player: Player) -> set:
+    """
+    Tries every possible action with apply_action() and returns the ones that were accepted. The second target of an
+    attack is only tried within two squares of the attacker, the longest range of any unit.
+    """
+    squares: list = [(row, col) for row in range(len(board.grid)) for col in range(board.cols)]
+    candidates: list = []
+    for piece in {coin.unit_type for coin in player.hand}:
+        candidates.append(Action(INITIATIVE, piece))
+        for unit_type in ('Archer', 'Knight', 'Mercenary', 'Berserker'):
+            candidates.append(Action(RECRUIT, piece, recruit=unit_type))
+        for end in squares:
+            candidates.append(Action(PLACE, piece, end=end))
+            candidates.append(Action(CONTROL, piece, end=end))
+            for start in squares:
+                candidates.append(Action(MOVE, piece, start, end))
+                candidates.append(Action(ATTACK, piece, start, end))
+                if piece == 'Berserker' and max(abs(start[0] - end[0]), abs(start[1] - end[1])) <= 2:
+                    for second in squares:
+                        if second > end and max(abs(start[0] - second[0]), abs(start[1] - second[1])) <= 2:
+                            candidates.append(Action(ATTACK, piece, start, end, extra_targets=(second,)))
+
+    accepted: set = set()
+    snapshot: tuple = (board, player)
+    board, player = copy.deepcopy(snapshot)
+    for action in candidates:
+        if board.apply_action(player, action):
+            accepted.add(action)
+            board, player = copy.deepcopy(snapshot)
+    return accepted
+
+def fingerprint(board: Board, players: tuple) -> tuple:
+    """
+    Captures the whole state of a game, using the identity of the Unit class objects.
+    """
+    cells: tuple = tuple((id(cell.unit), id(cell.previous_unit)) for row in board.grid for cell in row)
+    bits: tuple = (tuple(map(tuple, board.bits.units)), tuple(board.bits.occupied), board.bits.zones, tuple(board.bits.owned))
+    coins: tuple = tuple(
+        (
+            tuple(map(id, player.hand)), tuple(map(id, player.bag)), tuple(map(id, player.discarded)),
+            tuple((unit_type, tuple(map(id, units))) for unit_type, units in player.assigned_units.items()),
+            player.control_tokens, player.has_initiative, player.initiative_count,
+        )
+        for player in players
+    )
+    return cells, bits, coins
 
 class TestBoard(unittest.TestCase):
     def setUp(self):
         self.crow = Player('Crow', 'C')
-        self.crow.hand = [Knight(self.crow), Knight(self.crow), Archer(self.crow)]
+        self.crow.hand = CoinBag([Knight(self.crow), Knight(self.crow), Archer(self.crow)])
         self.wolf = Player('Wolf', 'W')
-        self.wolf.hand = [Mercenary(self.wolf), Mercenary(self.wolf), Berserker(self.wolf)]
+        self.wolf.hand = CoinBag([Mercenary(self.wolf), Mercenary(self.wolf), Berserker(self.wolf)])
         self.board = Board(self.crow, self.wolf)
 
     def test_control_points(self):
@@ -73,6 +148,163 @@ class TestBoard(unittest.TestCase):
         # Assert is none as it shouldn't place the unit in that position
         self.board.place(self.crow)
         self.assertIsNone(self.board.grid[0][1].unit.player)
+
+    def test_apply_place_and_move(self):
+        # Place a knight next to the crow control point and move it onto a free control point
+        self.assertTrue(self.board.apply_action(self.crow, Action(PLACE, 'Knight', end=(1, 2))))
+        self.assertEqual(self.board.grid[1][2].unit.unit_type, 'Knight')
+        self.assertEqual(len(self.crow.hand), 2)
+
+        self.assertTrue(self.board.apply_action(self.crow, Action(MOVE, 'Knight', (1, 2), (2, 2))))
+        self.assertEqual(self.board.grid[2][2].unit.unit_type, 'Knight')
+        self.assertEqual(self.board.grid[2][2].previous_unit.unit_type, 'Control')
+        self.assertEqual(self.board.grid[1][2].unit.unit_type, 'Empty')
+        self.assertEqual(len(self.crow.discarded), 1)
+
+    def test_apply_invalid_action_leaves_state(self):
+        # Not orthogonal to a crow control point
+        result = self.board.apply_action(self.crow, Action(PLACE, 'Knight', end=(3, 3)))
+        self.assertFalse(result)
+        self.assertTrue(result.message)
+        self.assertEqual(len(self.crow.hand), 3)
+
+        # Piece not in hand
+        self.assertFalse(self.board.apply_action(self.crow, Action(INITIATIVE, 'Berserker')))
+        self.assertFalse(self.crow.has_initiative)
+
+        # Moving the wrong unit type does not discard the coin
+        self.board.apply_action(self.crow, Action(PLACE, 'Archer', end=(0, 1)))
+        self.assertFalse(self.board.apply_action(self.crow, Action(MOVE, 'Knight', (0, 1), (1, 1))))
+        self.assertEqual(len(self.crow.hand), 2)
+
+    def test_apply_attack_and_control(self):
+        self.board.apply_action(self.crow, Action(PLACE, 'Knight', end=(1, 2)))
+        self.board.apply_action(self.wolf, Action(PLACE, 'Mercenary', end=(3, 2)))
+        self.board.apply_action(self.wolf, Action(MOVE, 'Mercenary', (3, 2), (2, 2)))
+
+        # The knight attacks the mercenary standing on the free control point
+        self.assertTrue(self.board.apply_action(self.crow, Action(ATTACK, 'Knight', (1, 2), (2, 2))))
+        self.assertEqual(self.board.grid[2][2].unit.unit_type, 'Control')
+
+        # Control needs one of the player units over the control point
+        self.assertFalse(self.board.apply_action(self.crow, Action(CONTROL, 'Archer', end=(2, 2))))
+        self.crow.hand.append(Knight(self.crow))
+        self.board.apply_action(self.crow, Action(MOVE, 'Knight', (1, 2), (2, 2)))
+        self.assertTrue(self.board.apply_action(self.crow, Action(CONTROL, 'Archer', end=(2, 2))))
+        self.assertEqual(self.crow.control_tokens, 2)
+        self.assertEqual(self.board.grid[2][2].previous_unit.player, self.crow)
+
+    def test_control_needs_tokens(self):
+        self.crow.hand = CoinBag([Knight(self.crow) for _ in range(5)] + [Archer(self.crow), Archer(self.crow)])
+        self.crow.control_tokens = 1
+        # Knights over the free control points (2, 2) and (2, 3)
+        for action in (
+            Action(PLACE, 'Knight', end=(1, 2)), Action(MOVE, 'Knight', (1, 2), (2, 2)),
+            Action(PLACE, 'Knight', end=(0, 3)), Action(MOVE, 'Knight', (0, 3), (1, 3)),
+            Action(MOVE, 'Knight', (1, 3), (2, 3)),
+        ):
+            self.assertTrue(self.board.apply_action(self.crow, action))
+        self.assertTrue(self.board.apply_action(self.crow, Action(CONTROL, 'Archer', end=(2, 2))))
+        self.assertEqual(self.crow.control_tokens, 0)
+
+        # The last token is used up, the other zone can't be controlled in the same hand
+        self.assertNotIn(CONTROL, {action.kind for action in self.board.legal_actions(self.crow)})
+        result = self.board.apply_action(self.crow, Action(CONTROL, 'Archer', end=(2, 3)))
+        self.assertFalse(result)
+        self.assertIn('control tokens', result.message)
+        self.assertEqual(self.crow.control_tokens, 0)
+        self.assertEqual(len(self.crow.hand), 1)
+
+    def test_apply_recruit(self):
+        self.crow.assigned_units = {'Knight': [Knight(self.crow)], 'Archer': [Archer(self.crow)]}
+        # Only the same type (or any type with the Royal coin) can be recruited
+        self.assertFalse(self.board.apply_action(self.crow, Action(RECRUIT, 'Knight', recruit='Archer')))
+        self.assertTrue(self.board.apply_action(self.crow, Action(RECRUIT, 'Knight', recruit='Knight')))
+        self.assertNotIn('Knight', self.crow.assigned_units)
+        self.assertEqual(len(self.crow.bag), 1)
+
+    def test_legal_actions_match_apply_action(self):
+        board, crow, wolf = new_game(3)
+        for i, player in enumerate(random_turns(board, crow, wolf, 16)):
+            actions: list = board.legal_actions(player)
+            # No duplicates and exactly the actions apply_action() accepts
+            self.assertEqual(len(actions), len(set(actions)))
+            if i % 4 == 0:
+                self.assertEqual(set(actions), brute_force_actions(board, player))
+
+    def test_legal_actions_on_full_board(self):
+        board, crow, wolf = new_game(4, FULL_BOARD)
+        for i, player in enumerate(random_turns(board, crow, wolf, 30)):
+            if i % 15 == 0:
+                self.assertEqual(set(board.legal_actions(player)), brute_force_actions(board, player))
+
+    def test_board_config(self):
+        board, crow, wolf = new_game(1, FULL_BOARD)
+        self.assertEqual((len(board.grid), board.cols), (9, 9))
+        self.assertEqual(board.letter_to_num['i'], 8)
+        self.assertEqual(board.grid[0][4].unit.player, crow)
+        self.assertEqual(board.grid[8][4].unit.player, wolf)
+        self.assertEqual(bin(board.bits.zones).count('1'), 2 + len(FULL_BOARD.free_zones))
+        self.assertTrue(board.valid_board_position('i,8'))
+        self.assertFalse(board.valid_board_position('j,0'))
+        with self.assertRaises(ValueError):
+            Board(crow, wolf, BoardConfig(10, 10, (0, 0), (9, 9), ()))
+
+    def test_push_pop_round_trip(self):
+        for seed in range(3):
+            board, crow, wolf = new_game(seed)
+            for player in random_turns(board, crow, wolf, 40):
+                before: tuple = fingerprint(board, (crow, wolf))
+                # Every single legal action is undone exactly
+                for action in board.legal_actions(player):
+                    self.assertTrue(board.push(player, action))
+                    board.pop()
+                    self.assertEqual(fingerprint(board, (crow, wolf)), before)
+
+                # And so is a sequence of actions until the hand is empty
+                pushed: int = 0
+                while player.hand:
+                    board.push(player, random.choice(board.legal_actions(player)))
+                    pushed += 1
+                for _ in range(pushed):
+                    board.pop()
+                self.assertEqual(fingerprint(board, (crow, wolf)), before)
+                self.assertEqual(board.history, [])
+
+    def test_piece_index_matches_scan(self):
+        for seed, config in ((4, SMALL_BOARD), (5, FULL_BOARD)):
+            board, crow, wolf = new_game(seed, config)
+            for player in random_turns(board, crow, wolf, 30):
+                pushed: int = 0
+                while pushed < 3 and player.hand:
+                    board.push(player, random.choice(board.legal_actions(player)))
+                    pushed += 1
+                    self.assert_piece_index(board, (crow, wolf))
+                for _ in range(pushed):
+                    board.pop()
+                    self.assert_piece_index(board, (crow, wolf))
+
+    def assert_piece_index(self, board: Board, players: tuple) -> None:
+        for player in players:
+            scan: dict = {}
+            for row in board.grid:
+                for cell in row:
+                    if cell.unit.player == player and cell.unit.unit_type != 'Control':
+                        scan.setdefault(cell.unit.unit_type, set()).add((cell.row, cell.col))
+            self.assertEqual(board.pieces(player), scan)
+            for unit_type in ('Archer', 'Knight', 'Mercenary', 'Berserker', 'Royal'):
+                self.assertEqual(board.unit_squares(player, unit_type), scan.get(unit_type, set()))
+
+    def test_push_invalid_action(self):
+        self.assertFalse(self.board.push(self.crow, Action(PLACE, 'Knight', end=(3, 3))))
+        self.assertEqual(self.board.history, [])
+
+    def test_legal_actions_reuses_list(self):
+        buffer: list = [Action(INITIATIVE, 'Knight')] * 10
+        actions: list = self.board.legal_actions(self.crow, buffer)
+        self.assertIs(actions, buffer)
+        self.assertIn(Action(PLACE, 'Archer', end=(0, 1)), actions)
+        self.assertNotIn(Action(PLACE, 'Archer', end=(3, 2)), actions)
         
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,9 @@
+import copy
+import pickle
 import unittest
 
-from cell import Unit, Archer
+from cell import Cell, Unit, Archer, Knight, Mercenary, Berserker, Royal, Marker, EMPTY, FREE_CONTROL, UNIT_SPECS, get_unit_tables
+from player import Player
 
 class TestCell(unittest.TestCase):
     def setUp(self):
@@ -43,5 +46,58 @@ class TestCell(unittest.TestCase):
         self.assertFalse(self.archer.attack((2,2), (6,2))) # more than 2 units
         self.assertFalse(self.archer.attack((2,2), (4,3))) # l-shape
 
+    def test_melee_attack(self):
+        for unit in (Knight(), Mercenary(), Berserker()):
+            # Valid tests
+            self.assertTrue(unit.attack((2,2), (1,2))) # up
+            self.assertTrue(unit.attack((2,2), (3,3))) # diagonal
+
+            # Invalid tests
+            self.assertFalse(unit.attack((2,2), (2,2))) # 0 units
+            self.assertFalse(unit.attack((2,2), (0,2))) # two units
+        self.assertEqual(Berserker().no_of_attacks, 2)
+
+    def test_unit_tables(self):
+        tables = get_unit_tables(5, 5)
+        squares = [(row, col) for row in range(5) for col in range(5)]
+        for unit_type in UNIT_SPECS:
+            move, attack = tables[unit_type]
+            for start, (x1, y1) in enumerate(squares):
+                for end, (x2, y2) in enumerate(squares):
+                    dx, dy = abs(x2 - x1), abs(y2 - y1)
+                    # The tables follow the original coordinate rules
+                    self.assertEqual(end in move[start], dx + dy == 1)
+                    if unit_type == 'Archer':
+                        in_range = dx <= 2 and dy <= 2 and (dx == 0 or dy == 0 or dx == dy) and (dx, dy) != (0, 0)
+                    else:
+                        in_range = max(dx, dy) == 1
+                    self.assertEqual(end in attack[start], in_range)
+
+    def test_slots(self):
+        for obj in (Unit(), Archer(), Knight(), Mercenary(), Berserker(), Royal(), EMPTY, Cell()):
+            self.assertFalse(hasattr(obj, '__dict__'))
+        archer: Archer = Archer('player')
+        self.assertEqual((archer.player, archer.unit_type, archer.unit_symbol), ('player', 'Archer', 'A'))
+        self.assertIsNone(Royal().player)
+
+    def test_markers(self):
+        self.assertIs(Cell().unit, EMPTY)
+        self.assertIs(Cell().previous_unit, EMPTY)
+        with self.assertRaises(AttributeError):
+            EMPTY.player = 'player'
+        with self.assertRaises(AttributeError):
+            FREE_CONTROL.unit_type = 'Archer'
+        self.assertEqual((EMPTY.unit_type, FREE_CONTROL.unit_type), ('Empty', 'Control'))
+
+        # Markers without a player stay shared by copies, the others follow the copied player
+        player: Player = Player('Crow', 's')
+        control: Marker = Marker(player, 'Control', 'C')
+        copied_player, copied_control, empty = copy.deepcopy((player, control, EMPTY))
+        self.assertIs(empty, EMPTY)
+        self.assertIs(copied_control.player, copied_player)
+        self.assertIs(copy.copy(control), control)
+        pickled: Marker = pickle.loads(pickle.dumps(control))
+        self.assertEqual((pickled.player.name, pickled.unit_type, pickled.unit_symbol), ('Crow', 'Control', 'C'))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
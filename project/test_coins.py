@@ -0,0 +1,95 @@
+import copy
+import itertools
+import unittest
+from collections import Counter
+
+from cell import Knight, Archer, Mercenary, Royal
+from coins import CoinBag
+
+class ScriptedRandom:
+    """
+    Stands in for a random.Random generator, returning the given numbers in order.
+    """
+    def __init__(self, numbers: tuple) -> None:
+        self.numbers = iter(numbers)
+
+    def randrange(self, stop: int) -> int:
+        number: int = next(self.numbers)
+        assert number < stop
+        return number
+
+def hand_distribution(coins: list, draw) -> Counter:
+    """
+    Draws three coins for every possible sequence of random numbers, which are all equally likely, and counts the
+    hands drawn.
+    """
+    hands: Counter = Counter()
+    size: int = len(coins)
+    for numbers in itertools.product(range(size), range(size - 1), range(size - 2)):
+        hands[draw(coins, ScriptedRandom(numbers))] += 1
+    return hands
+
+def draw_from_list(coins: list, rng: ScriptedRandom) -> tuple:
+    bag: list = list(coins)
+    return tuple(sorted(bag.pop(rng.randrange(len(bag))).unit_type for _ in range(3)))
+
+def draw_from_bag(coins: list, rng: ScriptedRandom) -> tuple:
+    bag: CoinBag = CoinBag(coins)
+    return tuple(sorted(bag.draw(rng).unit_type for _ in range(3)))
+
+class TestCoins(unittest.TestCase):
+    def setUp(self):
+        self.coins = [Knight(), Archer(), Knight(), Royal(), Mercenary(), Knight(), Archer()]
+
+    def test_multiset(self):
+        bag: CoinBag = CoinBag(self.coins)
+        self.assertEqual(len(bag), 7)
+        self.assertIn('Knight', bag)
+        self.assertNotIn('Berserker', bag)
+        self.assertEqual(bag.count('Knight'), 3)
+        self.assertEqual(bag.types(), ['Knight', 'Archer', 'Royal', 'Mercenary'])
+        self.assertEqual(bag.signature(), (2, 3, 1, 0, 1))
+        self.assertEqual(sorted(map(id, bag)), sorted(map(id, self.coins)))
+
+        # The coin found is the one taken
+        knight = bag.find('Knight')
+        self.assertIs(bag.take('Knight'), knight)
+        self.assertEqual(bag.count('Knight'), 2)
+        self.assertIsNone(bag.find('Berserker'))
+
+        archers: list = [bag.take('Archer'), bag.take('Archer')]
+        self.assertNotIn('Archer', bag.types())
+        self.assertNotIn('Archer', bag)
+        bag.append(archers[0])
+        self.assertEqual(bag.count('Archer'), 1)
+        self.assertEqual(len(bag.clear()), 5)
+        self.assertEqual(len(bag), 0)
+
+    def test_remove_insert_round_trip(self):
+        bag: CoinBag = CoinBag(self.coins)
+        order: list = list(map(id, bag))
+        for coin in self.coins:
+            index: int = bag.remove(coin)
+            self.assertEqual(len(bag), 6)
+            bag.insert(index, coin)
+            self.assertEqual(list(map(id, bag)), order)
+
+    def test_signature(self):
+        reordered: CoinBag = CoinBag(reversed(self.coins))
+        self.assertEqual(CoinBag(self.coins).signature(), reordered.signature())
+        self.assertNotEqual(CoinBag(self.coins[1:]).signature(), reordered.signature())
+        self.assertEqual(sum(CoinBag(self.coins).signature()), 7)
+
+    def test_draw_distribution_matches_list(self):
+        # Every hand is exactly as likely as drawing from a list of coins
+        self.assertEqual(hand_distribution(self.coins, draw_from_bag), hand_distribution(self.coins, draw_from_list))
+
+    def test_deepcopy(self):
+        bag: CoinBag = CoinBag(self.coins)
+        copied: CoinBag = copy.deepcopy(bag)
+        self.assertEqual(copied.signature(), bag.signature())
+        copied.take('Knight')
+        self.assertEqual(bag.count('Knight'), 3)
+
+if __name__ == '__main__':
+    unittest.main()
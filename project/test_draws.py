@@ -0,0 +1,79 @@
+import itertools
+import random
+import unittest
+from collections import Counter
+
+from action import COIN_TYPES
+from draws import bag_distribution, hand_distribution, player_distribution, refill, sample_hand
+from test_board import new_game, fingerprint
+
+def brute_force(bag: tuple) -> dict:
+    """
+    Counts the hands of every set of three different coins of the bag, which are all equally likely.
+    """
+    coins: list = [i for i, count in enumerate(bag) for _ in range(count)]
+    hands: Counter = Counter()
+    for drawn in itertools.combinations(coins, 3):
+        hands[tuple(drawn.count(i) for i in range(len(bag)))] += 1
+    total: int = sum(hands.values())
+    return {hand: count / total for hand, count in hands.items()}
+
+class TestDraws(unittest.TestCase):
+    def test_matches_brute_force(self):
+        for bag in ((2, 3, 1, 0, 1), (0, 0, 3, 0, 0), (1, 1, 1, 0, 0), (4, 0, 2, 2, 1)):
+            distribution: dict = dict(bag_distribution(bag))
+            expected: dict = brute_force(bag)
+            self.assertEqual(distribution.keys(), expected.keys())
+            for hand, probability in expected.items():
+                self.assertAlmostEqual(distribution[hand], probability)
+            self.assertAlmostEqual(sum(distribution.values()), 1.0)
+
+    def test_refill(self):
+        # The bag is only refilled up to three coins, from the front of the discard pile
+        self.assertEqual(refill((1, 0, 0, 0, 0), ('Knight', 'Royal', 'Archer')), (1, 1, 0, 0, 1))
+        self.assertEqual(refill((1, 1, 1, 0, 0), ('Knight',)), (1, 1, 1, 0, 0))
+        self.assertIsNone(refill((1, 0, 0, 0, 0), ('Knight',)))
+        self.assertEqual(hand_distribution((1, 0, 0, 0, 0), ('Knight',)), ())
+        self.assertEqual(hand_distribution((1, 0, 0, 0, 0), ('Knight', 'Royal', 'Archer')), (((1, 1, 0, 0, 1), 1.0),))
+
+    def test_cache(self):
+        bag_distribution.cache_clear()
+        hand_distribution((2, 0, 0, 0, 0), ('Knight', 'Archer'))
+        # The same bag after the refill is a cache hit
+        hand_distribution((2, 1, 0, 0, 0), ())
+        self.assertEqual(bag_distribution.cache_info().hits, 1)
+
+    def test_sampler(self):
+        bag: tuple = (2, 3, 1, 0, 1)
+        rng: random.Random = random.Random(0)
+        samples: Counter = Counter(sample_hand(bag, (), rng) for _ in range(20000))
+        for hand, probability in bag_distribution(bag):
+            self.assertAlmostEqual(samples[hand] / 20000, probability, delta=0.015)
+        self.assertIsNone(sample_hand((1, 0, 0, 0, 0), (), rng))
+
+    def test_board_draws_given_hand(self):
+        board, crow, wolf = new_game(3)
+        before: tuple = fingerprint(board, (crow, wolf))
+        key: int = board.position_key()
+        hand, _ = player_distribution(crow)[0]
+        self.assertTrue(board.push_draw(crow, random.Random(0), hand))
+        self.assertEqual(crow.hand.signature(), hand)
+        scratch: int = crow.key
+        crow.rehash()
+        self.assertEqual(crow.key, scratch)
+        board.pop()
+        self.assertEqual(fingerprint(board, (crow, wolf)), before)
+        self.assertEqual(board.position_key(), key)
+
+        # Random draws follow the distribution of the player
+        hands: Counter = Counter()
+        for seed in range(3000):
+            board.push_draw(crow, random.Random(seed))
+            hands[crow.hand.signature()] += 1
+            board.pop()
+        for hand, probability in player_distribution(crow):
+            self.assertAlmostEqual(hands[hand] / 3000, probability, delta=0.03)
+        self.assertEqual(len(COIN_TYPES), len(hand))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import contextlib
+import io
+import unittest
+from collections import deque
+
+from board import Board
+from cell import Knight, Archer, Royal
+from coins import CoinBag
+from events import (
+    Event, EventBus, NULL_SINK, TERMINAL, describe, PIECE_NOT_IN_HAND, RULE_ERROR, HAND_DRAWN, BAG_REFILLED,
+    RECRUITMENT_UNITS, COIN_RECRUITED
+)
+from player import Player
+
+class TestEvents(unittest.TestCase):
+    def setUp(self):
+        self.log: list = []
+        self.bus: EventBus = EventBus([self.log.append])
+        self.crow = Player('Crow', 'C', events=self.bus)
+        self.crow.hand = CoinBag([Knight(self.crow), Archer(self.crow)])
+        self.wolf = Player('Wolf', 'W', events=self.bus)
+        self.board = Board(self.crow, self.wolf, events=self.bus)
+
+    def test_describe_matches_terminal_messages(self):
+        self.assertEqual(describe(Event(HAND_DRAWN, {'coins': ('Knight', 'Royal')})), 'Hand: Knight, Royal, ')
+        self.assertEqual(
+            describe(Event(RECRUITMENT_UNITS, {'units': (('Knight', 2), ('Archer', 1))})),
+            'Recruitment pieces: Knight = 2, Archer = 1, '
+        )
+        self.assertEqual(describe(Event(COIN_RECRUITED, {'piece': 'Knight'})), 'Added the Knight coin to the bag')
+
+    def test_rules_emit_events(self):
+        self.assertFalse(self.board.piece_in_hand('Berserker', self.crow))
+        self.assertFalse(self.board.valid_start_position(self.board.grid[0][0].unit, self.crow))
+        self.assertEqual([event.code for event in self.log], [PIECE_NOT_IN_HAND, RULE_ERROR])
+        self.assertIn('empty', self.log[1].payload['message'])
+
+    def test_units_emit_events(self):
+        self.assertFalse(Knight(self.crow).move((2, 2), (2, 4)))
+        self.assertEqual([event.code for event in self.log], [RULE_ERROR])
+        self.assertIn('Knights', self.log[0].payload['message'])
+
+    def test_player_emits_events(self):
+        self.crow.hand = CoinBag()
+        self.crow.bag = CoinBag([Knight(), Archer()])
+        self.crow.discarded = deque([Royal(), Archer()])
+        self.crow.assigned_units = {'Knight': [Knight(), Knight()]}
+        self.crow.get_recruitment_units()
+        self.assertTrue(self.crow.get_hand())
+        codes: list = [event.code for event in self.log]
+        self.assertEqual(codes, [RECRUITMENT_UNITS, BAG_REFILLED, HAND_DRAWN])
+        self.assertEqual(self.log[0].payload['units'], (('Knight', 2),))
+        self.assertEqual(self.log[1].payload['unit_type'], 'Royal')
+        self.assertEqual(sorted(self.log[2].payload['coins']), sorted(coin.unit_type for coin in self.crow.hand))
+
+    def test_sinks(self):
+        output: io.StringIO = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            NULL_SINK.emit(PIECE_NOT_IN_HAND)
+            self.assertEqual(output.getvalue(), '')
+            TERMINAL.emit(PIECE_NOT_IN_HAND)
+        self.assertEqual(output.getvalue(), 'Invalid input, piece is not in hand\n')
+
+if __name__ == '__main__':
+    unittest.main()
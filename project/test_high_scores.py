@@ -0,0 +1,221 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from high_scores import (
+    SCHEMA_VERSION, FinishedGame, Leaderboard, ScoreWriter, close_connections, get_connection, get_leaderboard,
+    high_scores, player_games, player_stats, recent_games, top_players
+)
+from simulate import run
+
+def won(winner: str, loser: str, date: str = None, turns: int = 10) -> FinishedGame:
+    """
+    Returns a game won by the first player as CROW.
+    """
+    return FinishedGame(date, winner, loser, winner, ('Archer', 'Knight'), ('Mercenary', 'Berserker'), turns, 1.5)
+
+def victories(path: str) -> dict:
+    """
+    Reads the victories and date of every player straight from the database, leaving out the players a new database
+    is filled with.
+    """
+    conn: sqlite3.Connection = sqlite3.connect(path)
+    rows: list = conn.execute('SELECT player_name, victories, date FROM high_scores').fetchall()
+    conn.close()
+    return {
+        player_name: (count, date) for player_name, count, date in rows
+        if player_name not in ('Antonio', 'Laura', 'Ramiro') and count
+    }
+
+class TestHighScores(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'high_scores.db')
+
+    def tearDown(self):
+        close_connections()
+        self.directory.cleanup()
+
+    def test_schema_set_up_once(self):
+        self.assertEqual(high_scores(self.path)[0], ('Laura', 5, '2023-02-19 11:51:03'))
+        conn: sqlite3.Connection = get_connection(self.path)
+        self.assertIs(get_connection(self.path), conn)
+        self.assertEqual(conn.execute('PRAGMA user_version').fetchone()[0], SCHEMA_VERSION)
+
+        # An emptied table isn't filled again, only a new database is
+        conn.execute('DELETE FROM player_stats')
+        conn.commit()
+        close_connections()
+        self.assertEqual(high_scores(self.path), [])
+
+    def test_existing_database_is_kept(self):
+        # A database created before the schema had a version
+        conn: sqlite3.Connection = sqlite3.connect(self.path)
+        conn.execute('CREATE TABLE high_scores (player_name text, victories integer, date text)')
+        conn.execute("INSERT INTO high_scores VALUES ('Marta', 7, '2024-01-01 10:00:00')")
+        conn.commit()
+        conn.close()
+        self.assertEqual(high_scores(self.path), [('Marta', 7, '2024-01-01 10:00:00')])
+        self.assertEqual(player_stats('Marta', self.path).victories, 7)
+
+    def test_connection_per_thread(self):
+        connections: list = []
+        thread: threading.Thread = threading.Thread(target=lambda: connections.append(get_connection(self.path)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(connections[0], get_connection(self.path))
+
+    def test_batched_writes(self):
+        writer: ScoreWriter = ScoreWriter(self.path, batch_size=4)
+        writer.submit(won('Marta', 'Pablo', '2023-02-19 11:51:03'))
+        writer.submit(won('Pablo', 'Marta', '2023-02-19 10:12:06'))
+        writer.submit(won('Marta', 'Pablo', '2023-01-01 00:00:00'))
+        writer.flush()
+        self.assertEqual(
+            victories(self.path), {'Marta': (2, '2023-02-19 11:51:03'), 'Pablo': (1, '2023-02-19 10:12:06')}
+        )
+
+        for _ in range(9):
+            writer.submit(won('Pablo', 'Marta', '2024-03-01 09:00:00'))
+        writer.close()
+        self.assertEqual(victories(self.path)['Pablo'], (10, '2024-03-01 09:00:00'))
+        self.assertEqual(writer.written, 12)
+        # No batch is bigger than the batch size
+        self.assertGreaterEqual(writer.batches, 4)
+        self.assertIsNone(writer.error)
+        conn: sqlite3.Connection = sqlite3.connect(self.path)
+        self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        conn.close()
+
+    def test_many_games_finishing_at_once(self):
+        writer: ScoreWriter = ScoreWriter(self.path)
+        threads: list = [
+            threading.Thread(target=lambda name=name: [writer.submit(won(name, 'Marta')) for _ in range(500)])
+            for name in ('CROW', 'WOLF', 'Nerea')
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.close()
+        counts: dict = {name: count for name, (count, _) in victories(self.path).items()}
+        self.assertEqual(counts, {'CROW': 500, 'WOLF': 500, 'Nerea': 500})
+        self.assertLess(writer.batches, 1500)
+        self.assertEqual(player_stats('Marta', self.path).games, 1500)
+
+    def test_writer_after_close_connections(self):
+        writer: ScoreWriter = ScoreWriter(self.path)
+        writer.submit(won('Marta', 'Pablo', '2024-05-01 10:00:00'))
+        writer.flush()
+        # The file is replaced while the writer is running
+        close_connections()
+        os.remove(self.path)
+        writer.submit(won('Pablo', 'Marta', '2024-05-02 10:00:00'))
+        writer.close()
+        self.assertIsNone(writer.error)
+        self.assertEqual(victories(self.path), {'Pablo': (1, '2024-05-02 10:00:00')})
+
+    def test_unwritable_database(self):
+        writer: ScoreWriter = ScoreWriter(os.path.join(self.directory.name, 'missing', 'high_scores.db'))
+        writer.submit(won('Marta', 'Pablo'))
+        # The games are dropped instead of waiting forever
+        writer.close()
+        self.assertIsNotNone(writer.error)
+        self.assertEqual(writer.written, 0)
+
+    def test_simulation_winners(self):
+        summary, _ = run(20, seed=3, workers=1, scores=self.path)
+        counts: dict = {name: count for name, (count, _) in victories(self.path).items()}
+        self.assertEqual(counts, {name: wins for name, wins in summary.wins.items() if name is not None})
+        self.assertEqual(player_stats('CROW', self.path).games, 20)
+        self.assertEqual(player_stats('WOLF', self.path).turns, summary.turns)
+
+    def test_pages(self):
+        writer: ScoreWriter = ScoreWriter(self.path, batch_size=7)
+        for game in range(50):
+            # Several games share each date, the id breaks the ties
+            writer.submit(won(f'P{game % 5}', f'P{(game + 1) % 5}', f'2024-01-{game // 3 + 1:02} 10:00:00', game))
+        writer.close()
+
+        games: list = []
+        page = recent_games(self.path, limit=8)
+        while True:
+            games.extend(page.rows)
+            if page.next is None:
+                break
+            page = recent_games(self.path, limit=8, before=page.next)
+        self.assertEqual([game.turns for game in games], sorted(range(50), reverse=True))
+        self.assertEqual(games[0].crow_units, 'Archer,Knight')
+
+        games = []
+        page = player_games('P2', self.path, limit=3)
+        while True:
+            games.extend(page.rows)
+            if page.next is None:
+                break
+            page = player_games('P2', self.path, limit=3, before=page.next)
+        self.assertEqual([game.turns for game in games], [game for game in reversed(range(50)) if game % 5 in (1, 2)])
+        self.assertEqual(player_games('Nobody', self.path).rows, [])
+
+        players: list = []
+        page = top_players(self.path, limit=3)
+        while True:
+            players.extend(page.rows)
+            if page.next is None:
+                break
+            page = top_players(self.path, limit=3, after=page.next)
+        # Ten wins and twenty games each for the five new players, then the players of a new database
+        self.assertEqual([player.name for player in players[:5]], ['P4', 'P3', 'P2', 'P1', 'P0'])
+        self.assertEqual(players[5].name, 'Antonio')
+        self.assertEqual(len(players), 8)
+        self.assertEqual(
+            player_stats('P1', self.path),
+            (
+                'P1', 20, 10, sum(game for game in range(50) if game % 5 in (0, 1)), '2024-01-16 10:00:00',
+                '2024-01-16 10:00:00'
+            )
+        )
+
+    def test_leaderboard_cache(self):
+        leaderboard: Leaderboard = get_leaderboard(self.path)
+        self.addCleanup(leaderboard.close)
+        self.assertIs(get_leaderboard(self.path), leaderboard)
+        self.assertEqual(leaderboard.get(timeout=5), high_scores(self.path))
+        # Reading it again doesn't query the database
+        for _ in range(10):
+            leaderboard.get()
+        self.assertEqual(leaderboard.version, 1)
+
+        # The writer invalidates it after committing
+        writer: ScoreWriter = ScoreWriter(self.path)
+        writer.submit(won('Marta', 'Pablo', '2024-05-01 10:00:00'))
+        writer.close()
+        with leaderboard.changed:
+            self.assertTrue(leaderboard.changed.wait_for(lambda: leaderboard.version == 2, 5))
+        self.assertEqual(leaderboard.get()[0], ('Marta', 1, '2024-05-01 10:00:00'))
+
+    def test_unreadable_leaderboard(self):
+        leaderboard: Leaderboard = Leaderboard(os.path.join(self.directory.name, 'missing', 'high_scores.db'))
+        self.assertIsNone(leaderboard.get(timeout=5))
+        self.assertIsNotNone(leaderboard.error)
+        leaderboard.close()
+
+    def test_queries_use_indexes(self):
+        conn: sqlite3.Connection = get_connection(self.path)
+        # No query of a page reads the whole games or player_stats tables
+        for query, parameters in (
+            ('SELECT id FROM games WHERE (date, id) < (?, ?) ORDER BY date DESC, id DESC LIMIT 20', ('2024', 5)),
+            ('SELECT id FROM games WHERE crow = ? AND date < ? ORDER BY date DESC, id DESC LIMIT 20', (1, '2024')),
+            (
+                'SELECT player FROM player_stats WHERE (victories, player) < (?, ?) '
+                'ORDER BY victories DESC, player DESC LIMIT 20', (5, 3)
+            ),
+        ):
+            plan: str = ' '.join(row[-1] for row in conn.execute(f'EXPLAIN QUERY PLAN {query}', parameters))
+            self.assertIn('USING', plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,19 @@
+import contextlib
+import io
+import random
 import unittest
+from unittest import mock
 
-from main import generate_unit_coin, initialize_player, swap_turns
+from agent import RandomAgent
+from config import SMALL_BOARD
+from events import NULL_SINK
+from action import Action, CONTROL
+from main import (
+    describe_action, generate_unit_coin, initialize_player, parse_action, play_game, prompt_player_actions, swap_turns
+)
 from player import Player
 from cell import Archer, Knight
+from test_board import new_game, random_turns
 
 class TestMain(unittest.TestCase):
     def setUp(self):
@@ -47,5 +58,41 @@ class TestMain(unittest.TestCase):
         curr_player = swap_turns(curr_player, self.crow, self.wolf)
         self.assertEqual(curr_player, self.wolf)
 
+    def test_parse_action(self):
+        board, crow, wolf = new_game(3)
+        board.events = crow.events = wolf.events = NULL_SINK
+        # Every legal action reads back from the way it is described
+        for player in random_turns(board, crow, wolf, 10):
+            for action in board.legal_actions(player):
+                self.assertEqual(parse_action(board, describe_action(board, action)), action)
+
+        for text in ('fly away', 'move Knight', 'move Knight a,1 b,1', 'place Knight z,9', 'place Knight 11',
+                     'initiative Knight a,1', 'recruit Knight Archer'):
+            self.assertIsNone(parse_action(board, text))
+
+    def test_rejected_agent_action(self):
+        board, crow, _ = new_game(3)
+        board.events = crow.events = NULL_SINK
+        crow.get_hand()
+        # A control point outside the board, the agent would be asked again forever
+        agent: RandomAgent = RandomAgent(0)
+        agent.choose_action = lambda board, player: Action(CONTROL, next(iter(player.hand)).unit_type, end=(9, 9))
+        with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(RuntimeError):
+            prompt_player_actions(board, crow, agent)
+
+    def test_play_game_closes_agents(self):
+        closed: list = []
+
+        # ClosingAgent class with its respective methods
+        class ClosingAgent(RandomAgent):
+            def close(self) -> None:
+                closed.append(self)
+
+        agents: list = [ClosingAgent(1), ClosingAgent(2)]
+        with mock.patch('main.choose_agent', side_effect=agents), mock.patch('main.record_game'), \
+                mock.patch('main.get_high_scores', return_value=True), contextlib.redirect_stdout(io.StringIO()):
+            play_game(random.Random(0), SMALL_BOARD)
+        self.assertEqual(closed, agents)
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
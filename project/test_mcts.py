@@ -0,0 +1,75 @@
+import math
+import time
+import unittest
+
+from action import CONTROL
+from mcts import MCTSAgent, Tree, search_state, search_tree
+from snapshot import to_bytes
+from test_board import new_game, random_turns, fingerprint
+
+class TestMCTS(unittest.TestCase):
+    def test_chooses_legal_action_and_restores_board(self):
+        board, crow, wolf = new_game(3)
+        agent: MCTSAgent = MCTSAgent(max_playouts=30, seed=3)
+        for i, player in enumerate(random_turns(board, crow, wolf, 6)):
+            if i % 4:
+                continue
+            before: tuple = fingerprint(board, (crow, wolf))
+            key: int = board.position_key(player)
+            action = agent.choose_action(board, player)
+            self.assertIn(action, board.legal_actions(player))
+            self.assertEqual(fingerprint(board, (crow, wolf)), before)
+            self.assertEqual(board.position_key(player), key)
+            self.assertEqual(board.history, [])
+            self.assertEqual(agent.playouts, 30)
+            self.assertEqual(sum(agent.visits.values()), 30)
+
+    def test_turn_within_budget(self):
+        board, crow, wolf = new_game(7)
+        agent: MCTSAgent = MCTSAgent(budget=0.3, seed=7)
+        crow.get_hand()
+        start: float = time.perf_counter()
+        while crow.hand:
+            self.assertTrue(board.apply_action(crow, agent.choose_action(board, crow)))
+        self.assertLess(time.perf_counter() - start, 0.3 + 0.05)
+
+    def test_same_seed_same_tree(self):
+        board, crow, wolf = new_game(4)
+        crow.get_hand()
+        visits: list = [Tree(board, crow, seed=8).run(playouts=40) for _ in range(2)]
+        self.assertEqual(visits[0], visits[1])
+
+    def test_worker_state_gives_same_tree(self):
+        # A position sent as bytes is searched exactly like the Board class object itself
+        board, crow, wolf = new_game(7)
+        for i, player in enumerate(random_turns(board, crow, wolf, 6)):
+            if i % 5 == 0:
+                state: bytes = to_bytes(board, player)
+                self.assertEqual(search_state(state, math.inf, 40, 2, 60), search_tree(board, player, math.inf, 40, 2, 60))
+
+    def test_takes_winning_control(self):
+        board, crow, wolf = new_game(5)
+        for player in random_turns(board, crow, wolf, 30):
+            if not any(action.kind == CONTROL for action in board.legal_actions(player)):
+                continue
+            player.control_tokens = 1
+            action = MCTSAgent(max_playouts=200, seed=5).choose_action(board, player)
+            self.assertEqual(action.kind, CONTROL)
+            return
+        self.fail('No position with a control action was reached')
+
+    def test_root_parallelism_merges_visits(self):
+        board, crow, wolf = new_game(6)
+        crow.get_hand()
+        agent: MCTSAgent = MCTSAgent(workers=2, max_playouts=20, seed=6)
+        try:
+            action = agent.choose_action(board, crow)
+        finally:
+            agent.close()
+        self.assertIn(action, board.legal_actions(crow))
+        self.assertEqual(agent.playouts, 40)
+        self.assertEqual(sum(agent.visits.values()), 40)
+        self.assertEqual(board.history, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,27 @@
 import unittest
+from collections import deque
 
 from cell import Knight, Archer, Royal
-from player import Player
+from coins import CoinBag
+from player import Player, MAX_NAME_SIZE
 
 class TestPlayer(unittest.TestCase):
 
+    def test_name_size(self):
+        self.assertEqual(Player('x' * MAX_NAME_SIZE, 's').name, 'x' * MAX_NAME_SIZE)
+        with self.assertRaises(ValueError):
+            Player('x' * (MAX_NAME_SIZE + 1), 's')
+        # The limit is in bytes, not characters
+        with self.assertRaises(ValueError):
+            Player('é' * MAX_NAME_SIZE, 's')
+        with self.assertRaises(ValueError):
+            Player('Crow', 'ss')
+
     def test_get_hand(self):
         self.player = Player('Crow', 's')
-        self.player.bag = [Knight(), Knight(), Archer(), Archer(), Royal()]
-        self.player.hand = []
-        self.player.discarded = []
+        self.player.bag = CoinBag([Knight(), Knight(), Archer(), Archer(), Royal()])
+        self.player.hand = CoinBag()
+        self.player.discarded = deque()
         initial_bag_size = len(self.player.bag)
         
         # Should get hand
@@ -23,6 +35,29 @@ class TestPlayer(unittest.TestCase):
 
         # Shouldn't be able to get a new hand now that the bag only contains 2 units
         self.assertFalse(self.player.get_hand())
+
+    def test_get_hand_updates_key(self):
+        self.player = Player('Crow', 's')
+        self.player.bag = CoinBag([Knight(), Archer()])
+        self.player.discarded = deque([Knight(), Royal(), Archer()])
+        self.player.rehash()
+
+        # Refills the bag from the discarded pile before drawing
+        self.assertTrue(self.player.get_hand())
+        key: int = self.player.key
+        self.player.rehash()
+        self.assertEqual(self.player.key, key)
         
+    def test_hidden_state(self):
+        self.player = Player('Crow', 's')
+        self.player.bag = CoinBag([Knight(), Archer(), Knight()])
+        self.player.discarded = deque([Royal(), Archer()])
+        self.assertEqual(self.player.hidden_state(), ((1, 2, 0, 0, 0), (0, 0, 0, 0, 0), ('Royal', 'Archer')))
+        # Equal contents give the same state whatever the order of the coins in the bag
+        other: Player = Player('Crow', 's')
+        other.bag = CoinBag([Knight(), Knight(), Archer()])
+        other.discarded = deque([Royal(), Archer()])
+        self.assertEqual(other.hidden_state(), self.player.hidden_state())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
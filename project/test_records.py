@@ -0,0 +1,123 @@
+import io
+import random
+import unittest
+
+from action import Action, ATTACK, RECRUIT
+from board import Board
+from config import FULL_BOARD
+from player import Player
+from records import (
+    GameRecorder, GameRecord, Draw, ACTION_ENTRY, DRAW_ENTRY, decode_action, encode_action, new_game, positions,
+    read_games, replay
+)
+from simulate import play_headless
+
+def state(board: Board, players: tuple) -> tuple:
+    """
+    Captures the whole state of a game by unit types and coin counts, so that two games with different Unit class
+    objects can be compared.
+    """
+    cells: tuple = tuple(
+        (cell.unit.unit_type, cell.unit.player and cell.unit.player.name) for row in board.grid for cell in row
+    )
+    coins: tuple = tuple(
+        (
+            player.hidden_state(), tuple((unit_type, len(units)) for unit_type, units in player.assigned_units.items()),
+            player.control_tokens, player.has_initiative, player.initiative_count,
+        )
+        for player in players
+    )
+    return cells, coins
+
+def record_random_game(seed: int, file, game: int = 0, max_turns: int = 40) -> list:
+    """
+    Plays random actions on a recorded game, returning the state after every entry.
+    """
+    rng: random.Random = random.Random(seed)
+    recorder: GameRecorder = GameRecorder(file)
+    units: tuple = ((('Archer', 4), ('Knight', 5)), (('Mercenary', 5), ('Berserker', 4)))
+    recorder.start(FULL_BOARD, seed, game, 1, units)
+    board, crow, wolf = new_game(GameRecord(FULL_BOARD, seed, game, 1, units, (), None, None))
+    player: Player = wolf
+    states: list = [state(board, (crow, wolf))]
+    for turn in range(max_turns):
+        player = board.end_turn(player)
+        if not board.draw(player, rng):
+            break
+        recorder.draw(board.seats[player], player.hand.signature())
+        states.append(state(board, (crow, wolf)))
+        while player.hand:
+            action: Action = rng.choice(board.legal_actions(player))
+            board.apply_action(player, action)
+            recorder.action(action)
+            states.append(state(board, (crow, wolf)))
+    recorder.end(None, max_turns)
+    return states
+
+class TestRecords(unittest.TestCase):
+    def test_action_round_trip(self):
+        actions: tuple = (
+            Action(RECRUIT, 'Royal', recruit='Berserker'),
+            Action(ATTACK, 'Berserker', (3, 4), (3, 5), extra_targets=((4, 4),)),
+            Action(ATTACK, 'Archer', (0, 0), (2, 0)),
+            Action('initiative', 'Knight'),
+        )
+        for action in actions:
+            data: bytes = encode_action(action, 9)
+            self.assertEqual(len(data), ACTION_ENTRY.size - 1)
+            self.assertEqual(decode_action(data, 9), action)
+
+    def test_replay_matches_game(self):
+        file: io.BytesIO = io.BytesIO()
+        states: list = record_random_game(5, file)
+        record = next(read_games(io.BytesIO(file.getvalue())))
+        self.assertEqual(record.config, FULL_BOARD)
+        self.assertEqual(record.units[1], (('Mercenary', 5), ('Berserker', 4)))
+        self.assertEqual(len(record.entries) + 1, len(states))
+        for index, board, player in positions(record):
+            self.assertEqual(state(board, tuple(board.seats)), states[index])
+
+        # Any intermediate position can be rebuilt on its own
+        board, _ = replay(record, 7)
+        self.assertEqual(state(board, tuple(board.seats)), states[7])
+
+    def test_headless_record(self):
+        result = play_headless(2, 11, record=True)
+        record = next(read_games(io.BytesIO(result.record)))
+        self.assertEqual((record.seed, record.game, record.turns), (11, 2, result.turns))
+        self.assertEqual(record.winner, ('CROW', 'WOLF', None).index(result.winner) if result.winner else None)
+        board, player = replay(record)
+        draws: int = sum(type(entry) is Draw for entry in record.entries)
+        self.assertLessEqual(draws, result.turns)
+        if result.winner == player.name:
+            self.assertEqual(player.control_tokens, 0)
+        # A few bytes per entry
+        self.assertLessEqual(len(result.record), 24 + 4 + DRAW_ENTRY.size * draws + ACTION_ENTRY.size * 3 * draws)
+
+    def test_streaming_reader(self):
+        file: io.BytesIO = io.BytesIO()
+        for game in range(3):
+            record_random_game(game, file, game, max_turns=10)
+        # A game being written when the file is read
+        recorder: GameRecorder = GameRecorder(file)
+        recorder.start(FULL_BOARD, 0, 3, 0, ((('Archer', 4), ('Knight', 5)), (('Mercenary', 5), ('Berserker', 4))))
+        recorder.draw(0, (1, 1, 0, 0, 1))
+        data: bytes = file.getvalue() + DRAW_ENTRY.pack(ord('D'), 1, 0)[:2]
+
+        # Blocks smaller than an entry give the same games as reading everything at once
+        whole: list = list(read_games(io.BytesIO(data)))
+        self.assertEqual(list(read_games(io.BytesIO(data), 3)), whole)
+        self.assertEqual([record.game for record in whole], [0, 1, 2, 3])
+        self.assertEqual([record.turns for record in whole], [10, 10, 10, None])
+        self.assertEqual(whole[3].entries, (Draw(0, (1, 1, 0, 0, 1)),))
+
+    def test_corrupt_file(self):
+        # The entries of a game without the GAME entry before them
+        action: bytes = b'A' + encode_action(Action(RECRUIT, 'Royal', recruit='Knight'), FULL_BOARD.cols)
+        with self.assertRaisesRegex(ValueError, 'action entry before game header'):
+            list(read_games(io.BytesIO(action)))
+        with self.assertRaisesRegex(ValueError, 'draw entry before game header'):
+            list(read_games(io.BytesIO(DRAW_ENTRY.pack(ord('D'), 0, 0) + action)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+import asyncio
+import random
+import threading
+import unittest
+from unittest import mock
+
+from agent import RandomAgent
+from server import ACTION_PROMPT, GameClient, GameServer
+from simulate import make_agent
+
+class WaitingAgent(RandomAgent):
+    """
+    A RandomAgent that waits for the test before choosing its first action, as a long search would.
+    """
+    searches: bool = True
+
+    def __init__(self) -> None:
+        super().__init__(0)
+        self.started: threading.Event = threading.Event()
+        self.release: threading.Event = threading.Event()
+        self.released: bool = False
+
+    def choose_action(self, board, player):
+        if not self.started.is_set():
+            self.started.set()
+            self.released = self.release.wait(5)
+        return super().choose_action(board, player)
+
+async def play_randomly(client: GameClient, seed: int) -> list:
+    """
+    Answers every prompt with a random legal action until the game ends.
+
+    Returns:
+        The lines shown after the last prompt.
+    """
+    rng: random.Random = random.Random(seed)
+    while True:
+        lines, prompt = await client.read()
+        if prompt is None:
+            return lines
+        actions: list = await client.legal_actions()
+        await client.send(rng.choice(actions) if actions else 'forfeit')
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = GameServer(port=0, seed=0)
+        self.port = await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def first_prompted(self, clients: list) -> tuple:
+        """
+        Reads from every client until one of them is asked something.
+
+        Returns:
+            Tuple containing the (client asked, lines it was shown, pending read tasks of the others).
+        """
+        reads: dict = {asyncio.create_task(client.read()): client for client in clients}
+        done, pending = await asyncio.wait(reads, return_when=asyncio.FIRST_COMPLETED)
+        task = done.pop()
+        lines, prompt = task.result()
+        self.assertEqual(prompt, ACTION_PROMPT)
+        return reads[task], lines, pending
+
+    async def test_game_against_agent(self):
+        rng: random.Random = random.Random(0)
+        client: GameClient = await GameClient.connect(port=self.port, opponent='random')
+        while True:
+            lines, prompt = await client.read()
+            if prompt is None:
+                break
+            self.assertEqual(prompt, ACTION_PROMPT)
+            actions: list = await client.legal_actions()
+            await client.send(rng.choice(actions) if actions else 'forfeit')
+        self.assertTrue(lines[-2].startswith('The winner of the game is '))
+        self.assertEqual(self.server.played, 1)
+        self.assertEqual(self.server.sessions, {})
+
+    async def test_agent_searches_off_the_loop(self):
+        agents: list = [WaitingAgent()]
+        agent: WaitingAgent = agents[0]
+        with mock.patch(
+            'server.make_agent', side_effect=lambda *args: agents.pop() if agents else make_agent(*args)
+        ):
+            searching: GameClient = await GameClient.connect(port=self.port, opponent='random')
+            game: asyncio.Task = asyncio.create_task(play_randomly(searching, 0))
+            while not agent.started.is_set():
+                await asyncio.sleep(0.01)
+            # Another session is served while the agent of the first one is still choosing
+            client: GameClient = await GameClient.connect(port=self.port, opponent='random')
+            _, prompt = await client.read()
+            self.assertEqual(prompt, ACTION_PROMPT)
+            agent.release.set()
+            lines: list = await game
+        self.assertTrue(agent.released)
+        self.assertTrue(lines[-2].startswith('The winner of the game is '))
+        await client.close()
+
+    async def test_two_players(self):
+        crow: GameClient = await GameClient.connect(port=self.port)
+        wolf: GameClient = await GameClient.connect(port=self.port)
+        current, lines, pending = await self.first_prompted([crow, wolf])
+        self.assertIn('Control tokens: 3', '\n'.join(lines))
+        self.assertEqual(len(self.server.sessions), 1)
+
+        # Unknown actions are reported and asked again
+        await current.send('fly away')
+        lines, prompt = await current.read()
+        self.assertEqual((lines, prompt), (['That is not a valid action, please try again.'], ACTION_PROMPT))
+
+        await current.send('forfeit')
+        other_lines, prompt = await pending.pop()
+        self.assertIsNone(prompt)
+        winner: str = 'WOLF' if current is crow else 'CROW'
+        self.assertIn(f'The winner of the game is {winner}!', other_lines)
+        self.assertIn(f'The winner of the game is {winner}!', (await current.read())[0])
+
+    async def test_waiting_client_leaves(self):
+        leaving: GameClient = await GameClient.connect(port=self.port)
+        while '5x5' not in self.server.waiting:
+            await asyncio.sleep(0.01)
+        await leaving.close()
+        for _ in range(500):
+            if not self.server.waiting:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.server.waiting, {})
+
+        # The next clients are paired with each other, not with the one that left
+        crow: GameClient = await GameClient.connect(port=self.port)
+        wolf: GameClient = await GameClient.connect(port=self.port)
+        current, _, pending = await self.first_prompted([crow, wolf])
+        self.assertEqual((len(self.server.sessions), self.server.played), (1, 0))
+        await current.send('forfeit')
+        lines, _ = await pending.pop()
+        self.assertIn(f'The winner of the game is {"WOLF" if current is crow else "CROW"}!', lines)
+
+    async def test_disconnect_forfeits(self):
+        crow: GameClient = await GameClient.connect(port=self.port, size='9x9')
+        wolf: GameClient = await GameClient.connect(port=self.port, size='9x9')
+        current, _, pending = await self.first_prompted([crow, wolf])
+        await current.close()
+        lines, prompt = await pending.pop()
+        self.assertIsNone(prompt)
+        self.assertIn(f'The winner of the game is {"WOLF" if current is crow else "CROW"}!', lines)
+
+    async def test_bad_request(self):
+        client: GameClient = await GameClient.connect(port=self.port, size='3x3')
+        lines, prompt = await client.read()
+        self.assertIsNone(prompt)
+        self.assertTrue(lines[0].startswith('Expected play'))
+
+    async def test_many_sessions(self):
+        clients: list = await asyncio.gather(*(
+            GameClient.connect(port=self.port, opponent='random') for _ in range(200)
+        ))
+        prompts: list = await asyncio.gather(*(client.read() for client in clients))
+        self.assertEqual({prompt for _, prompt in prompts}, {ACTION_PROMPT})
+        self.assertEqual(len(self.server.sessions), 200)
+        for client in clients:
+            await client.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+from simulate import GameResult, Summary, play_headless, run, simulate
+
+class TestSimulate(unittest.TestCase):
+    def test_same_seed_same_game(self):
+        first: GameResult = play_headless(3, 42)
+        self.assertEqual(play_headless(3, 42), first)
+        self.assertIn(first.winner, ('CROW', 'WOLF', None))
+        self.assertEqual([len(units) for units in first.units], [2, 2])
+
+    def test_workers_give_identical_results(self):
+        single, _ = run(48, seed=7, workers=1, chunk=5)
+        several, _ = run(48, seed=7, workers=3, chunk=5)
+        self.assertEqual(single.games, 48)
+        self.assertEqual(single.totals(), several.totals())
+
+    def test_alpha_beta_games_are_reproducible(self):
+        options: dict = {'agents': ('alphabeta', 'random'), 'max_nodes': 200}
+        single: list = sorted(simulate(4, seed=1, workers=1, chunk=1, **options))
+        several: list = sorted(simulate(4, seed=1, workers=2, chunk=1, **options))
+        self.assertEqual(single, several)
+
+    def test_summary(self):
+        summary: Summary = Summary()
+        summary.add(GameResult(0, 'CROW', 10, (('Archer', 'Knight'), ('Mercenary', 'Berserker'))))
+        summary.add(GameResult(1, 'WOLF', 20, (('Archer', 'Mercenary'), ('Knight', 'Berserker'))))
+        summary.add(GameResult(2, None, 30, (('Archer', 'Berserker'), ('Knight', 'Mercenary'))))
+        self.assertEqual(summary.turns, 60)
+        self.assertAlmostEqual(summary.win_rate('CROW'), 1 / 3)
+        self.assertAlmostEqual(summary.win_rate(None), 1 / 3)
+        self.assertEqual(summary.unit_win_rates(), {'Archer': 1 / 3, 'Berserker': 1 / 3, 'Knight': 2 / 3, 'Mercenary': 0.0})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from multiprocessing import shared_memory
+
+from config import FULL_BOARD
+from events import NULL_SINK
+from snapshot import from_bytes, from_notation, notation, pack_into, state_size, to_bytes, unpack_from
+from test_board import new_game, random_turns
+
+# Crow Knight over a free zone, Wolf Archer in the middle of the board
+FIXTURE: str = (
+    '5x5 .....Z..../........../K@...@.@.@/......a.../.....z.... '
+    'CROW:s:3:0:0:AK:KR:-:A2K2 WOLF:v:2:1:1:BM:-:B:B2M3 0'
+)
+
+def snapshot_state(board, turn) -> tuple:
+    """
+    Captures what a saved game has to keep: the Zobrist key of the whole state, the reach of the placements and the
+    exact coin stacks.
+    """
+    return (
+        board.position_key(turn), board.bits.reach, board.bits.owned,
+        tuple(
+            (
+                player.name, [(unit_type, len(stack)) for unit_type, stack in player.bag.stacks.items()],
+                [(unit_type, len(stack)) for unit_type, stack in player.hand.stacks.items()],
+                player.hidden_state(), [(unit_type, len(stack)) for unit_type, stack in player.assigned_units.items()],
+            )
+            for player in board.seats
+        ),
+    )
+
+class TestSnapshot(unittest.TestCase):
+    def test_round_trip_during_games(self):
+        for config in (None, FULL_BOARD):
+            board, crow, wolf = new_game(4, config) if config else new_game(4)
+            board.events = crow.events = wolf.events = NULL_SINK
+            for player in random_turns(board, crow, wolf, 12):
+                data: bytes = to_bytes(board, player)
+                self.assertEqual(len(data), state_size(board.config))
+                loaded, turn = from_bytes(data, NULL_SINK)
+                self.assertEqual(turn.name, player.name)
+                self.assertEqual(snapshot_state(loaded, turn), snapshot_state(board, player))
+                self.assertEqual(to_bytes(loaded, turn), data)
+                self.assertEqual(loaded.legal_actions(turn), board.legal_actions(player))
+
+                text: str = notation(board, player)
+                loaded, turn = from_notation(text, NULL_SINK)
+                self.assertEqual(notation(loaded, turn), text)
+                self.assertEqual(loaded.position_key(turn), board.position_key(player))
+
+    def test_shared_memory(self):
+        board, crow, wolf = new_game(2)
+        size: int = state_size(board.config)
+        block: shared_memory.SharedMemory = shared_memory.SharedMemory(create=True, size=2 * size)
+        try:
+            view: memoryview = block.buf
+            end: int = pack_into(view, size, board, wolf)
+            self.assertEqual(end, 2 * size)
+            loaded, turn = unpack_from(view, size)
+            self.assertEqual(turn.name, wolf.name)
+            self.assertEqual(loaded.position_key(turn), board.position_key(wolf))
+            del view, loaded, turn
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_notation_fixture(self):
+        board, turn = from_notation(FIXTURE)
+        crow, wolf = board.seats
+        self.assertIs(turn, crow)
+        self.assertEqual(board.grid[2][0].unit.unit_type, 'Knight')
+        self.assertEqual(board.grid[2][0].previous_unit.unit_type, 'Control')
+        self.assertIs(board.grid[3][3].unit.player, wolf)
+        self.assertIs(board.grid[0][2].unit.player, crow)
+        self.assertEqual((wolf.control_tokens, wolf.has_initiative, wolf.initiative_count), (2, True, 1))
+        self.assertEqual(crow.hand.signature(), (0, 1, 0, 0, 1))
+        self.assertEqual([coin.unit_type for coin in wolf.discarded], ['Berserker'])
+        self.assertEqual(notation(board, turn), FIXTURE)
+
+if __name__ == '__main__':
+    unittest.main()
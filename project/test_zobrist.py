@@ -0,0 +1,76 @@
+import copy
+import unittest
+
+from action import Action, PLACE, RECRUIT
+from board import Board
+from cell import Knight, Archer, Royal
+from coins import CoinBag
+from player import Player
+from zobrist import TranspositionTable, EXACT, LOWER
+from test_board import new_game, random_turns
+
+def scratch_key(board: Board, turn: Player = None) -> int:
+    """
+    Computes the key of a copy of the board from scratch.
+    """
+    board, turn = copy.deepcopy((board, turn))
+    board.rehash()
+    return board.position_key(turn)
+
+class TestZobrist(unittest.TestCase):
+    def test_incremental_key_matches_scratch(self):
+        board, crow, wolf = new_game(5)
+        for player in random_turns(board, crow, wolf, 30):
+            self.assertEqual(board.position_key(player), scratch_key(board, player))
+            before: int = board.position_key(player)
+            for action in board.legal_actions(player):
+                board.push(player, action)
+                self.assertEqual(board.position_key(player), scratch_key(board, player))
+                board.pop()
+                self.assertEqual(board.position_key(player), before)
+
+    def test_transpositions_share_key(self):
+        crow, wolf = Player('Crow', 's'), Player('Wolf', 'v')
+        crow.hand = CoinBag([Knight(crow), Archer(crow), Royal()])
+        crow.assigned_units = {'Knight': [Knight(crow), Knight(crow)]}
+        board = Board(crow, wolf)
+
+        # Recruit then place
+        board.push(crow, Action(RECRUIT, 'Knight', recruit='Knight'))
+        board.push(crow, Action(PLACE, 'Archer', end=(0, 1)))
+        first: int = board.position_key(crow)
+        board.pop()
+        board.pop()
+
+        # Place then recruit
+        board.push(crow, Action(PLACE, 'Archer', end=(0, 1)))
+        board.push(crow, Action(RECRUIT, 'Knight', recruit='Knight'))
+        self.assertEqual(board.position_key(crow), first)
+
+        # Different positions and a different player to act don't
+        self.assertNotEqual(board.position_key(wolf), first)
+        board.pop()
+        self.assertNotEqual(board.position_key(crow), first)
+
+    def test_transposition_table(self):
+        table = TranspositionTable(100)
+        # Rounded down to a power of two
+        self.assertEqual(table.size, 64)
+        self.assertIsNone(table.probe(3))
+
+        self.assertTrue(table.store(3, 4, 1.5, EXACT, 'best'))
+        self.assertEqual(table.probe(3), (4, 1.5, EXACT, 'best'))
+        # A shallower result of another position in the same slot doesn't replace it
+        self.assertFalse(table.store(3 + 64, 2, 0.0, LOWER))
+        self.assertEqual(table.probe(3)[1], 1.5)
+        # A deeper one does
+        self.assertTrue(table.store(3 + 64, 5, 0.0, LOWER))
+        self.assertIsNone(table.probe(3))
+
+        self.assertEqual((table.probes, table.hits, table.stores, table.replacements, table.rejections), (4, 2, 2, 1, 1))
+        self.assertEqual(table.hit_rate, 0.5)
+        self.assertEqual(table.used, 1)
+        self.assertGreater(table.memory(), 64 * 5 * 8)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+import random
+import sys
+
+from action import COIN_TYPES, SOLDIER_TYPES
+
+# Zones a player coin can be in, used to index the coin count keys
+HAND: int = 0
+BAG: int = 1
+DISCARD: int = 2
+RECRUITMENT: int = 3
+ZONES: tuple = (HAND, BAG, DISCARD, RECRUITMENT)
+
+# Translates a coin type to its index in the coin count keys
+COIN_INDEX: dict = {unit_type: i for i, unit_type in enumerate(COIN_TYPES)}
+
+# Upper bounds for the squares and counts that get their own key
+MAX_SQUARES: int = 81
+MAX_TOKENS: int = 8
+
+# Keys are kept to 64 bits
+MASK: int = (1 << 64) - 1
+
+# ZobristKeys class with its respective properties
+class ZobristKeys:
+    """
+    A class to represent the ZobristKeys, the random 64-bit numbers that are XOR-ed together to build the key of a game
+    state. They are generated from a fixed seed so that keys are the same in every process. Coins are hashed as a
+    multiset: the key of a coin is added (modulo 2^64) once per coin in a zone, so that the same counts give the same
+    key whatever the order of the coins.
+
+    Attributes:
+        unit: List following the structure [seat][unit type index][square] -> key of a unit on the board.
+        owned: List following the structure [seat][square] -> key of a controlled zone.
+        coins: List following the structure [seat][zone][coin type index] -> key of a coin in a zone.
+        tokens: List following the structure [seat][count] -> key of the remaining control tokens.
+        initiative: List following the structure [seat] -> key of a player having the initiative.
+        initiative_count: List following the structure [seat][count] -> key of the rounds played with the initiative.
+        turn: List following the structure [seat] -> key of the player that has to act.
+    """
+    def __init__(self, seed: int = 0x5EED) -> None:
+        rng: random.Random = random.Random(seed)
+        bits = rng.getrandbits
+        self.unit: list = [[[bits(64) for _ in range(MAX_SQUARES)] for _ in SOLDIER_TYPES] for _ in range(2)]
+        self.owned: list = [[bits(64) for _ in range(MAX_SQUARES)] for _ in range(2)]
+        self.coins: list = [[[bits(64) for _ in COIN_TYPES] for _ in ZONES] for _ in range(2)]
+        self.tokens: list = [[bits(64) for _ in range(MAX_TOKENS)] for _ in range(2)]
+        self.initiative: list = [bits(64) for _ in range(2)]
+        self.initiative_count: list = [[bits(64) for _ in range(3)] for _ in range(2)]
+        self.turn: list = [bits(64) for _ in range(2)]
+
+# Shared keys, every board uses the same ones
+ZOBRIST: ZobristKeys = ZobristKeys()
+
+# Bound types stored in the TranspositionTable
+EXACT: int = 0
+LOWER: int = 1
+UPPER: int = 2
+
+# TranspositionTable class with its respective methods and properties
+class TranspositionTable:
+    """
+    A class to represent a TranspositionTable, a fixed-size cache of search results indexed by Zobrist key. Its slots
+    are preallocated, so its memory doesn't grow during a search, and a slot is only replaced by a result searched to
+    the same or a greater depth (or by the same position).
+
+    Attributes:
+        size: The number of slots, a power of two.
+        keys: List following the structure [slot] -> key of the stored position, or None if the slot is empty.
+        depths: List following the structure [slot] -> depth the stored position was searched to.
+        values: List following the structure [slot] -> value of the stored position.
+        flags: List following the structure [slot] -> EXACT, LOWER or UPPER bound of the value.
+        moves: List following the structure [slot] -> best Action found for the stored position.
+        probes: The number of lookups.
+        hits: The number of lookups that found their position.
+        stores: The number of results stored.
+        replacements: The number of results that replaced a different position.
+        rejections: The number of results not stored because the slot held a deeper result.
+    """
+    def __init__(self, entries: int = 1 << 16) -> None:
+        # Round down to a power of two so that the slot is a mask of the key
+        self.size: int = 1 << max(0, entries.bit_length() - 1)
+        self.mask: int = self.size - 1
+        self.keys: list = [None] * self.size
+        self.depths: list = [0] * self.size
+        self.values: list = [0] * self.size
+        self.flags: list = [EXACT] * self.size
+        self.moves: list = [None] * self.size
+        self.probes: int = 0
+        self.hits: int = 0
+        self.stores: int = 0
+        self.replacements: int = 0
+        self.rejections: int = 0
+
+    def probe(self, key: int) -> tuple:
+        """
+        Looks up a position.
+
+        Args:
+            key: The Zobrist key of the position.
+
+        Returns:
+            Tuple containing the (depth, value, flag, move) stored for the position, or None if it isn't stored.
+        """
+        self.probes += 1
+        slot: int = key & self.mask
+        if self.keys[slot] != key:
+            return None
+        self.hits += 1
+        return self.depths[slot], self.values[slot], self.flags[slot], self.moves[slot]
+
+    def store(self, key: int, depth: int, value: float, flag: int, move=None) -> bool:
+        """
+        Stores the result of searching a position, unless its slot holds a different position searched deeper.
+
+        Args:
+            key: The Zobrist key of the position.
+            depth: The depth the position was searched to.
+            value: The value found for the position.
+            flag: EXACT, LOWER or UPPER bound of the value.
+            move: Optional best Action found for the position.
+
+        Returns:
+            True if the result was stored, False if it was rejected.
+        """
+        slot: int = key & self.mask
+        stored_key: int = self.keys[slot]
+        if stored_key is not None and stored_key != key:
+            # Depth-preferred replacement
+            if self.depths[slot] > depth:
+                self.rejections += 1
+                return False
+            self.replacements += 1
+        self.stores += 1
+        self.keys[slot] = key
+        self.depths[slot] = depth
+        self.values[slot] = value
+        self.flags[slot] = flag
+        self.moves[slot] = move
+        return True
+
+    def clear(self) -> None:
+        """
+        Empties every slot and resets the counters.
+        """
+        self.__init__(self.size)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of lookups that found their position.
+        """
+        return self.hits / self.probes if self.probes else 0.0
+
+    @property
+    def used(self) -> int:
+        """
+        The number of slots holding a position.
+        """
+        return self.size - self.keys.count(None)
+
+    def memory(self) -> int:
+        """
+        Returns the bytes taken by the slots, not counting the values and moves they share with the search.
+        """
+        slots: int = sum(sys.getsizeof(column) for column in (self.keys, self.depths, self.values, self.flags, self.moves))
+        # Every stored key is its own 64-bit integer object
+        return slots + self.used * sys.getsizeof(ZOBRIST.turn[0])